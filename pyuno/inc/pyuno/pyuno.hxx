@@ -295,6 +295,8 @@ class PY_DLLEXPORT PyThreadAttach
 public:
 
     /** Creates a new python threadstate and acquires the global interpreter lock.
+        The threadstate of the first interpreter attached in a thread is reused by
+        the following attaches in the thread, until the thread ends.
         precondition: The current thread MUST NOT hold the global interpreter lock.
         postcondition: The global interpreter lock is acquired
 
@@ -304,7 +306,8 @@ public:
     PyThreadAttach( PyInterpreterState *interp) throw ( com::sun::star::uno::RuntimeException );
     
 
-    /** Releases the global interpreter lock and destroys the thread state. 
+    /** Releases the global interpreter lock and destroys the thread state,
+        unless it is kept for reuse in the thread.
      */
     ~PyThreadAttach();
 };
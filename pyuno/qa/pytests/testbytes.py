@@ -0,0 +1,71 @@
+#**************************************************************
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+#
+#**************************************************************
+
+""" Passes bytes through a com.sun.star.io.Pipe, which takes and returns
+    sequence<byte>. Needs the UNO runtime, run it with the python of the
+    office, e.g. python -m unittest testbytes
+"""
+
+import unittest
+
+try:
+    import uno
+except ImportError:
+    uno = None
+
+HIGH_BYTES = b'\x00\x01\x7f\x80\xfe\xff'
+
+
+@unittest.skipIf(uno is None, "the UNO runtime is not available")
+class TestBytes(unittest.TestCase):
+
+    def setUp(self):
+        ctx = uno.getComponentContext()
+        self.pipe = ctx.ServiceManager.createInstanceWithContext(
+            "com.sun.star.io.Pipe", ctx)
+
+    def roundTrip(self, data):
+        self.pipe.writeBytes(data)
+        self.pipe.closeOutput()
+        n, read = self.pipe.readBytes(None, len(HIGH_BYTES))
+        self.assertEqual(len(HIGH_BYTES), n)
+        return bytes(read)
+
+    def testBytes(self):
+        self.assertEqual(HIGH_BYTES, self.roundTrip(HIGH_BYTES))
+
+    def testByteArray(self):
+        self.assertEqual(HIGH_BYTES, self.roundTrip(bytearray(HIGH_BYTES)))
+
+    def testMemoryView(self):
+        self.assertEqual(HIGH_BYTES, self.roundTrip(memoryview(HIGH_BYTES)))
+
+    def testStridedBuffer(self):
+        data = bytearray(b'\xff' * (2 * len(HIGH_BYTES)))
+        data[1::2] = HIGH_BYTES
+        self.assertEqual(HIGH_BYTES, self.roundTrip(memoryview(data)[1::2]))
+
+    def testByteSequence(self):
+        self.assertEqual(HIGH_BYTES, self.roundTrip(uno.ByteSequence(HIGH_BYTES)))
+
+
+if __name__ == '__main__':
+    unittest.main()
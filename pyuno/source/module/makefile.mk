@@ -76,7 +76,9 @@ SLOFILES= \
 		$(SLO)$/pyuno_util.obj		\
 		$(SLO)$/pyuno_except.obj	\
 		$(SLO)$/pyuno_adapter.obj	\
-		$(SLO)$/pyuno_gc.obj
+		$(SLO)$/pyuno_gc.obj		\
+		$(SLO)$/pyuno_buffer.obj	\
+		$(SLO)$/pyuno_property.obj
 
 # remove this, when issue i35064 is integrated
 .IF "$(COM)"=="GCC"
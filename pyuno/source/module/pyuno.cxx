@@ -46,6 +46,7 @@ using com::sun::star::uno::Any;
 using com::sun::star::uno::makeAny;
 using com::sun::star::uno::UNO_QUERY;
 using com::sun::star::uno::Type;
+using com::sun::star::uno::TypeDescription;
 using com::sun::star::uno::TypeClass;
 using com::sun::star::uno::RuntimeException;
 using com::sun::star::uno::Exception;
@@ -54,17 +55,37 @@ using com::sun::star::lang::XSingleServiceFactory;
 using com::sun::star::lang::XServiceInfo;
 using com::sun::star::lang::XTypeProvider;
 using com::sun::star::script::XTypeConverter;
+using com::sun::star::script::XInvocation;
 using com::sun::star::script::XInvocation2;
 using com::sun::star::beans::XMaterialHolder;
 
 namespace pyuno
 {
 
+// the number of implementations, whose member tables are kept
+static const size_t MEMBER_TABLE_CACHE_SIZE = 64;
+
 PyObject *PyUNO_str( PyObject * self );
 
 void PyUNO_del (PyObject* self)
 {
     PyUNO* me = reinterpret_cast< PyUNO* > (self);
+    if( me->members->identity.is() )
+    {
+        try
+        {
+            Runtime runtime;
+            InterfaceWrapperMap & wrappers = runtime.getImpl()->cargo->wrappers;
+            InterfaceWrapperMap::iterator ii = wrappers.find( me->members->identity.get() );
+            if( ii != wrappers.end() && ii->second == self )
+                wrappers.erase( ii );
+        }
+        catch( RuntimeException & )
+        {
+            // the runtime is gone together with its wrapper map
+        }
+    }
+    me->members->callables.clear();
     {
         PyThreadDetach antiguard;
         delete me->members;
@@ -72,6 +93,191 @@ void PyUNO_del (PyObject* self)
     PyObject_Del (self);
 }
 
+Reference< XInvocation2 > PyUNO_getInvocation( PyUNO *me ) throw ( RuntimeException )
+{
+    if( me->members->xInvocationFactory.is() )
+    {
+        Reference< XSingleServiceFactory > ssf( me->members->xInvocationFactory );
+        Sequence<Any> arguments (1);
+        arguments[0] = me->members->wrappedObject;
+        Reference<XInvocation2> tmp_invocation;
+        try
+        {
+            PyThreadDetach antiguard;
+            tmp_invocation = Reference<XInvocation2>(
+                ssf->createInstanceWithArguments (arguments), UNO_QUERY );
+        }
+        catch( RuntimeException & )
+        {
+            throw;
+        }
+        catch( com::sun::star::uno::Exception & e )
+        {
+            throw RuntimeException( e.Message, e.Context );
+        }
+        // another thread may have been faster
+        if( me->members->xInvocationFactory.is() )
+        {
+            me->members->xInvocation = tmp_invocation;
+            me->members->xInvocationFactory.clear();
+        }
+    }
+    return me->members->xInvocation;
+}
+
+MemberTable::MemberTable()
+    : m_nRefCount( 0 )
+{
+}
+
+const MemberTable::Member *MemberTable::find( const char *pName ) const
+{
+    MemberMap::const_iterator ii = m_members.find( pName );
+    return ii == m_members.end() ? 0 : &ii->second;
+}
+
+const MemberTable::Member *MemberTable::insert(
+    const char *pName, const OUString &name,
+    const Type &interfaceType, const TypeDescription &method )
+{
+    // another thread may have inserted the name, while the lock was released
+    MemberMap::iterator ii = m_members.find( pName );
+    if( ii != m_members.end() )
+        return &ii->second;
+
+    Member member;
+    member.pyName = rtl::OString( pName );
+    member.name = name;
+    member.interfaceType = interfaceType;
+    member.method = method;
+    // the copy in the map shares the buffer of the key
+    Member &inserted = m_members[ member.pyName.getStr() ];
+    inserted = member;
+    return &inserted;
+}
+
+/** returns the member table shared by all objects of the implementation of the
+    wrapped interface, or 0 when the members of the object can't be shared
+ */
+static MemberTable *getMemberTable( PyUNO *me, RuntimeCargo *cargo ) throw ( RuntimeException )
+{
+    PyUNOInternals *members = me->members;
+    if( ! members->memberTableChecked )
+    {
+        members->memberTableChecked = true;
+        Reference< XInterface > xObject;
+        if( members->wrappedObject >>= xObject )
+        {
+            Sequence< sal_Int8 > id;
+            bool bDynamic;
+            {
+                PyThreadDetach antiguard;
+                Reference< XTypeProvider > xTypeProvider( xObject, UNO_QUERY );
+                if( xTypeProvider.is() )
+                    id = xTypeProvider->getImplementationId();
+                // the invocation passes the calls to objects implementing
+                // XInvocation themselves, their members may change at any time
+                bDynamic = Reference< XInvocation >( xObject, UNO_QUERY ).is();
+            }
+            members->dynamicMembers = bDynamic;
+            if( id.getLength() && ! bDynamic )
+            {
+                rtl::OString key( (const sal_Char *) id.getConstArray(), id.getLength() );
+                MemberTableMap &tables = cargo->memberTables;
+                MemberTableMap::iterator ii = tables.find( key );
+                if( ii == tables.end() )
+                {
+                    // the tables in use are held by their wrappers
+                    if( tables.size() >= MEMBER_TABLE_CACHE_SIZE )
+                        tables.clear();
+                    ii = tables.insert( MemberTableMap::value_type( key, new MemberTable() ) ).first;
+                }
+                members->memberTable = ii->second;
+            }
+        }
+    }
+    return members->memberTable.get();
+}
+
+/** looks the method up in the interfaces reported by the type provider of the
+    object. Fails, when different methods of the interfaces have the name.
+ */
+static bool findInterfaceMethod(
+    const Any &wrappedObject, const OUString &name, Type &interfaceType, TypeDescription &method )
+    throw ( RuntimeException )
+{
+    Sequence< Type > types;
+    {
+        PyThreadDetach antiguard;
+        Reference< XTypeProvider > xTypeProvider;
+        wrappedObject >>= xTypeProvider;
+        if( xTypeProvider.is() )
+            types = xTypeProvider->getTypes();
+    }
+
+    OUString found;
+    for( sal_Int32 i = 0; i < types.getLength(); ++i )
+    {
+        if( types[i].getTypeClass() != com::sun::star::uno::TypeClass_INTERFACE )
+            continue;
+        TypeDescription desc( types[i] );
+        if( ! desc.is() )
+            continue;
+        desc.makeComplete();
+        typelib_InterfaceTypeDescription *pInterface =
+            (typelib_InterfaceTypeDescription *) desc.get();
+        for( sal_Int32 n = 0; n < pInterface->nAllMembers; ++n )
+        {
+            typelib_TypeDescriptionReference *pMember = pInterface->ppAllMembers[n];
+            if( pMember->eTypeClass != typelib_TypeClass_INTERFACE_METHOD )
+                continue;
+            // the member names are qualified like "com.sun.star.lang.XComponent::dispose"
+            OUString memberName( pMember->pTypeName );
+            sal_Int32 nStart = memberName.lastIndexOf( ':' ) + 1;
+            if( memberName.getLength() - nStart != name.getLength() ||
+                ! memberName.match( name, nStart ) )
+                continue;
+            if( found.getLength() )
+            {
+                if( found != memberName )
+                    return false;
+                continue;
+            }
+            found = memberName;
+        }
+    }
+    if( ! found.getLength() )
+        return false;
+
+    method = TypeDescription( found );
+    if( ! method.is() )
+        return false;
+    method.makeComplete();
+    // the method is called on the interface declaring it
+    interfaceType = Type(
+        com::sun::star::uno::TypeClass_INTERFACE, found.copy( 0, found.lastIndexOf( ':' ) - 1 ) );
+    return true;
+}
+
+/** maps the interface of the wrapped object into the binary uno environment,
+    returns 0 if the object doesn't support it
+ */
+static uno_Interface *mapToUno(
+    const Any &wrappedObject, const Type &interfaceType, RuntimeCargo *cargo )
+    throw ( RuntimeException )
+{
+    Reference< XInterface > xObject;
+    wrappedObject >>= xObject;
+    Any a;
+    {
+        PyThreadDetach antiguard;
+        a = xObject->queryInterface( interfaceType );
+    }
+    if( a.getValueTypeClass() != com::sun::star::uno::TypeClass_INTERFACE )
+        return 0;
+    return (uno_Interface *) cargo->cpp2uno.mapInterface( *(void **) a.getValue(), interfaceType );
+}
+
 
 
 OUString val2str( const void * pVal, typelib_TypeDescriptionReference * pTypeRef , sal_Int32 mode ) SAL_THROW( () )
@@ -318,7 +524,7 @@ PyObject *PyUNO_repr( PyObject  * self )
     if( me->members->wrappedObject.getValueType().getTypeClass()
         == com::sun::star::uno::TypeClass_EXCEPTION )
     {
-        Reference< XMaterialHolder > rHolder(me->members->xInvocation,UNO_QUERY);
+        Reference< XMaterialHolder > rHolder(PyUNO_getInvocation(me),UNO_QUERY);
         if( rHolder.is() )
         {
             Any a = rHolder->getMaterial();
@@ -346,7 +552,8 @@ PyObject *PyUNO_invoke( PyObject *object, const char *name , PyObject *args )
         {
             PyUNO* me = (PyUNO*) object;
             OUString attrName = OUString::createFromAscii(name);
-            if (! me->members->xInvocation->hasMethod (attrName))
+            Reference< XInvocation2 > xInvocation( PyUNO_getInvocation( me ) );
+            if (! xInvocation->hasMethod (attrName))
             {
                 OUStringBuffer buf;
                 buf.appendAscii( "Attribute " );
@@ -355,7 +562,7 @@ PyObject *PyUNO_invoke( PyObject *object, const char *name , PyObject *args )
                 throw RuntimeException( buf.makeStringAndClear(), Reference< XInterface > () );
             }
             callable = PyUNO_callable_new (
-                me->members->xInvocation,
+                xInvocation,
                 attrName,
                 ACCEPT_UNO_ANY);
             paras = args;
@@ -419,7 +626,7 @@ PyObject *PyUNO_str( PyObject * self )
         me->members->wrappedObject.getValueType().getTypeClass()
         == com::sun::star::uno::TypeClass_EXCEPTION)
     {
-        Reference< XMaterialHolder > rHolder(me->members->xInvocation,UNO_QUERY);
+        Reference< XMaterialHolder > rHolder(PyUNO_getInvocation(me),UNO_QUERY);
         if( rHolder.is() )
         {
             PyThreadDetach antiguard;
@@ -461,6 +668,19 @@ PyObject* PyUNO_getattr (PyObject* self, char* name)
         Runtime runtime;
     
         me = (PyUNO*) self;
+        if( me->members->callables.is() )
+        {
+#if PY_MAJOR_VERSION >= 3
+            PyObject *callable = PyDict_GetItem( me->members->callables.get(), attr_name );
+#else
+            PyObject *callable = PyDict_GetItemString( me->members->callables.get(), name );
+#endif
+            if( callable )
+            {
+                Py_INCREF( callable );
+                return callable;
+            }
+        }
 #if PY_MAJOR_VERSION < 3
         //Handle Python dir () stuff first...
         if (strcmp (name, "__members__") == 0)
@@ -468,7 +688,7 @@ PyObject* PyUNO_getattr (PyObject* self, char* name)
             PyObject* member_list;
             Sequence<OUString> oo_member_list;
 
-            oo_member_list = me->members->xInvocation->getMemberNames ();
+            oo_member_list = PyUNO_getInvocation( me )->getMemberNames ();
             member_list = PyList_New (oo_member_list.getLength ());
             for (int i = 0; i < oo_member_list.getLength (); i++)
             {
@@ -485,27 +705,84 @@ PyObject* PyUNO_getattr (PyObject* self, char* name)
         }
 #endif
 
-        OUString attrName( OUString::createFromAscii( name ) );
-        //We need to find out if it's a method...
-        if (me->members->xInvocation->hasMethod (attrName))
+        RuntimeCargo *cargo = runtime.getImpl()->cargo;
+        MemberTable *table = getMemberTable( me, cargo );
+        const MemberTable::Member *member = table ? table->find( name ) : 0;
+        // not created for members already known
+        Reference< XInvocation2 > xInvocation;
+        OUString attrName;
+        bool bMethod;
+        bool bProperty;
+        if( member )
+        {
+            attrName = member->name;
+            bMethod = true;
+            bProperty = false;
+        }
+        else
+        {
+            xInvocation = PyUNO_getInvocation( me );
+            attrName = OUString::createFromAscii( name );
+            //We need to find out if it's a method...
+            bMethod = xInvocation->hasMethod (attrName);
+            //or a property
+            bProperty = ! bMethod && xInvocation->hasProperty ( attrName);
+            if( table && bMethod )
+            {
+                Type interfaceType;
+                TypeDescription method;
+                if( cargo->cpp2uno.is() && cargo->uno2cpp.is() )
+                    findInterfaceMethod( me->members->wrappedObject, attrName, interfaceType, method );
+                member = table->insert( name, attrName, interfaceType, method );
+            }
+        }
+
+        if (bMethod)
         {
             //Create a callable object to invoke this...
-            PyRef ret = PyUNO_callable_new (
-                me->members->xInvocation,
-                attrName);
+            PyRef ret;
+            uno_Interface *pUnoI = 0;
+            if( member && member->method.is() )
+                pUnoI = mapToUno( me->members->wrappedObject, member->interfaceType, cargo );
+            if( pUnoI )
+            {
+                ret = PyUNO_callable_newDirect( pUnoI, member->method, attrName );
+                (*pUnoI->release)( pUnoI );
+            }
+            else
+            {
+                if( ! xInvocation.is() )
+                    xInvocation = PyUNO_getInvocation( me );
+                ret = PyUNO_callable_new (
+                    xInvocation,
+                    attrName);
+            }
+            if( ret.is() && ! me->members->dynamicMembers )
+            {
+                // the same callable is returned for further lookups, unless
+                // the method may be gone then
+                if( ! me->members->callables.is() )
+                    me->members->callables = PyRef( PyDict_New(), SAL_NO_ACQUIRE );
+#if PY_MAJOR_VERSION >= 3
+                PyDict_SetItem( me->members->callables.get(), attr_name, ret.get() );
+#else
+                PyDict_SetItemString( me->members->callables.get(), name, ret.get() );
+#endif
+            }
             Py_XINCREF( ret.get() );
             return ret.get();
       
         }
 
-        //or a property
-        if (me->members->xInvocation->hasProperty ( attrName))
+        if (bProperty)
         {
             //Return the value of the property
+            if( ! xInvocation.is() )
+                xInvocation = PyUNO_getInvocation( me );
             Any anyRet;
             {
                 PyThreadDetach antiguard;
-                anyRet = me->members->xInvocation->getValue (attrName);
+                anyRet = xInvocation->getValue (attrName);
             }
             PyRef ret = runtime.any2PyObject(anyRet);
             Py_XINCREF( ret.get() );
@@ -579,11 +856,12 @@ int PyUNO_setattr (PyObject* self, char* name, PyObject* value)
         Any val= runtime.pyObject2Any(value, ACCEPT_UNO_ANY);
 
         OUString attrName( OUString::createFromAscii( name ) );
+        Reference< XInvocation2 > xInvocation( PyUNO_getInvocation( me ) );
         {
             PyThreadDetach antiguard;
-            if (me->members->xInvocation->hasProperty (attrName))
+            if (xInvocation->hasProperty (attrName))
             {
-                me->members->xInvocation->setValue (attrName, val);
+                xInvocation->setValue (attrName, val);
                 return 0; //Keep with Python's boolean system
             }
         }
@@ -620,7 +898,15 @@ static PyObject *PyUNO_dir( PyObject *self, PyObject */* that */ )
     Sequence<OUString> oo_member_list;
     
     me = (PyUNO*) self;
-    oo_member_list = me->members->xInvocation->getMemberNames ();
+    try
+    {
+        oo_member_list = PyUNO_getInvocation( me )->getMemberNames ();
+    }
+    catch( RuntimeException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+        return NULL;
+    }
     member_list = PyList_New (oo_member_list.getLength ());
     for (int i = 0; i < oo_member_list.getLength (); i++)
     {
@@ -658,8 +944,8 @@ static PyObject *PyUNO_richcompare( PyObject *self, PyObject *that, int op )
                     if( tcMe == com::sun::star::uno::TypeClass_STRUCT ||
                         tcMe == com::sun::star::uno::TypeClass_EXCEPTION )
                     {
-                        Reference< XMaterialHolder > xMe( me->members->xInvocation,UNO_QUERY);
-                        Reference< XMaterialHolder > xOther( other->members->xInvocation,UNO_QUERY );
+                        Reference< XMaterialHolder > xMe( PyUNO_getInvocation(me),UNO_QUERY);
+                        Reference< XMaterialHolder > xOther( PyUNO_getInvocation(other),UNO_QUERY );
                         if( xMe->getMaterial() == xOther->getMaterial() )
                         {
                             if (op == Py_EQ)
@@ -727,8 +1013,8 @@ static int PyUNO_cmp( PyObject *self, PyObject *that )
                 if( tcMe == com::sun::star::uno::TypeClass_STRUCT ||
                     tcMe == com::sun::star::uno::TypeClass_EXCEPTION )
                 {
-                    Reference< XMaterialHolder > xMe( me->members->xInvocation,UNO_QUERY);
-                    Reference< XMaterialHolder > xOther( other->members->xInvocation,UNO_QUERY );
+                    Reference< XMaterialHolder > xMe( PyUNO_getInvocation(me),UNO_QUERY);
+                    Reference< XMaterialHolder > xOther( PyUNO_getInvocation(other),UNO_QUERY );
                     if( xMe->getMaterial() == xOther->getMaterial() )
                         return 0;
                 }
@@ -827,7 +1113,8 @@ PyRef getPyUnoClass()
 }
 
 PyObject* PyUNO_new (
-    const Any & targetInterface, const Reference<XSingleServiceFactory> &ssf)
+    const Any & targetInterface, const Reference<XSingleServiceFactory> &ssf,
+    RuntimeCargo *cargo )
 {
     Reference<XInterface> tmp_interface;
   
@@ -839,7 +1126,32 @@ PyObject* PyUNO_new (
         return Py_None;
     }
 
-    return PyUNO_new_UNCHECKED (targetInterface, ssf);
+    // the same object may come through different interfaces
+    Reference< XInterface > identity( tmp_interface, UNO_QUERY );
+    if( identity.is() )
+    {
+        InterfaceWrapperMap::iterator ii = cargo->wrappers.find( identity.get() );
+        if( ii != cargo->wrappers.end() )
+        {
+            Py_INCREF( ii->second );
+            return ii->second;
+        }
+    }
+
+    PyUNO* self = PyObject_New (PyUNO, &PyUNOType);
+    if (self == NULL)
+        return NULL; //NULL == error
+    self->members = new PyUNOInternals();
+    // the invocation is created by PyUNO_getInvocation
+    self->members->xInvocationFactory = ssf;
+    self->members->wrappedObject = targetInterface;
+    if( identity.is() )
+    {
+        // the wrapper holds the identity, so that its address can't get reused
+        self->members->identity = identity;
+        cargo->wrappers[ self->members->identity.get() ] = (PyObject*) self;
+    }
+    return (PyObject*) self;
 }
 
 
@@ -25,7 +25,7 @@
 #include <rtl/ustrbuf.hxx>
 #include <rtl/strbuf.hxx>
 
-#include <com/sun/star/beans/MethodConcept.hpp>
+#include <typelib/typedescription.hxx>
 
 #include <cppuhelper/typeprovider.hxx>
 
@@ -36,7 +36,6 @@ using rtl::OString;
 using rtl::OStringBuffer;
 
 using com::sun::star::beans::XIntrospectionAccess;
-using com::sun::star::beans::XIntrospection;
 using com::sun::star::uno::Any;
 using com::sun::star::uno::makeAny;
 using com::sun::star::uno::Reference;
@@ -44,13 +43,12 @@ using com::sun::star::uno::Sequence;
 using com::sun::star::uno::RuntimeException;
 using com::sun::star::uno::XInterface;
 using com::sun::star::uno::Type;
+using com::sun::star::uno::TypeDescription;
 using com::sun::star::lang::XUnoTunnel;
 using com::sun::star::lang::IllegalArgumentException;
 using com::sun::star::beans::UnknownPropertyException;
 using com::sun::star::script::CannotConvertException;
 using com::sun::star::reflection::InvocationTargetException;
-using com::sun::star::reflection::XIdlMethod;
-using com::sun::star::reflection::ParamInfo;
 using com::sun::star::reflection::XIdlClass;
 
 #define TO_ASCII(x) OUStringToOString( x , RTL_TEXTENCODING_ASCII_US).getStr()
@@ -58,10 +56,14 @@ using com::sun::star::reflection::XIdlClass;
 namespace pyuno
 {
 
+// the number of python classes, whose methods are kept
+static const size_t CLASS_METHOD_CACHE_SIZE = 64;
+
 Adapter::Adapter( const PyRef & ref, const Sequence< Type > &types )
     : mWrappedObject( ref ),
       mInterpreter( (PyThreadState_Get()->interp) ),
-      mTypes( types )
+      mTypes( types ),
+      m_pOutIndexes( 0 )
 {}
 
 Adapter::~Adapter()
@@ -107,83 +109,181 @@ Reference< XIntrospectionAccess > Adapter::getIntrospection()
     return Reference< XIntrospectionAccess > ();
 }
 
-Sequence< sal_Int16 > Adapter::getOutIndexes( const OUString & functionName )
+static void addOutIndexes(
+    MethodOutIndexMap &table, typelib_InterfaceTypeDescription *pInterface )
 {
-    Sequence< sal_Int16 > ret;
-    MethodOutIndexMap::const_iterator ii = m_methodOutIndexMap.find( functionName );
-    if( ii == m_methodOutIndexMap.end() )
+    // the members of the base interfaces are included
+    for( sal_Int32 i = 0 ; i < pInterface->nAllMembers ; i ++ )
     {
-
-        Runtime runtime;
+        TypeDescription member( pInterface->ppAllMembers[i] );
+        if( ! member.is() || member.get()->eTypeClass != typelib_TypeClass_INTERFACE_METHOD )
+            continue;
+        typelib_InterfaceMethodTypeDescription *pMethod =
+            (typelib_InterfaceMethodTypeDescription *) member.get();
+        OUString name( pMethod->aBase.pMemberName );
+        if( table.find( name ) != table.end() )
+            continue;
+
+        int nOuts = 0;
+        for( sal_Int32 j = 0 ; j < pMethod->nParams ; j ++ )
         {
-            PyThreadDetach antiguard;
-
-            // retrieve the adapter object again. It will be the same instance as before,
-            // (the adapter factory keeps a weak map inside, which I couldn't have outside)
-            Reference< XInterface > unoAdapterObject =
-                runtime.getImpl()->cargo->xAdapterFactory->createAdapter( this, mTypes );
-
-            // uuuh, that's really expensive. The alternative would have been, to store
-            // an instance of the introspection at (this), but this results in a cyclic
-            // reference, which is never broken (as it is up to OOo1.1.0).
-            Reference< XIntrospectionAccess > introspection =
-                runtime.getImpl()->cargo->xIntrospection->inspect( makeAny( unoAdapterObject ) );
-            
-            if( !introspection.is() )
+            if( pMethod->pParams[j].bOut )
+                nOuts ++;
+        }
+        // sequence must be interpreted as return value/outparameter tuple !
+        Sequence< sal_Int16 > outIndexes( nOuts );
+        sal_Int32 nOutsAssigned = 0;
+        for( sal_Int32 j = 0 ; j < pMethod->nParams ; j ++ )
+        {
+            if( pMethod->pParams[j].bOut )
             {
-                throw RuntimeException(
-                    OUString( RTL_CONSTASCII_USTRINGPARAM( "pyuno bridge: Couldn't inspect uno adapter ( the python class must implement com.sun.star.lang.XTypeProvider !)" ) ),
-                    Reference< XInterface > () );
+                outIndexes[nOutsAssigned] = (sal_Int16) j;
+                nOutsAssigned ++;
             }
+        }
+        table[ name ] = outIndexes;
+    }
+}
 
-            Reference< XIdlMethod > method = introspection->getMethod(
-                functionName, com::sun::star::beans::MethodConcept::ALL );
-            if( ! method.is( ) )
-            {
-                throw RuntimeException(
-                    (OUString(
-                        RTL_CONSTASCII_USTRINGPARAM(
-                            "pyuno bridge: Couldn't get reflection for method "))
-                     + functionName),
-                    Reference< XInterface > () );
-            }
+/** returns the out parameter indexes of the methods of the types, taken from
+    their type descriptions once per runtime
+ */
+static const MethodOutIndexMap &getOutIndexTable(
+    RuntimeCargo *cargo, const Sequence< Type > &types )
+{
+    OUStringBuffer buf;
+    for( sal_Int32 i = 0 ; i < types.getLength() ; i ++ )
+    {
+        buf.append( types[i].getTypeName() );
+        buf.append( (sal_Unicode) ';' );
+    }
+    OUString key = buf.makeStringAndClear();
+    OutIndexTableMap::iterator ii = cargo->outIndexTables.find( key );
+    if( ii != cargo->outIndexTables.end() )
+        return ii->second;
 
-            Sequence< ParamInfo > seqInfo = method->getParameterInfos();
-            int i;
-            int nOuts = 0;
-            for( i = 0 ; i < seqInfo.getLength() ; i ++ )
-            {
-                if( seqInfo[i].aMode == com::sun::star::reflection::ParamMode_OUT ||
-                    seqInfo[i].aMode == com::sun::star::reflection::ParamMode_INOUT )
-                {
-                    // sequence must be interpreted as return value/outparameter tuple !
-                    nOuts ++;
-                }
-            }
+    MethodOutIndexMap &table = cargo->outIndexTables[ key ];
+    for( sal_Int32 i = 0 ; i < types.getLength() ; i ++ )
+    {
+        if( types[i].getTypeClass() != com::sun::star::uno::TypeClass_INTERFACE )
+            continue;
+        TypeDescription desc( types[i] );
+        if( ! desc.is() )
+            continue;
+        desc.makeComplete();
+        addOutIndexes( table, (typelib_InterfaceTypeDescription *) desc.get() );
+    }
+    return table;
+}
 
-            if( nOuts )
-            {
-                ret.realloc( nOuts );
-                sal_Int32 nOutsAssigned = 0;
-                for( i = 0 ; i < seqInfo.getLength() ; i ++ )
-                {
-                    if( seqInfo[i].aMode == com::sun::star::reflection::ParamMode_OUT ||
-                        seqInfo[i].aMode == com::sun::star::reflection::ParamMode_INOUT )
-                    {
-                        ret[nOutsAssigned] = (sal_Int16) i;
-                        nOutsAssigned ++;
-                    }
-                }
-            }
+Sequence< sal_Int16 > Adapter::getOutIndexes( const OUString & functionName )
+{
+    if( ! m_pOutIndexes )
+    {
+        Runtime runtime;
+        m_pOutIndexes = &getOutIndexTable( runtime.getImpl()->cargo, mTypes );
+    }
+    MethodOutIndexMap::const_iterator ii = m_pOutIndexes->find( functionName );
+    if( ii == m_pOutIndexes->end() )
+    {
+        throw RuntimeException(
+            (OUString(
+                RTL_CONSTASCII_USTRINGPARAM(
+                    "pyuno bridge: Couldn't get reflection for method "))
+             + functionName),
+            Reference< XInterface > () );
+    }
+    return ii->second;
+}
+
+/** @return the version tag of the class, which changes whenever the class is
+    modified, or 0, when the class has none
+ */
+static unsigned int getVersionTag( PyTypeObject *type )
+{
+#if PY_VERSION_HEX >= 0x030C0000
+    if( ! type->tp_version_tag )
+        PyUnstable_Type_AssignVersionTag( type );
+    return type->tp_version_tag;
+#else
+    // the tag of a modified class is kept by older versions, only the flag
+    // tells, that it is outdated
+    return PyType_HasFeature( type, Py_TPFLAGS_VALID_VERSION_TAG ) ? type->tp_version_tag : 0;
+#endif
+}
+
+const ClassMethod &getClassMethod(
+    RuntimeCargo *cargo, PyObject *object, const OUString &name )
+{
+    PyTypeObject *type = Py_TYPE( object );
+    PyRef typeRef( (PyObject *) type );
+    ClassMethodTableMap &tables = cargo->classMethods;
+    ClassMethodTableMap::iterator jj = tables.find( typeRef );
+    if( jj == tables.end() )
+    {
+        if( tables.size() >= CLASS_METHOD_CACHE_SIZE )
+        {
+            // the classes are released after the map is empty
+            ClassMethodTableMap dropped;
+            dropped.swap( tables );
         }
-        // guard active again !
-        m_methodOutIndexMap[ functionName ] = ret;
+        jj = tables.insert( ClassMethodTableMap::value_type( typeRef, ClassMethodTable() ) ).first;
     }
-    else
+    ClassMethodTable &table = jj->second;
+
+    // the methods of a modified class are looked up again
+    const unsigned int versionTag = getVersionTag( type );
+    if( ! versionTag || versionTag != table.versionTag )
     {
-        ret = ii->second;
+        table.methods.clear();
+        table.versionTag = 0;
     }
-    return ret;
+
+    ClassMethodMap::iterator ii = table.methods.find( name );
+    if( ii == table.methods.end() )
+    {
+        ClassMethod method;
+        method.pyName = PyRef( PYSTR_INTERNFROMSTR( TO_ASCII( name ) ), SAL_NO_ACQUIRE );
+        // classes overriding the attribute lookup are left to it
+        if( type->tp_getattro == PyObject_GenericGetAttr && method.pyName.is() )
+        {
+            PyObject *descr = _PyType_Lookup( type, method.pyName.get() );
+            method.function = descr && PyFunction_Check( descr ) ? PyRef( descr ) : PyRef();
+        }
+        ii = table.methods.insert( ClassMethodMap::value_type( name, method ) ).first;
+        // the lookup may have assigned a version tag to the class
+        table.versionTag = getVersionTag( type );
+    }
+    return ii->second;
+}
+
+bool isOverriddenByInstance( PyObject *object, PyObject *pyName, PyObject *function )
+{
+#if PY_VERSION_HEX >= 0x030B0000
+    // the instance dict of these classes is created on demand, which
+    // _PyObject_GetDictPtr() would do. The attribute lookup of the instance
+    // tells instead, whether it yields the function of the class.
+    if( PyType_HasFeature( Py_TYPE( object ), Py_TPFLAGS_MANAGED_DICT ) )
+    {
+        PyObject *attr = 0;
+#if PY_VERSION_HEX >= 0x030D0000
+        if( PyObject_GetOptionalAttr( object, pyName, &attr ) < 0 )
+            PyErr_Clear();
+        bool bOverridden = ! ( attr && PyMethod_Check( attr ) &&
+                               PyMethod_GET_FUNCTION( attr ) == function &&
+                               PyMethod_GET_SELF( attr ) == object );
+#else
+        // returns the function unbound, unless the instance overrides it
+        bool bOverridden = ! _PyObject_GetMethod( object, pyName, &attr ) || attr != function;
+        if( ! attr )
+            PyErr_Clear();
+#endif
+        Py_XDECREF( attr );
+        return bOverridden;
+    }
+#endif
+    PyObject **dictPtr = _PyObject_GetDictPtr( object );
+    return dictPtr && *dictPtr && PyDict_GetItem( *dictPtr, pyName );
 }
 
 Any Adapter::invoke( const OUString &aFunctionName,
@@ -219,26 +319,18 @@ Any Adapter::invoke( const OUString &aFunctionName,
                      mWrappedObject.get(), aFunctionName, aParams );
         }
        
-        sal_Int32 size = aParams.getLength();
-        PyRef argsTuple(PyTuple_New( size ), SAL_NO_ACQUIRE );
-        int i;
-        // fill tuple with default values in case of exceptions
-        for(  i = 0 ;i < size ; i ++ )
+        // get callable, the function of the class is called with the object
+        // as first argument, unless the instance dict overrides it
+        const ClassMethod &classMethod = getClassMethod( cargo, mWrappedObject.get(), aFunctionName );
+        PyRef pyName( classMethod.pyName );
+        PyRef method( classMethod.function );
+        if( method.is() && isOverriddenByInstance( mWrappedObject.get(), pyName.get(), method.get() ) )
+            method = PyRef();
+        int nSelf = method.is() ? 1 : 0;
+        if( ! method.is() && pyName.is() )
         {
-            Py_INCREF( Py_None );
-            PyTuple_SetItem( argsTuple.get(), i, Py_None );
+            method = PyRef( PyObject_GetAttr( mWrappedObject.get(), pyName.get() ), SAL_NO_ACQUIRE );
         }
-
-        // convert args to python
-        for( i = 0; i < size ; i ++  )
-        {
-            PyRef val = runtime.any2PyObject( aParams[i] );
-            PyTuple_SetItem( argsTuple.get(), i, val.getAcquired() );
-        }
-
-        // get callable
-        PyRef method(PyObject_GetAttrString( mWrappedObject.get(), (char*)TO_ASCII(aFunctionName)),
-                     SAL_NO_ACQUIRE);
         raiseInvocationTargetExceptionWhenNeeded( runtime);
         if( !method.is() )
         {
@@ -250,6 +342,22 @@ Any Adapter::invoke( const OUString &aFunctionName,
             throw IllegalArgumentException( buf.makeStringAndClear(), Reference< XInterface > (),0 );
         }
 
+        // convert args to python, the slots left empty by an exception
+        // are skipped when the tuple is released
+        sal_Int32 size = aParams.getLength();
+        PyRef argsTuple(PyTuple_New( nSelf + size ), SAL_NO_ACQUIRE );
+        if( nSelf )
+        {
+            Py_INCREF( mWrappedObject.get() );
+            PyTuple_SET_ITEM( argsTuple.get(), 0, mWrappedObject.get() );
+        }
+        int i;
+        for( i = 0; i < size ; i ++  )
+        {
+            PyTuple_SET_ITEM(
+                argsTuple.get(), nSelf + i, runtime.any2PyObject( aParams[i] ).getAcquired() );
+        }
+
         PyRef pyRet( PyObject_CallObject( method.get(), argsTuple.get() ), SAL_NO_ACQUIRE );
         raiseInvocationTargetExceptionWhenNeeded( runtime);
         if( pyRet.is() )
@@ -0,0 +1,1008 @@
+/**************************************************************
+ *
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ *
+ *************************************************************/
+
+
+#include "pyuno_impl.hxx"
+
+#include <rtl/strbuf.hxx>
+
+#include <typelib/typedescription.hxx>
+#include <uno/data.h>
+#include <uno/sequence2.h>
+
+#include <limits>
+#include <string.h>
+#include <vector>
+
+using rtl::OString;
+using rtl::OUString;
+using rtl::OStringBuffer;
+using com::sun::star::uno::Any;
+using com::sun::star::uno::makeAny;
+using com::sun::star::uno::Sequence;
+using com::sun::star::uno::TypeDescription;
+using com::sun::star::uno::RuntimeException;
+
+namespace pyuno
+{
+
+/** Exports the memory of a numeric UNO sequence through the buffer protocol.
+
+    The object keeps the sequence alive, so that memoryview, array or
+    numpy.frombuffer can read the values without copying them.
+ */
+typedef struct
+{
+    Any sequence;
+    void *data;
+    const char *format;
+    Py_ssize_t itemsize;
+    int ndim;
+    Py_ssize_t shape[2];
+    Py_ssize_t strides[2];
+} PyUNO_SequenceBuffer_Internals;
+
+typedef struct
+{
+    PyObject_HEAD
+    PyUNO_SequenceBuffer_Internals *members;
+} PyUNO_SequenceBuffer;
+
+static const char *getBufferFormat( typelib_TypeClass eTypeClass, Py_ssize_t *pItemSize )
+{
+    switch( eTypeClass )
+    {
+    case typelib_TypeClass_BOOLEAN:
+        *pItemSize = sizeof( sal_Bool );
+        return "?";
+    case typelib_TypeClass_BYTE:
+        *pItemSize = sizeof( sal_Int8 );
+        return "b";
+    case typelib_TypeClass_SHORT:
+        *pItemSize = sizeof( sal_Int16 );
+        return "h";
+    case typelib_TypeClass_UNSIGNED_SHORT:
+        *pItemSize = sizeof( sal_uInt16 );
+        return "H";
+    case typelib_TypeClass_LONG:
+        *pItemSize = sizeof( sal_Int32 );
+        return "i";
+    case typelib_TypeClass_UNSIGNED_LONG:
+        *pItemSize = sizeof( sal_uInt32 );
+        return "I";
+    case typelib_TypeClass_HYPER:
+        *pItemSize = sizeof( sal_Int64 );
+        return "q";
+    case typelib_TypeClass_UNSIGNED_HYPER:
+        *pItemSize = sizeof( sal_uInt64 );
+        return "Q";
+    case typelib_TypeClass_FLOAT:
+        *pItemSize = sizeof( float );
+        return "f";
+    case typelib_TypeClass_DOUBLE:
+        *pItemSize = sizeof( double );
+        return "d";
+    default:
+        return 0;
+    }
+}
+
+static PyObject *bufferItem2PyObject( const char *format, const void *p )
+{
+    switch( *format )
+    {
+    case '?':
+        return PyBool_FromLong( *(const sal_Bool *) p );
+#if PY_MAJOR_VERSION >= 3
+    case 'b':
+        return PyLong_FromLong( *(const sal_Int8 *) p );
+    case 'h':
+        return PyLong_FromLong( *(const sal_Int16 *) p );
+    case 'H':
+        return PyLong_FromLong( *(const sal_uInt16 *) p );
+    case 'i':
+        return PyLong_FromLong( *(const sal_Int32 *) p );
+#else
+    case 'b':
+        return PyInt_FromLong( *(const sal_Int8 *) p );
+    case 'h':
+        return PyInt_FromLong( *(const sal_Int16 *) p );
+    case 'H':
+        return PyInt_FromLong( *(const sal_uInt16 *) p );
+    case 'i':
+        return PyInt_FromLong( *(const sal_Int32 *) p );
+#endif
+    case 'I':
+        return PyLong_FromUnsignedLong( *(const sal_uInt32 *) p );
+    case 'q':
+        return PyLong_FromLongLong( *(const sal_Int64 *) p );
+    case 'Q':
+        return PyLong_FromUnsignedLongLong( *(const sal_uInt64 *) p );
+    case 'f':
+        return PyFloat_FromDouble( *(const float *) p );
+    case 'd':
+        return PyFloat_FromDouble( *(const double *) p );
+    default:
+        PyErr_SetString( PyExc_SystemError, "pyuno: unknown buffer format" );
+        return NULL;
+    }
+}
+
+static void PyUNO_SequenceBuffer_del( PyObject *self )
+{
+    PyUNO_SequenceBuffer *me = (PyUNO_SequenceBuffer *) self;
+    delete me->members;
+    PyObject_Del( self );
+}
+
+static int PyUNO_SequenceBuffer_getbuffer( PyObject *self, Py_buffer *view, int flags )
+{
+    PyUNO_SequenceBuffer_Internals *members = ((PyUNO_SequenceBuffer *) self)->members;
+    if( ( flags & PyBUF_WRITABLE ) == PyBUF_WRITABLE )
+    {
+        PyErr_SetString( PyExc_BufferError, "UNO sequence buffers are read-only" );
+        view->obj = NULL;
+        return -1;
+    }
+    Py_ssize_t nItems = 1;
+    for( int i = 0 ; i < members->ndim ; i ++ )
+        nItems *= members->shape[i];
+
+    view->buf = members->data;
+    view->obj = self;
+    Py_INCREF( self );
+    view->len = nItems * members->itemsize;
+    view->readonly = 1;
+    view->itemsize = members->itemsize;
+    view->format = ( flags & PyBUF_FORMAT ) ? const_cast< char * >( members->format ) : NULL;
+    view->ndim = members->ndim;
+    view->shape = ( flags & PyBUF_ND ) == PyBUF_ND ? members->shape : NULL;
+    view->strides = ( flags & PyBUF_STRIDES ) == PyBUF_STRIDES ? members->strides : NULL;
+    view->suboffsets = NULL;
+    view->internal = NULL;
+    return 0;
+}
+
+static Py_ssize_t PyUNO_SequenceBuffer_len( PyObject *self )
+{
+    return ((PyUNO_SequenceBuffer *) self)->members->shape[0];
+}
+
+static PyObject *PyUNO_SequenceBuffer_item( PyObject *self, Py_ssize_t index )
+{
+    PyUNO_SequenceBuffer_Internals *members = ((PyUNO_SequenceBuffer *) self)->members;
+    if( index < 0 || index >= members->shape[0] )
+    {
+        PyErr_SetString( PyExc_IndexError, "SequenceBuffer index out of range" );
+        return NULL;
+    }
+    const char *p = (const char *) members->data + index * members->strides[0];
+    if( 1 == members->ndim )
+        return bufferItem2PyObject( members->format, p );
+
+    // a row of a matrix
+    PyRef row( PyTuple_New( members->shape[1] ), SAL_NO_ACQUIRE );
+    for( Py_ssize_t i = 0 ; i < members->shape[1] ; i ++ )
+    {
+        PyObject *item = bufferItem2PyObject( members->format, p + i * members->strides[1] );
+        if( ! item )
+            return NULL;
+        PyTuple_SET_ITEM( row.get(), i, item );
+    }
+    return row.getAcquired();
+}
+
+static PyObject *PyUNO_SequenceBuffer_repr( PyObject *self )
+{
+    PyUNO_SequenceBuffer_Internals *members = ((PyUNO_SequenceBuffer *) self)->members;
+    OStringBuffer buf;
+    buf.append( "<SequenceBuffer instance '" ).append( members->format ).append( "' (" );
+    for( int i = 0 ; i < members->ndim ; i ++ )
+    {
+        if( i )
+            buf.append( ", " );
+        buf.append( (sal_Int64) members->shape[i] );
+    }
+    buf.append( ")>" );
+    OString s = buf.makeStringAndClear();
+    return PYSTR_FROMSTR( s.getStr() );
+}
+
+static PySequenceMethods PyUNO_SequenceBuffer_SequenceMethods =
+{
+    (lenfunc) PyUNO_SequenceBuffer_len,
+    (binaryfunc) 0,
+    (ssizeargfunc) 0,
+    (ssizeargfunc) PyUNO_SequenceBuffer_item,
+    0,
+    (ssizeobjargproc) 0,
+    0,
+    (objobjproc) 0,
+    (binaryfunc) 0,
+    (ssizeargfunc) 0
+};
+
+static PyBufferProcs PyUNO_SequenceBuffer_BufferProcs =
+{
+#if PY_MAJOR_VERSION < 3
+    (readbufferproc) 0,
+    (writebufferproc) 0,
+    (segcountproc) 0,
+    (charbufferproc) 0,
+#endif
+    (getbufferproc) PyUNO_SequenceBuffer_getbuffer,
+    (releasebufferproc) 0
+};
+
+static PyTypeObject PyUNO_SequenceBuffer_Type =
+{
+    PyVarObject_HEAD_INIT(&PyType_Type, 0)
+    const_cast< char * >("PyUNO_SequenceBuffer"),
+    sizeof (PyUNO_SequenceBuffer),
+    0,
+    (destructor) ::pyuno::PyUNO_SequenceBuffer_del,
+    (printfunc) 0,
+    (getattrfunc) 0,
+    (setattrfunc) 0,
+#if PY_MAJOR_VERSION >= 3
+    0,
+#else
+    (cmpfunc) 0,
+#endif
+    (reprfunc) ::pyuno::PyUNO_SequenceBuffer_repr,
+    0,
+    &PyUNO_SequenceBuffer_SequenceMethods,
+    0,
+    (hashfunc) 0,
+    (ternaryfunc) 0,
+    (reprfunc) 0,
+    (getattrofunc)0,
+    (setattrofunc)0,
+    &PyUNO_SequenceBuffer_BufferProcs,
+#if PY_MAJOR_VERSION >= 3
+    Py_TPFLAGS_DEFAULT,
+#else
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_NEWBUFFER,
+#endif
+    NULL,
+    (traverseproc)0,
+    (inquiry)0,
+    (richcmpfunc)0,
+    0,
+    (getiterfunc)0,
+    (iternextfunc)0,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    (descrgetfunc)0,
+    (descrsetfunc)0,
+    0,
+    (initproc)0,
+    (allocfunc)0,
+    (newfunc)0,
+    (freefunc)0,
+    (inquiry)0,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    (destructor)0
+#if PY_VERSION_HEX >= 0x02060000
+    , 0
+#endif
+};
+
+static PyRef PyUNO_SequenceBuffer_new(
+    const Any &sequence, const char *format, Py_ssize_t itemsize )
+{
+    PyUNO_SequenceBuffer *self =
+        PyObject_New( PyUNO_SequenceBuffer, &PyUNO_SequenceBuffer_Type );
+    if( self == NULL )
+        return PyRef();
+
+    uno_Sequence *pSeq = *(uno_Sequence **) sequence.getValue();
+    self->members = new PyUNO_SequenceBuffer_Internals;
+    self->members->sequence = sequence;
+    self->members->data = pSeq->elements;
+    self->members->format = format;
+    self->members->itemsize = itemsize;
+    self->members->ndim = 1;
+    self->members->shape[0] = pSeq->nElements;
+    self->members->strides[0] = itemsize;
+    self->members->shape[1] = 0;
+    self->members->strides[1] = 0;
+    return PyRef( (PyObject *) self, SAL_NO_ACQUIRE );
+}
+
+/** releases the buffer view on destruction
+ */
+class BufferGuard
+{
+    Py_buffer *m_pView;
+public:
+    explicit BufferGuard( Py_buffer *pView ) : m_pView( pView ) {}
+    ~BufferGuard() { PyBuffer_Release( m_pView ); }
+};
+
+/** checks, that a floating point value lies within the range of the integer
+    type D before it gets cast. NaN fails both comparisons.
+ */
+template< bool bInteger >
+struct RangeCheck
+{
+    template< typename D, typename S >
+    static bool fits( S ) { return true; }
+};
+
+template<>
+struct RangeCheck< false >
+{
+    template< typename D, typename S >
+    static bool fits( S s )
+    {
+        return s >= static_cast< S >( std::numeric_limits< D >::min() ) &&
+               s < static_cast< S >( std::numeric_limits< D >::max() ) + 1;
+    }
+};
+
+/** casts a value to the item type of the sequence
+    @return false, when D can't hold the value, e.g. on overflow or for a
+            negative value and an unsigned type
+ */
+template< typename D >
+struct ItemCast
+{
+    template< typename S >
+    static bool cast( S s, D &d )
+    {
+        if( ! RangeCheck< std::numeric_limits< S >::is_integer >::template fits< D >( s ) )
+            return false;
+        d = static_cast< D >( s );
+        return static_cast< S >( d ) == s && ( s < S() ) == ( d < D() );
+    }
+};
+
+template<>
+struct ItemCast< sal_Bool >
+{
+    template< typename S >
+    static bool cast( S s, sal_Bool &d ) { d = s != 0; return true; }
+};
+
+template<>
+struct ItemCast< float >
+{
+    template< typename S >
+    static bool cast( S s, float &d ) { d = static_cast< float >( s ); return true; }
+};
+
+template<>
+struct ItemCast< double >
+{
+    template< typename S >
+    static bool cast( S s, double &d ) { d = static_cast< double >( s ); return true; }
+};
+
+template< typename S, typename D >
+static bool copyBufferItems( const char *pSrc, Py_ssize_t nStride, sal_Int32 nItems, D *pDest )
+{
+    for( sal_Int32 i = 0 ; i < nItems ; i ++, pSrc += nStride )
+    {
+        if( ! ItemCast< D >::cast( *reinterpret_cast< const S * >( pSrc ), pDest[i] ) )
+            return false;
+    }
+    return true;
+}
+
+/** bytes and unsigned char buffers are taken bit by bit for sequence< byte >,
+    the UNO byte is signed
+ */
+template<>
+bool copyBufferItems< unsigned char, sal_Int8 >(
+    const char *pSrc, Py_ssize_t nStride, sal_Int32 nItems, sal_Int8 *pDest )
+{
+    if( 1 == nStride )
+    {
+        memcpy( pDest, pSrc, nItems );
+        return true;
+    }
+    for( sal_Int32 i = 0 ; i < nItems ; i ++, pSrc += nStride )
+        pDest[i] = *reinterpret_cast< const sal_Int8 * >( pSrc );
+    return true;
+}
+
+/** copies the items of a buffer with the given struct module format code
+    @return false, when the format is not supported or an item does not fit
+            into D
+ */
+template< typename D >
+static bool copyBuffer( char code, const char *pSrc, Py_ssize_t nStride, sal_Int32 nItems, D *pDest )
+{
+    switch( code )
+    {
+    case 'b':
+        return copyBufferItems< signed char, D >( pSrc, nStride, nItems, pDest );
+    case 'B':
+    case 'c':
+        return copyBufferItems< unsigned char, D >( pSrc, nStride, nItems, pDest );
+    case '?':
+        return copyBufferItems< bool, D >( pSrc, nStride, nItems, pDest );
+    case 'h':
+        return copyBufferItems< short, D >( pSrc, nStride, nItems, pDest );
+    case 'H':
+        return copyBufferItems< unsigned short, D >( pSrc, nStride, nItems, pDest );
+    case 'i':
+        return copyBufferItems< int, D >( pSrc, nStride, nItems, pDest );
+    case 'I':
+        return copyBufferItems< unsigned int, D >( pSrc, nStride, nItems, pDest );
+    case 'l':
+        return copyBufferItems< long, D >( pSrc, nStride, nItems, pDest );
+    case 'L':
+        return copyBufferItems< unsigned long, D >( pSrc, nStride, nItems, pDest );
+    case 'q':
+        return copyBufferItems< sal_Int64, D >( pSrc, nStride, nItems, pDest );
+    case 'Q':
+        return copyBufferItems< sal_uInt64, D >( pSrc, nStride, nItems, pDest );
+    case 'n':
+        return copyBufferItems< Py_ssize_t, D >( pSrc, nStride, nItems, pDest );
+    case 'N':
+        return copyBufferItems< size_t, D >( pSrc, nStride, nItems, pDest );
+    case 'f':
+        return copyBufferItems< float, D >( pSrc, nStride, nItems, pDest );
+    case 'd':
+        return copyBufferItems< double, D >( pSrc, nStride, nItems, pDest );
+    default:
+        return false;
+    }
+}
+
+/** extracts the struct module code of a buffer holding native single values
+ */
+static bool getFormatCode( const char *format, char *pCode )
+{
+    if( ! format )
+    {
+        *pCode = 'B';
+        return true;
+    }
+    if( '@' == *format )
+        format ++;
+    if( ! format[0] || format[1] )
+        return false;
+    *pCode = format[0];
+    return true;
+}
+
+/** the element type used for a buffer, when the target type is unknown
+ */
+static typelib_TypeClass getDefaultElementTypeClass( char code, Py_ssize_t itemsize )
+{
+    switch( code )
+    {
+    case 'b':
+    case 'B':
+    case 'c':
+        return typelib_TypeClass_BYTE;
+    case '?':
+        return typelib_TypeClass_BOOLEAN;
+    case 'h':
+        return typelib_TypeClass_SHORT;
+    case 'H':
+        return typelib_TypeClass_UNSIGNED_SHORT;
+    case 'i':
+    case 'l':
+    case 'q':
+    case 'n':
+        if( 4 == itemsize )
+            return typelib_TypeClass_LONG;
+        if( 8 == itemsize )
+            return typelib_TypeClass_HYPER;
+        break;
+    case 'I':
+    case 'L':
+    case 'Q':
+    case 'N':
+        if( 4 == itemsize )
+            return typelib_TypeClass_UNSIGNED_LONG;
+        if( 8 == itemsize )
+            return typelib_TypeClass_UNSIGNED_HYPER;
+        break;
+    case 'f':
+        return typelib_TypeClass_FLOAT;
+    case 'd':
+        return typelib_TypeClass_DOUBLE;
+    }
+    return typelib_TypeClass_VOID;
+}
+
+template< typename D >
+static bool packBuffer( const Py_buffer &view, char code,
+                        typelib_TypeDescriptionReference *pSeqTypeRef, Any &a )
+{
+    if( view.ndim < 2 )
+    {
+        Py_ssize_t nItems = view.ndim ? view.shape[0] : view.len / view.itemsize;
+        if( nItems > SAL_MAX_INT32 )
+            return false;
+        Sequence< D > seq( (sal_Int32) nItems );
+        Py_ssize_t nStride = view.strides ? view.strides[0] : view.itemsize;
+        if( ! copyBuffer( code, (const char *) view.buf, nStride, (sal_Int32) nItems, seq.getArray() ) )
+            return false;
+        if( pSeqTypeRef )
+            a = Any( &seq, pSeqTypeRef );
+        else
+            a <<= seq;
+        return true;
+    }
+
+    // two dimensional buffers are packed row by row
+    if( view.shape[0] > SAL_MAX_INT32 || view.shape[1] > SAL_MAX_INT32 )
+        return false;
+    const sal_Int32 nRows = (sal_Int32) view.shape[0];
+    const sal_Int32 nCols = (sal_Int32) view.shape[1];
+    Py_ssize_t nRowStride = view.strides ? view.strides[0] : nCols * view.itemsize;
+    Py_ssize_t nStride = view.strides ? view.strides[1] : view.itemsize;
+    Sequence< Sequence< D > > rows( nRows );
+    Sequence< D > *pRows = rows.getArray();
+    for( sal_Int32 i = 0 ; i < nRows ; i ++ )
+    {
+        pRows[i].realloc( nCols );
+        if( ! copyBuffer( code, (const char *) view.buf + i * nRowStride, nStride, nCols, pRows[i].getArray() ) )
+            return false;
+    }
+    if( pSeqTypeRef )
+        a = Any( &rows, pSeqTypeRef );
+    else
+        a <<= rows;
+    return true;
+}
+
+static bool buffer2Sequence(
+    PyObject *o, typelib_TypeDescriptionReference *pElementTypeRef,
+    typelib_TypeDescriptionReference *pSeqTypeRef, Any &a )
+{
+    Py_buffer view;
+    if( PyObject_GetBuffer( o, &view, PyBUF_RECORDS_RO ) < 0 )
+    {
+        PyErr_Clear();
+        return false;
+    }
+    BufferGuard guard( &view );
+
+    char code = 0;
+    if( view.ndim > 2 || view.suboffsets || ! getFormatCode( view.format, &code ) )
+        return false;
+
+    if( 2 == view.ndim && pElementTypeRef )
+    {
+        // the rows are sequences themselves
+        if( typelib_TypeClass_SEQUENCE != pElementTypeRef->eTypeClass )
+            return false;
+        TypeDescription rowDesc( pElementTypeRef );
+        if( ! rowDesc.is() )
+            return false;
+        pElementTypeRef = ((typelib_IndirectTypeDescription *) rowDesc.get())->pType;
+    }
+
+    typelib_TypeClass eTypeClass = pElementTypeRef ?
+        pElementTypeRef->eTypeClass : getDefaultElementTypeClass( code, view.itemsize );
+    switch( eTypeClass )
+    {
+    case typelib_TypeClass_BOOLEAN:
+        return packBuffer< sal_Bool >( view, code, pSeqTypeRef, a );
+    case typelib_TypeClass_BYTE:
+        return packBuffer< sal_Int8 >( view, code, pSeqTypeRef, a );
+    case typelib_TypeClass_SHORT:
+        return packBuffer< sal_Int16 >( view, code, pSeqTypeRef, a );
+    case typelib_TypeClass_UNSIGNED_SHORT:
+        return packBuffer< sal_uInt16 >( view, code, pSeqTypeRef, a );
+    case typelib_TypeClass_LONG:
+        return packBuffer< sal_Int32 >( view, code, pSeqTypeRef, a );
+    case typelib_TypeClass_UNSIGNED_LONG:
+        return packBuffer< sal_uInt32 >( view, code, pSeqTypeRef, a );
+    case typelib_TypeClass_HYPER:
+        return packBuffer< sal_Int64 >( view, code, pSeqTypeRef, a );
+    case typelib_TypeClass_UNSIGNED_HYPER:
+        return packBuffer< sal_uInt64 >( view, code, pSeqTypeRef, a );
+    case typelib_TypeClass_FLOAT:
+        return packBuffer< float >( view, code, pSeqTypeRef, a );
+    case typelib_TypeClass_DOUBLE:
+        return packBuffer< double >( view, code, pSeqTypeRef, a );
+    default:
+        return false;
+    }
+}
+
+/** converts a python long into the integer type D
+    @return false, when D can't hold the value
+ */
+template< typename D >
+static bool pyLong2Integer( PyObject *item, D &d )
+{
+    sal_Int64 n = PyLong_AsLongLong( item );
+    if( -1 == n && PyErr_Occurred() )
+    {
+        PyErr_Clear();
+        return false;
+    }
+    return ItemCast< D >::cast( n, d );
+}
+
+template<>
+bool pyLong2Integer< sal_uInt64 >( PyObject *item, sal_uInt64 &d )
+{
+    // negative values raise an OverflowError here
+    unsigned PY_LONG_LONG n = PyLong_AsUnsignedLongLong( item );
+    if( (unsigned PY_LONG_LONG) -1 == n && PyErr_Occurred() )
+    {
+        PyErr_Clear();
+        return false;
+    }
+    d = n;
+    return true;
+}
+
+template< typename D >
+static bool packIntegers( PyObject **ppItems, sal_Int32 nItems,
+                          typelib_TypeDescriptionReference *pSeqTypeRef, Any &a )
+{
+    Sequence< D > seq( nItems );
+    D *pDest = seq.getArray();
+    for( sal_Int32 i = 0 ; i < nItems ; i ++ )
+    {
+        PyObject *item = ppItems[i];
+#if PY_MAJOR_VERSION < 3
+        if( PyInt_Check( item ) )
+        {
+            if( ! ItemCast< D >::cast( PyInt_AS_LONG( item ), pDest[i] ) )
+                return false;
+            continue;
+        }
+#endif
+        if( ! PyLong_Check( item ) || ! pyLong2Integer( item, pDest[i] ) )
+            return false;
+    }
+    a = Any( &seq, pSeqTypeRef );
+    return true;
+}
+
+template< typename D >
+static bool packFloats( PyObject **ppItems, sal_Int32 nItems,
+                        typelib_TypeDescriptionReference *pSeqTypeRef, Any &a )
+{
+    Sequence< D > seq( nItems );
+    D *pDest = seq.getArray();
+    for( sal_Int32 i = 0 ; i < nItems ; i ++ )
+    {
+        PyObject *item = ppItems[i];
+        if( PyFloat_Check( item ) )
+            pDest[i] = static_cast< D >( PyFloat_AS_DOUBLE( item ) );
+#if PY_MAJOR_VERSION < 3
+        else if( PyInt_Check( item ) )
+            pDest[i] = static_cast< D >( PyInt_AS_LONG( item ) );
+#endif
+        else if( PyLong_Check( item ) )
+        {
+            double d = PyLong_AsDouble( item );
+            if( -1.0 == d && PyErr_Occurred() )
+            {
+                PyErr_Clear();
+                return false;
+            }
+            pDest[i] = static_cast< D >( d );
+        }
+        else
+            return false;
+    }
+    a = Any( &seq, pSeqTypeRef );
+    return true;
+}
+
+static bool packStrings( PyObject **ppItems, sal_Int32 nItems,
+                         typelib_TypeDescriptionReference *pSeqTypeRef, Any &a )
+{
+    Sequence< OUString > seq( nItems );
+    OUString *pDest = seq.getArray();
+    for( sal_Int32 i = 0 ; i < nItems ; i ++ )
+    {
+#if PY_MAJOR_VERSION < 3
+        if( ! PyUnicode_Check( ppItems[i] ) && ! PyBytes_Check( ppItems[i] ) )
+#else
+        if( ! PyUnicode_Check( ppItems[i] ) )
+#endif
+            return false;
+        pDest[i] = pyString2ustring( ppItems[i] );
+    }
+    a = Any( &seq, pSeqTypeRef );
+    return true;
+}
+
+/** packs each row into a sequence of the row type and builds the outer
+    sequence from the row sequences
+ */
+static bool packRows( PyObject **ppRows, sal_Int32 nRows,
+                      typelib_TypeDescriptionReference *pRowTypeRef,
+                      typelib_TypeDescriptionReference *pSeqTypeRef, Any &a )
+{
+    std::vector< Any > rows( nRows );
+    std::vector< void * > rowSequences( nRows );
+    for( sal_Int32 i = 0 ; i < nRows ; i ++ )
+    {
+        if( ! pyObject2TypedSequence( ppRows[i], pRowTypeRef, rows[i] ) )
+            return false;
+        rowSequences[i] = *(void **) rows[i].getValue();
+    }
+    uno_Sequence *pSeq = 0;
+    uno_type_sequence_construct(
+        &pSeq, pSeqTypeRef, nRows ? &rowSequences[0] : 0, nRows,
+        (uno_AcquireFunc) com::sun::star::uno::cpp_acquire );
+    a = Any( &pSeq, pSeqTypeRef );
+    uno_type_destructData( &pSeq, pSeqTypeRef, (uno_ReleaseFunc) com::sun::star::uno::cpp_release );
+    return true;
+}
+
+static bool list2Sequence(
+    PyObject *o, typelib_TypeDescriptionReference *pElementTypeRef,
+    typelib_TypeDescriptionReference *pSeqTypeRef, Any &a )
+{
+    PyRef items( PySequence_Tuple( o ), SAL_NO_ACQUIRE );
+    if( ! items.is() )
+    {
+        PyErr_Clear();
+        return false;
+    }
+    sal_Int32 nItems = (sal_Int32) PyTuple_GET_SIZE( items.get() );
+    PyObject **ppItems = ((PyTupleObject *) items.get())->ob_item;
+    switch( pElementTypeRef->eTypeClass )
+    {
+    case typelib_TypeClass_BOOLEAN:
+        return packIntegers< sal_Bool >( ppItems, nItems, pSeqTypeRef, a );
+    case typelib_TypeClass_BYTE:
+        return packIntegers< sal_Int8 >( ppItems, nItems, pSeqTypeRef, a );
+    case typelib_TypeClass_SHORT:
+        return packIntegers< sal_Int16 >( ppItems, nItems, pSeqTypeRef, a );
+    case typelib_TypeClass_UNSIGNED_SHORT:
+        return packIntegers< sal_uInt16 >( ppItems, nItems, pSeqTypeRef, a );
+    case typelib_TypeClass_LONG:
+        return packIntegers< sal_Int32 >( ppItems, nItems, pSeqTypeRef, a );
+    case typelib_TypeClass_UNSIGNED_LONG:
+        return packIntegers< sal_uInt32 >( ppItems, nItems, pSeqTypeRef, a );
+    case typelib_TypeClass_HYPER:
+        return packIntegers< sal_Int64 >( ppItems, nItems, pSeqTypeRef, a );
+    case typelib_TypeClass_UNSIGNED_HYPER:
+        return packIntegers< sal_uInt64 >( ppItems, nItems, pSeqTypeRef, a );
+    case typelib_TypeClass_FLOAT:
+        return packFloats< float >( ppItems, nItems, pSeqTypeRef, a );
+    case typelib_TypeClass_DOUBLE:
+        return packFloats< double >( ppItems, nItems, pSeqTypeRef, a );
+    case typelib_TypeClass_STRING:
+        return packStrings( ppItems, nItems, pSeqTypeRef, a );
+    case typelib_TypeClass_SEQUENCE:
+        return packRows( ppItems, nItems, pElementTypeRef, pSeqTypeRef, a );
+    default:
+        return false;
+    }
+}
+
+bool pyObject2TypedSequence(
+    PyObject *o, typelib_TypeDescriptionReference *pSeqTypeRef, Any &a )
+{
+    typelib_TypeDescriptionReference *pElementTypeRef = 0;
+    if( pSeqTypeRef )
+    {
+        if( typelib_TypeClass_SEQUENCE != pSeqTypeRef->eTypeClass )
+            return false;
+        TypeDescription desc( pSeqTypeRef );
+        if( ! desc.is() )
+            return false;
+        pElementTypeRef = ((typelib_IndirectTypeDescription *) desc.get())->pType;
+    }
+
+    if( Py_TYPE( o ) == &PyUNO_SequenceBuffer_Type &&
+        1 == ((PyUNO_SequenceBuffer *) o)->members->ndim )
+    {
+        const Any &sequence = ((PyUNO_SequenceBuffer *) o)->members->sequence;
+        if( ! pSeqTypeRef ||
+            typelib_typedescriptionreference_equals( sequence.getValueTypeRef(), pSeqTypeRef ) )
+        {
+            a = sequence;
+            return true;
+        }
+    }
+    if( PyObject_TypeCheck( o, &PyUNO_ByteSequence_Type ) &&
+        ( ! pElementTypeRef || typelib_TypeClass_BYTE == pElementTypeRef->eTypeClass ) )
+    {
+        Sequence< sal_Int8 > value( PyByteSequence2ByteSequence( o ) );
+        if( pSeqTypeRef )
+            a = Any( &value, pSeqTypeRef );
+        else
+            a <<= value;
+        return true;
+    }
+    if( PyObject_CheckBuffer( o ) )
+        return buffer2Sequence( o, pElementTypeRef, pSeqTypeRef, a );
+    if( pElementTypeRef && ( PyList_Check( o ) || PyTuple_Check( o ) ) )
+        return list2Sequence( o, pElementTypeRef, pSeqTypeRef, a );
+    return false;
+}
+
+static bool getNumericValue( typelib_TypeClass eTypeClass, const void *p, double *pValue )
+{
+    switch( eTypeClass )
+    {
+    case typelib_TypeClass_BYTE:
+        *pValue = *(const sal_Int8 *) p;
+        return true;
+    case typelib_TypeClass_SHORT:
+        *pValue = *(const sal_Int16 *) p;
+        return true;
+    case typelib_TypeClass_UNSIGNED_SHORT:
+        *pValue = *(const sal_uInt16 *) p;
+        return true;
+    case typelib_TypeClass_LONG:
+        *pValue = *(const sal_Int32 *) p;
+        return true;
+    case typelib_TypeClass_UNSIGNED_LONG:
+        *pValue = *(const sal_uInt32 *) p;
+        return true;
+    case typelib_TypeClass_HYPER:
+        *pValue = (double) *(const sal_Int64 *) p;
+        return true;
+    case typelib_TypeClass_UNSIGNED_HYPER:
+        *pValue = (double) *(const sal_uInt64 *) p;
+        return true;
+    case typelib_TypeClass_FLOAT:
+        *pValue = *(const float *) p;
+        return true;
+    case typelib_TypeClass_DOUBLE:
+        *pValue = *(const double *) p;
+        return true;
+    default:
+        return false;
+    }
+}
+
+PyRef sequence2PyMatrix( const Any &a, const Runtime &r )
+    throw ( com::sun::star::script::CannotConvertException,
+            com::sun::star::lang::IllegalArgumentException,
+            RuntimeException )
+{
+    if( typelib_TypeClass_SEQUENCE != a.getValueTypeClass() )
+        return r.any2PyObject( a );
+    TypeDescription desc( a.getValueTypeRef() );
+    if( ! desc.is() )
+        return r.any2PyObject( a );
+    typelib_TypeDescriptionReference *pRowTypeRef =
+        ((typelib_IndirectTypeDescription *) desc.get())->pType;
+    TypeDescription rowDesc( pRowTypeRef );
+    const uno_Sequence *pSeq = *(const uno_Sequence **) a.getValue();
+    if( typelib_TypeClass_SEQUENCE != pRowTypeRef->eTypeClass || ! rowDesc.is() || ! pSeq->nElements )
+        return r.any2PyObject( a );
+    typelib_TypeDescriptionReference *pCellTypeRef =
+        ((typelib_IndirectTypeDescription *) rowDesc.get())->pType;
+
+    const uno_Sequence * const *ppRows = (const uno_Sequence * const *) pSeq->elements;
+    const sal_Int32 nRows = pSeq->nElements;
+    const sal_Int32 nCols = ppRows[0]->nElements;
+    for( sal_Int32 i = 1 ; i < nRows ; i ++ )
+    {
+        if( ppRows[i]->nElements != nCols )
+            return r.any2PyObject( a );
+    }
+    if( (sal_Int64) nRows * nCols > SAL_MAX_INT32 )
+        return r.any2PyObject( a );
+
+    TypeDescription cellDesc( pCellTypeRef );
+    if( ! cellDesc.is() )
+        return r.any2PyObject( a );
+    const sal_Int32 nCellSize = cellDesc.get()->nSize;
+
+    Sequence< double > values( nRows * nCols );
+    double *pValues = values.getArray();
+    for( sal_Int32 i = 0 ; i < nRows ; i ++ )
+    {
+        const char *pCells = ppRows[i]->elements;
+        for( sal_Int32 j = 0 ; j < nCols ; j ++ )
+        {
+            bool bNumeric;
+            if( typelib_TypeClass_ANY == pCellTypeRef->eTypeClass )
+            {
+                const uno_Any *pCell = ((const uno_Any *) pCells) + j;
+                bNumeric = getNumericValue( pCell->pType->eTypeClass, pCell->pData, pValues );
+            }
+            else
+            {
+                bNumeric = getNumericValue(
+                    pCellTypeRef->eTypeClass, pCells + j * nCellSize, pValues );
+            }
+            // at least one cell is not a number, return nested tuples
+            if( ! bNumeric )
+                return r.any2PyObject( a );
+            pValues ++;
+        }
+    }
+
+    PyRef ret = PyUNO_SequenceBuffer_new( makeAny( values ), "d", sizeof( double ) );
+    if( ret.is() )
+    {
+        PyUNO_SequenceBuffer_Internals *members = ((PyUNO_SequenceBuffer *) ret.get())->members;
+        members->ndim = 2;
+        members->shape[0] = nRows;
+        members->shape[1] = nCols;
+        members->strides[0] = nCols * sizeof( double );
+        members->strides[1] = sizeof( double );
+    }
+    return ret;
+}
+
+PyRef sequence2PyBuffer( const Any &a, const Runtime &r )
+    throw ( com::sun::star::script::CannotConvertException,
+            com::sun::star::lang::IllegalArgumentException,
+            RuntimeException )
+{
+    if( typelib_TypeClass_SEQUENCE == a.getValueTypeClass() )
+    {
+        TypeDescription desc( a.getValueTypeRef() );
+        if( desc.is() )
+        {
+            typelib_TypeDescriptionReference *pElementTypeRef =
+                ((typelib_IndirectTypeDescription *) desc.get())->pType;
+            Py_ssize_t itemsize = 0;
+            const char *format = getBufferFormat( pElementTypeRef->eTypeClass, &itemsize );
+            if( format )
+                return PyUNO_SequenceBuffer_new( a, format, itemsize );
+
+            if( typelib_TypeClass_SEQUENCE == pElementTypeRef->eTypeClass )
+            {
+                // nested sequences become a tuple of buffers
+                uno_Sequence *pSeq = *(uno_Sequence **) a.getValue();
+                const uno_Sequence * const *ppRows = (const uno_Sequence * const *) pSeq->elements;
+                PyRef tuple( PyTuple_New( pSeq->nElements ), SAL_NO_ACQUIRE );
+                sal_Int32 i = 0;
+                try
+                {
+                    for( i = 0 ; i < pSeq->nElements ; i ++ )
+                    {
+                        PyRef element = sequence2PyBuffer(
+                            Any( &ppRows[i], pElementTypeRef ), r );
+                        PyTuple_SET_ITEM( tuple.get(), i, element.getAcquired() );
+                    }
+                }
+                catch( com::sun::star::uno::Exception & )
+                {
+                    for( ; i < pSeq->nElements ; i ++ )
+                    {
+                        Py_INCREF( Py_None );
+                        PyTuple_SET_ITEM( tuple.get(), i, Py_None );
+                    }
+                    throw;
+                }
+                return tuple;
+            }
+        }
+    }
+    return r.any2PyObject( a );
+}
+
+}
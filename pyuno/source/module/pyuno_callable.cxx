@@ -25,20 +25,30 @@
 #include <osl/thread.h>
 #include <rtl/ustrbuf.hxx>
 #include <rtl/strbuf.hxx>
+#include <uno/data.h>
+
+#include <com/sun/star/reflection/InvocationTargetException.hpp>
+
+#include <vector>
 
 using rtl::OUStringToOString;
 using rtl::OUString;
+using rtl::OUStringBuffer;
 using com::sun::star::uno::Sequence;
 using com::sun::star::uno::Reference;
 using com::sun::star::uno::XInterface;
 using com::sun::star::uno::Any;
 using com::sun::star::uno::Type;
+using com::sun::star::uno::TypeDescription;
 using com::sun::star::uno::TypeClass;
 using com::sun::star::uno::RuntimeException;
 using com::sun::star::uno::XComponentContext;
 using com::sun::star::lang::XMultiComponentFactory;
 using com::sun::star::script::XTypeConverter;
 using com::sun::star::script::XInvocation2;
+using com::sun::star::script::CannotConvertException;
+using com::sun::star::lang::IllegalArgumentException;
+using com::sun::star::reflection::InvocationTargetException;
 using com::sun::star::reflection::XParameter;
 using com::sun::star::reflection::XServiceConstructorDescription;
 
@@ -49,12 +59,19 @@ typedef struct
     Reference<XInvocation2> xInvocation;
     OUString methodName;
     ConversionMode mode;
+    ResultMode resultMode;
+    // the interface and its method to call directly instead of the invocation
+    uno_Interface *pUnoI;
+    TypeDescription method;
 } PyUNO_callable_Internals;
 
 typedef struct
 {
     PyObject_HEAD
     PyUNO_callable_Internals* members;
+#if PY_VERSION_HEX >= 0x03090000
+    vectorcallfunc vectorcall;
+#endif
 } PyUNO_callable;
 
 void PyUNO_callable_del (PyObject* self)
@@ -62,98 +79,305 @@ void PyUNO_callable_del (PyObject* self)
     PyUNO_callable* me;
   
     me = (PyUNO_callable*) self;
+    if( me->members->pUnoI )
+    {
+        PyThreadDetach antiguard;
+        (*me->members->pUnoI->release)( me->members->pUnoI );
+    }
     delete me->members;
     PyObject_Del (self);
   
     return;
 }
 
-PyObject* PyUNO_callable_call (PyObject* self, PyObject* args, PyObject*)
+/** converts the arguments to the declared parameter types of the method the
+    way the invocation does it. An argument of type any is the value itself.
+ */
+static void convertDirectArguments(
+    PyUNO_callable_Internals *members, const Runtime &runtime,
+    PyObject *const *args, Py_ssize_t nArgs, Sequence< Any > &rArgs )
+    throw ( CannotConvertException, IllegalArgumentException, RuntimeException )
 {
-    PyUNO_callable* me;
+    RuntimeCargo *cargo = runtime.getImpl()->cargo;
+    typelib_InterfaceMethodTypeDescription *pMethod =
+        (typelib_InterfaceMethodTypeDescription *) members->method.get();
+    sal_Int32 nParams = pMethod->nParams;
+    if( nArgs != nParams )
+    {
+        OUStringBuffer buf;
+        buf.appendAscii( "incorrect number of parameters passed invoking function " );
+        buf.append( members->methodName );
+        throw IllegalArgumentException(
+            buf.makeStringAndClear(), Reference< XInterface > (), (sal_Int16) 1 );
+    }
 
-    Sequence<short> aOutParamIndex;
-    Sequence<Any> aOutParam;
-    Sequence<Any> aParams;
-    Sequence<Type> aParamTypes;
-    Any any_params;
-    Any out_params;
-    Any ret_value;
-    RuntimeCargo *cargo = 0;
-    me = (PyUNO_callable*) self;
-  
-    PyRef ret;
-    try
+    rArgs.realloc( nParams );
+    Any *pArgs = rArgs.getArray();
+    for( sal_Int32 i = 0; i < nParams; ++i )
     {
-        Runtime runtime;
-        cargo = runtime.getImpl()->cargo;
-        any_params = runtime.pyObject2Any (args, me->members->mode);
-    
-        if (any_params.getValueTypeClass () == com::sun::star::uno::TypeClass_SEQUENCE)
+        const typelib_MethodParameter &rParam = pMethod->pParams[i];
+        if( ! rParam.bIn )
+            continue;
+        if( ! pyMatrix2Sequence( args[i], rParam.pTypeRef, pArgs[i], runtime, members->mode ) &&
+            ! pyObject2TypedSequence( args[i], rParam.pTypeRef, pArgs[i] ) )
+            pArgs[i] = runtime.pyObject2Any( args[i], members->mode );
+        if( rParam.pTypeRef->eTypeClass != typelib_TypeClass_ANY &&
+            ! typelib_typedescriptionreference_equals( pArgs[i].getValueTypeRef(), rParam.pTypeRef ) )
         {
-            any_params >>= aParams;
+            if( ! cargo->xTypeConverter.is() )
+                throw RuntimeException(
+                    OUString( RTL_CONSTASCII_USTRINGPARAM( "pyuno bridge has been finalized" ) ),
+                    Reference< XInterface > () );
+            try
+            {
+                pArgs[i] = cargo->xTypeConverter->convertTo( pArgs[i], Type( rParam.pTypeRef ) );
+            }
+            catch( CannotConvertException & e )
+            {
+                e.ArgumentIndex = i;
+                throw;
+            }
         }
-        else
+    }
+}
+
+/** calls the method through the dispatcher of the interface with the converted
+    arguments. Exceptions of the method are thrown as InvocationTargetException.
+    The global interpreter lock must have been released.
+ */
+static Any callDirect(
+    PyUNO_callable_Internals *members, RuntimeCargo *cargo,
+    const Sequence< Any > &aArgs, Sequence< Any > &rOutParams )
+    throw ( InvocationTargetException, RuntimeException )
+{
+    typelib_InterfaceMethodTypeDescription *pMethod =
+        (typelib_InterfaceMethodTypeDescription *) members->method.get();
+    sal_Int32 nParams = pMethod->nParams;
+    const Any *pArgs = aArgs.getConstArray();
+
+    if( isLog( cargo, LogLevel::CALL ) )
+    {
+        logCall( cargo, "try     py->uno[0x", members->pUnoI, members->methodName, aArgs );
+    }
+
+    // the values in the binary uno environment, pure out parameters and
+    // the return value are constructed by the call
+    std::vector< void * > aUnoArgs( nParams + 1 );
+    for( sal_Int32 i = 0; i < nParams; ++i )
+    {
+        const typelib_MethodParameter &rParam = pMethod->pParams[i];
+        typelib_TypeDescription *pTD = 0;
+        TYPELIB_DANGER_GET( &pTD, rParam.pTypeRef );
+        aUnoArgs[i] = rtl_allocateMemory( pTD->nSize );
+        if( rParam.bIn )
         {
-            aParams.realloc (1);
-            aParams [0] <<= any_params;
+            void *pSource = rParam.pTypeRef->eTypeClass == typelib_TypeClass_ANY ?
+                (void *) const_cast< Any * >( &pArgs[i] ) : const_cast< void * >( pArgs[i].getValue() );
+            uno_copyAndConvertData( aUnoArgs[i], pSource, pTD, cargo->cpp2uno.get() );
         }
+        TYPELIB_DANGER_RELEASE( pTD );
+    }
+    typelib_TypeDescription *pReturnTD = 0;
+    TYPELIB_DANGER_GET( &pReturnTD, pMethod->pReturnTypeRef );
+    void *pUnoReturn = rtl_allocateMemory( pReturnTD->nSize ? pReturnTD->nSize : 1 );
 
+    uno_Any aUnoExc;
+    uno_Any *pUnoExc = &aUnoExc;
+    (*members->pUnoI->pDispatcher)(
+        members->pUnoI, members->method.get(), pUnoReturn,
+        nParams ? &aUnoArgs[0] : 0, &pUnoExc );
+
+    Any ret;
+    if( pUnoExc )
+    {
+        // only the in parameters have been constructed
+        for( sal_Int32 i = 0; i < nParams; ++i )
         {
-            PyThreadDetach antiguard; //pyhton free zone
-            
-            // do some logging if desired ... 
-            if( isLog( cargo, LogLevel::CALL ) )
-            {
-                logCall( cargo, "try     py->uno[0x", me->members->xInvocation.get(),
-                         me->members->methodName, aParams );
-            }
+            const typelib_MethodParameter &rParam = pMethod->pParams[i];
+            if( rParam.bIn )
+                uno_type_destructData( aUnoArgs[i], rParam.pTypeRef, 0 );
+            rtl_freeMemory( aUnoArgs[i] );
+        }
+        rtl_freeMemory( pUnoReturn );
+        TYPELIB_DANGER_RELEASE( pReturnTD );
+
+        Any exc;
+        uno_any_destruct( &exc, (uno_ReleaseFunc) com::sun::star::uno::cpp_release );
+        uno_type_any_constructAndConvert(
+            &exc, pUnoExc->pData, pUnoExc->pType, cargo->uno2cpp.get() );
+        uno_any_destruct( pUnoExc, 0 );
+        InvocationTargetException e;
+        e.TargetException = exc;
+        throw e;
+    }
 
-            // do the call
-            ret_value = me->members->xInvocation->invoke (
-                me->members->methodName, aParams, aOutParamIndex, aOutParam);
+    uno_any_destruct( &ret, (uno_ReleaseFunc) com::sun::star::uno::cpp_release );
+    uno_type_any_constructAndConvert(
+        &ret, pUnoReturn, pMethod->pReturnTypeRef, cargo->uno2cpp.get() );
+    uno_destructData( pUnoReturn, pReturnTD, 0 );
+    rtl_freeMemory( pUnoReturn );
+    TYPELIB_DANGER_RELEASE( pReturnTD );
 
-            // log the reply, if desired
-            if( isLog( cargo, LogLevel::CALL ) )
-            {
-                logReply( cargo, "success py->uno[0x", me->members->xInvocation.get(),
-                          me->members->methodName, ret_value, aOutParam);
-            }
+    sal_Int32 nOut = 0;
+    for( sal_Int32 i = 0; i < nParams; ++i )
+    {
+        if( pMethod->pParams[i].bOut )
+            ++nOut;
+    }
+    rOutParams.realloc( nOut );
+    Any *pOutParams = rOutParams.getArray();
+    nOut = 0;
+    for( sal_Int32 i = 0; i < nParams; ++i )
+    {
+        const typelib_MethodParameter &rParam = pMethod->pParams[i];
+        if( rParam.bOut )
+        {
+            Any &out = pOutParams[nOut++];
+            uno_any_destruct( &out, (uno_ReleaseFunc) com::sun::star::uno::cpp_release );
+            uno_type_any_constructAndConvert(
+                &out, aUnoArgs[i], rParam.pTypeRef, cargo->uno2cpp.get() );
         }
-        
+        uno_type_destructData( aUnoArgs[i], rParam.pTypeRef, 0 );
+        rtl_freeMemory( aUnoArgs[i] );
+    }
 
-        PyRef temp = runtime.any2PyObject (ret_value);
-        if( aOutParam.getLength() )
-        {
-            PyRef return_list( PyTuple_New (1+aOutParam.getLength()), SAL_NO_ACQUIRE );
-            PyTuple_SetItem (return_list.get(), 0, temp.getAcquired());
+    if( isLog( cargo, LogLevel::CALL ) )
+    {
+        logReply( cargo, "success py->uno[0x", members->pUnoI,
+                  members->methodName, ret, rOutParams );
+    }
+    return ret;
+}
 
-            // initialize with defaults in case of exceptions
-            int i;
-            for( i = 1 ; i < 1+aOutParam.getLength() ; i ++ )
-            {
-                Py_INCREF( Py_None );
-                PyTuple_SetItem( return_list.get() , i , Py_None );
-            }
-            
-            for( i = 0 ; i < aOutParam.getLength() ; i ++ )
-            {
-                PyRef ref = runtime.any2PyObject( aOutParam[i] );
-                PyTuple_SetItem (return_list.get(), 1+i, ref.getAcquired());
-            }
-            ret = return_list;
-        }
-        else
+/** converts the arguments for the way the callable calls the method. With
+    vectorcall the arguments arrive as an array, so the invocation path
+    converts them one by one into the same sequence of anys, which converting
+    the argument tuple as a whole would give.
+ */
+static void convertArguments(
+    PyUNO_callable_Internals *members, const Runtime &runtime,
+    PyObject *const *args, Py_ssize_t nArgs, Sequence< Any > &rArgs )
+    throw ( CannotConvertException, IllegalArgumentException, RuntimeException )
+{
+    if( members->pUnoI )
+    {
+        convertDirectArguments( members, runtime, args, nArgs, rArgs );
+        return;
+    }
+    rArgs.realloc ((sal_Int32) nArgs);
+    Any *pArgs = rArgs.getArray();
+    for (Py_ssize_t i = 0; i < nArgs; i++)
+    {
+        pArgs[i] = runtime.pyObject2Any (args[i], members->mode);
+    }
+}
+
+/** calls the method with the converted arguments, the global interpreter lock
+    must have been released
+ */
+static Any callConverted(
+    PyUNO_callable_Internals *members, RuntimeCargo *cargo,
+    Sequence< Any > &rArgs, Sequence< Any > &rOutParams )
+    throw ( InvocationTargetException, CannotConvertException,
+            IllegalArgumentException, RuntimeException )
+{
+    if( members->pUnoI )
+        return callDirect( members, cargo, rArgs, rOutParams );
+
+    // do some logging if desired ... 
+    if( isLog( cargo, LogLevel::CALL ) )
+    {
+        logCall( cargo, "try     py->uno[0x", members->xInvocation.get(),
+                 members->methodName, rArgs );
+    }
+
+    // do the call
+    Sequence<short> aOutParamIndex;
+    Any ret = members->xInvocation->invoke (
+        members->methodName, rArgs, aOutParamIndex, rOutParams);
+
+    // log the reply, if desired
+    if( isLog( cargo, LogLevel::CALL ) )
+    {
+        logReply( cargo, "success py->uno[0x", members->xInvocation.get(),
+                  members->methodName, ret, rOutParams);
+    }
+    return ret;
+}
+
+static PyRef result2PyObject( const Runtime &runtime, const Any &a, ResultMode resultMode )
+    throw ( com::sun::star::script::CannotConvertException,
+            com::sun::star::lang::IllegalArgumentException,
+            RuntimeException )
+{
+    if( BUFFER_RESULT == resultMode )
+        return sequence2PyBuffer( a, runtime );
+    if( MATRIX_RESULT == resultMode )
+        return sequence2PyMatrix( a, runtime );
+    return runtime.any2PyObject( a );
+}
+
+/** returns the converted result, or a tuple of it and the out parameters
+ */
+static PyRef packResult(
+    const Runtime &runtime, const Any &ret_value, const Sequence< Any > &aOutParam,
+    ResultMode resultMode )
+    throw ( CannotConvertException, IllegalArgumentException, RuntimeException )
+{
+    PyRef temp = result2PyObject( runtime, ret_value, resultMode );
+    if( ! aOutParam.getLength() )
+        return temp;
+
+    PyRef return_list( PyTuple_New (1+aOutParam.getLength()), SAL_NO_ACQUIRE );
+    PyTuple_SetItem (return_list.get(), 0, temp.getAcquired());
+
+    // initialize with defaults in case of exceptions
+    int i;
+    for( i = 1 ; i < 1+aOutParam.getLength() ; i ++ )
+    {
+        Py_INCREF( Py_None );
+        PyTuple_SetItem( return_list.get() , i , Py_None );
+    }
+    
+    for( i = 0 ; i < aOutParam.getLength() ; i ++ )
+    {
+        PyRef ref = result2PyObject( runtime, aOutParam[i], resultMode );
+        PyTuple_SetItem (return_list.get(), 1+i, ref.getAcquired());
+    }
+    return return_list;
+}
+
+/** calls the method with the given arguments, which are not packed into a
+    tuple for vectorcall
+ */
+static PyObject* callMethod (PyUNO_callable* me, PyObject *const *args, Py_ssize_t nArgs)
+{
+    Sequence<Any> aOutParam;
+    Sequence<Any> aParams;
+    Any ret_value;
+    RuntimeCargo *cargo = 0;
+    // logged as target of the call
+    void *pTarget = me->members->pUnoI ?
+        (void *) me->members->pUnoI : (void *) me->members->xInvocation.get();
+  
+    PyRef ret;
+    try
+    {
+        Runtime runtime;
+        cargo = runtime.getImpl()->cargo;
+        convertArguments( me->members, runtime, args, nArgs, aParams );
         {
-            ret = temp;
+            PyThreadDetach antiguard; //pyhton free zone
+            ret_value = callConverted( me->members, cargo, aParams, aOutParam );
         }
+        ret = packResult( runtime, ret_value, aOutParam, me->members->resultMode );
     }
     catch( com::sun::star::reflection::InvocationTargetException & e )
     {
         
         if( isLog( cargo, LogLevel::CALL ) )
         {
-            logException( cargo, "except  py->uno[0x", me->members->xInvocation.get() ,
+            logException( cargo, "except  py->uno[0x", pTarget ,
                           me->members->methodName, e.TargetException.getValue(), e.TargetException.getValueTypeRef());
         }
         raisePyExceptionWithAny( e.TargetException );
@@ -162,7 +386,7 @@ PyObject* PyUNO_callable_call (PyObject* self, PyObject* args, PyObject*)
     {
         if( isLog( cargo, LogLevel::CALL ) )
         {
-            logException( cargo, "error  py->uno[0x", me->members->xInvocation.get() ,
+            logException( cargo, "error  py->uno[0x", pTarget ,
                           me->members->methodName, &e, getCppuType(&e).getTypeLibType());
         }
         raisePyExceptionWithAny( com::sun::star::uno::makeAny( e ) );
@@ -171,7 +395,7 @@ PyObject* PyUNO_callable_call (PyObject* self, PyObject* args, PyObject*)
     {
         if( isLog( cargo, LogLevel::CALL ) )
         {
-            logException( cargo, "error  py->uno[0x", me->members->xInvocation.get() ,
+            logException( cargo, "error  py->uno[0x", pTarget ,
                           me->members->methodName, &e, getCppuType(&e).getTypeLibType());
         }
         raisePyExceptionWithAny( com::sun::star::uno::makeAny( e ) );
@@ -180,7 +404,7 @@ PyObject* PyUNO_callable_call (PyObject* self, PyObject* args, PyObject*)
     {
         if( cargo && isLog( cargo, LogLevel::CALL ) )
         {
-            logException( cargo, "error  py->uno[0x", me->members->xInvocation.get() ,
+            logException( cargo, "error  py->uno[0x", pTarget ,
                           me->members->methodName, &e, getCppuType(&e).getTypeLibType());
         }
         raisePyExceptionWithAny( com::sun::star::uno::makeAny( e ) );
@@ -189,6 +413,20 @@ PyObject* PyUNO_callable_call (PyObject* self, PyObject* args, PyObject*)
     return ret.getAcquired();
 }
 
+PyObject* PyUNO_callable_call (PyObject* self, PyObject* args, PyObject*)
+{
+    return callMethod (
+        (PyUNO_callable*) self, ((PyTupleObject *) args)->ob_item, PyTuple_GET_SIZE (args));
+}
+
+#if PY_VERSION_HEX >= 0x03090000
+static PyObject* PyUNO_callable_vectorcall (
+    PyObject* self, PyObject *const *args, size_t nargsf, PyObject*)
+{
+    return callMethod ((PyUNO_callable*) self, args, PyVectorcall_NARGS (nargsf));
+}
+#endif
+
 
 static PyTypeObject PyUNO_callable_Type =
 {
@@ -197,7 +435,11 @@ static PyTypeObject PyUNO_callable_Type =
     sizeof (PyUNO_callable),
     0,
     (destructor) ::pyuno::PyUNO_callable_del,
+#if PY_VERSION_HEX >= 0x03090000
+    offsetof (PyUNO_callable, vectorcall), /* tp_vectorcall_offset */
+#else
     (printfunc) 0,
+#endif
     (getattrfunc) 0,
     (setattrfunc) 0,
 #if PY_MAJOR_VERSION >= 3
@@ -215,7 +457,11 @@ static PyTypeObject PyUNO_callable_Type =
         (getattrofunc)0,
     (setattrofunc)0,
     NULL,
+#if PY_VERSION_HEX >= 0x03090000
+    Py_TPFLAGS_HAVE_VECTORCALL,
+#else
     0,
+#endif
     NULL,
     (traverseproc)0,
     (inquiry)0,
@@ -250,7 +496,8 @@ static PyTypeObject PyUNO_callable_Type =
 PyRef PyUNO_callable_new (
     const Reference<XInvocation2> &my_inv,
     const OUString & methodName,
-    enum ConversionMode mode )
+    enum ConversionMode mode,
+    enum ResultMode resultMode )
 {
     PyUNO_callable* self;
   
@@ -258,14 +505,155 @@ PyRef PyUNO_callable_new (
     if (self == NULL)
         return NULL; //NULL == Error!
 
-    self->members = new PyUNO_callable_Internals;
+    self->members = new PyUNO_callable_Internals();
     self->members->xInvocation = my_inv;
     self->members->methodName = methodName;
     self->members->mode = mode;
+    self->members->resultMode = resultMode;
+#if PY_VERSION_HEX >= 0x03090000
+    self->vectorcall = PyUNO_callable_vectorcall;
+#endif
 
     return PyRef( (PyObject*)self, SAL_NO_ACQUIRE );
 }
 
+PyRef PyUNO_callable_newDirect (
+    uno_Interface *pUnoI,
+    const TypeDescription &method,
+    const OUString & methodName,
+    enum ConversionMode mode,
+    enum ResultMode resultMode )
+{
+    PyRef ret = PyUNO_callable_new( Reference< XInvocation2 >(), methodName, mode, resultMode );
+    if( ret.is() )
+    {
+        PyUNO_callable_Internals *members = ((PyUNO_callable *) ret.get())->members;
+        (*pUnoI->acquire)( pUnoI );
+        members->pUnoI = pUnoI;
+        members->method = method;
+    }
+    return ret;
+}
+
+namespace {
+
+struct BatchCall
+{
+    Sequence< Any > args;
+    Any result;
+    Sequence< Any > outParams;
+    Any exception;
+};
+
+}
+
+PyRef PyUNO_callable_invokeBatch( PyObject *calls, const Runtime &runtime )
+    throw ( CannotConvertException, IllegalArgumentException, RuntimeException )
+{
+    PyRef items( PySequence_Tuple( calls ), SAL_NO_ACQUIRE );
+    if( ! items.is() )
+        return PyRef();
+    Py_ssize_t nCalls = PyTuple_GET_SIZE( items.get() );
+
+    // all arguments are converted before the first call
+    std::vector< PyRef > callables( nCalls );
+    std::vector< BatchCall > batch( nCalls );
+    for( Py_ssize_t i = 0; i < nCalls; ++i )
+    {
+        PyObject *call = PyTuple_GET_ITEM( items.get(), i );
+        if( ! PyTuple_Check( call ) || PyTuple_GET_SIZE( call ) != 3 )
+        {
+            PyErr_SetString( PyExc_TypeError,
+                "uno.invokeBatch expects (object, method name, arguments) tuples" );
+            return PyRef();
+        }
+        PyRef callable(
+            PyObject_GetAttr( PyTuple_GET_ITEM( call, 0 ), PyTuple_GET_ITEM( call, 1 ) ),
+            SAL_NO_ACQUIRE );
+        if( ! callable.is() )
+            return PyRef();
+        if( Py_TYPE( callable.get() ) != &PyUNO_callable_Type )
+        {
+            PyErr_SetString( PyExc_TypeError,
+                "uno.invokeBatch expects the names of methods of UNO objects" );
+            return PyRef();
+        }
+        PyRef args( PySequence_Tuple( PyTuple_GET_ITEM( call, 2 ) ), SAL_NO_ACQUIRE );
+        if( ! args.is() )
+            return PyRef();
+        convertArguments(
+            ((PyUNO_callable *) callable.get())->members, runtime,
+            ((PyTupleObject *) args.get())->ob_item, PyTuple_GET_SIZE( args.get() ),
+            batch[i].args );
+        callables[i] = callable;
+    }
+
+    RuntimeCargo *cargo = runtime.getImpl()->cargo;
+    {
+        PyThreadDetach antiguard; //python free zone
+        for( Py_ssize_t i = 0; i < nCalls; ++i )
+        {
+            BatchCall &rCall = batch[i];
+            PyUNO_callable_Internals *members = ((PyUNO_callable *) callables[i].get())->members;
+            try
+            {
+                rCall.result = callConverted( members, cargo, rCall.args, rCall.outParams );
+            }
+            catch( InvocationTargetException & e )
+            {
+                rCall.exception = e.TargetException;
+            }
+            catch( CannotConvertException & e )
+            {
+                rCall.exception <<= e;
+            }
+            catch( IllegalArgumentException & e )
+            {
+                rCall.exception <<= e;
+            }
+            catch( RuntimeException & e )
+            {
+                rCall.exception <<= e;
+            }
+        }
+    }
+
+    PyRef ret( PyList_New( nCalls ), SAL_NO_ACQUIRE );
+    for( Py_ssize_t i = 0; i < nCalls; ++i )
+    {
+        PyRef result;
+        if( batch[i].exception.hasValue() )
+        {
+            result = runtime.any2PyObject( batch[i].exception );
+        }
+        else
+        {
+            result = packResult(
+                runtime, batch[i].result, batch[i].outParams,
+                ((PyUNO_callable *) callables[i].get())->members->resultMode );
+        }
+        PyList_SET_ITEM( ret.get(), i, result.getAcquired() );
+    }
+    return ret;
+}
+
+PyRef PyUNO_callable_withResultMode( PyObject *obj, ResultMode resultMode )
+{
+    if( ! obj || Py_TYPE( obj ) != &PyUNO_callable_Type )
+    {
+        PyErr_SetString( PyExc_TypeError, "expected a method of an UNO object" );
+        return PyRef();
+    }
+    PyUNO_callable_Internals *members = ((PyUNO_callable *) obj)->members;
+    if( members->pUnoI )
+    {
+        return PyUNO_callable_newDirect(
+            members->pUnoI, members->method, members->methodName, members->mode, resultMode );
+    }
+    return PyUNO_callable_new(
+        members->xInvocation, members->methodName, members->mode, resultMode );
+}
+
 
 typedef struct
 {
@@ -328,8 +716,15 @@ PyObject* PyUNO_service_constructor_call(PyObject* self, PyObject* args, PyObjec
                 {
                     if ( xParameter->isIn() )
                     {
-                        Any a( runtime.pyObject2Any( PyTuple_GetItem( args, n ) ) );
                         const Type t( xParameter->getType()->getTypeClass(), xParameter->getType()->getName() );
+                        Any a;
+                        if ( pyMatrix2Sequence( PyTuple_GetItem( args, n ), t.getTypeLibType(), a, runtime, REJECT_UNO_ANY ) ||
+                             pyObject2TypedSequence( PyTuple_GetItem( args, n ), t.getTypeLibType(), a ) )
+                        {
+                            pArguments[n] = a;
+                            continue;
+                        }
+                        a = runtime.pyObject2Any( PyTuple_GetItem( args, n ) );
                         if ( a.isExtractableTo( t ) )
                         {
                             pArguments[n] = a;
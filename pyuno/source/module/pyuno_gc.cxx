@@ -22,6 +22,11 @@
 
 #include "pyuno_impl.hxx"
 #include <osl/thread.hxx>
+#include <osl/mutex.hxx>
+#include <osl/conditn.hxx>
+
+#include <vector>
+
 namespace pyuno
 {
 
@@ -42,51 +47,131 @@ static bool isAfterUnloadOrPy_Finalize()
         !Py_IsInitialized();
 }
 
+// the reaper thread ends after being idle for this time and is started again on demand
+static const sal_uInt32 REAPER_IDLE_SECONDS = 5;
+
+struct PendingRelease
+{
+    PyInterpreterState *interpreter;
+    PyObject *object;
+};
+
+typedef std::vector< PendingRelease > PendingReleaseList;
+
+class GCThread;
+
+/** the state shared with the reaper thread. It is allocated once and never
+    freed, so the thread may still wait on it, when the static objects are
+    destroyed at shutdown.
+ */
+struct ReaperState
+{
+    // pendingReleases and pThread are guarded by mutex, which is held only
+    // for appending an object or taking all of them
+    osl::Mutex mutex;
+    osl::Condition condition;
+    PendingReleaseList pendingReleases;
+    GCThread *pThread;
+
+    ReaperState() : pThread( 0 ) {}
+};
+
+static ReaperState * const g_pReaperState = new ReaperState;
+
+/** the global interpreter lock must be held
+ */
+static void releaseObject( const Runtime &runtime, PyObject *object )
+{
+    // remove the reference from the pythonobject2adapter map
+    PyRef2Adapter &mappedObjects = runtime.getImpl()->cargo->mappedObjects;
+    PyRef2Adapter::iterator ii = mappedObjects.find( object );
+    if( ii != mappedObjects.end() )
+    {
+        mappedObjects.erase( ii );
+    }
+
+    Py_XDECREF( object );
+}
+
+/** releases the objects of each interpreter with one acquisition of its
+    global interpreter lock
+ */
+static void releaseObjects( PendingReleaseList &pending )
+{
+    while( ! pending.empty() )
+    {
+        //  otherwise we crash here, when main has been left already
+        if( isAfterUnloadOrPy_Finalize() )
+            return;
+
+        PyInterpreterState *interpreter = pending.front().interpreter;
+        PendingReleaseList current;
+        PendingReleaseList others;
+        for( PendingReleaseList::const_iterator ii = pending.begin(); ii != pending.end(); ++ii )
+        {
+            if( ii->interpreter == interpreter )
+                current.push_back( *ii );
+            else
+                others.push_back( *ii );
+        }
+        pending.swap( others );
+
+        try
+        {
+            PyThreadAttach g( interpreter );
+            {
+                Runtime runtime;
+                for( PendingReleaseList::const_iterator ii = current.begin(); ii != current.end(); ++ii )
+                    releaseObject( runtime, ii->object );
+            }
+        }
+        catch( com::sun::star::uno::RuntimeException & e )
+        {
+            rtl::OString msg;
+            msg = rtl::OUStringToOString( e.Message, RTL_TEXTENCODING_ASCII_US );
+            fprintf( stderr, "Leaking python objects bridged to UNO for reason %s\n",msg.getStr());
+        }
+    }
+}
+
+/** releases the python objects of dead adapters in batches, one thread
+    serves all of them
+ */
 class GCThread : public ::osl::Thread
 {
-    PyObject *mPyObject;
-    PyInterpreterState *mPyInterpreter;
     GCThread( const GCThread & ); // not implemented
     GCThread &operator =( const GCThread & ); // not implemented
     
 public:
-    GCThread( PyInterpreterState *interpreter, PyObject * object );
+    GCThread() {}
     virtual void SAL_CALL run();
     virtual void SAL_CALL onTerminated();
 };
 
 
-GCThread::GCThread( PyInterpreterState *interpreter, PyObject * object ) :
-    mPyObject( object ), mPyInterpreter( interpreter )
-{}
-
 void GCThread::run()
 {
-    //  otherwise we crash here, when main has been left already
-    if( isAfterUnloadOrPy_Finalize() )
-        return;
-    try
+    for( ;; )
     {
-        PyThreadAttach g( (PyInterpreterState*)mPyInterpreter );
-        {
-            Runtime runtime;
+        TimeValue timeout = { REAPER_IDLE_SECONDS, 0 };
+        g_pReaperState->condition.wait( &timeout );
+        //  the objects are leaked, when main has been left already
+        if( isAfterUnloadOrPy_Finalize() )
+            return;
 
-            // remove the reference from the pythonobject2adapter map
-            PyRef2Adapter::iterator ii =
-                runtime.getImpl()->cargo->mappedObjects.find( mPyObject );
-            if( ii != runtime.getImpl()->cargo->mappedObjects.end() )
+        PendingReleaseList pending;
+        {
+            osl::MutexGuard reaperGuard( g_pReaperState->mutex );
+            g_pReaperState->condition.reset();
+            pending.swap( g_pReaperState->pendingReleases );
+            if( pending.empty() )
             {
-                runtime.getImpl()->cargo->mappedObjects.erase( ii );
+                // a new thread is started for the next object
+                g_pReaperState->pThread = 0;
+                return;
             }
-            
-            Py_XDECREF( mPyObject );
         }
-    }
-    catch( com::sun::star::uno::RuntimeException & e )
-    {
-        rtl::OString msg;
-        msg = rtl::OUStringToOString( e.Message, RTL_TEXTENCODING_ASCII_US );
-        fprintf( stderr, "Leaking python objects bridged to UNO for reason %s\n",msg.getStr());
+        releaseObjects( pending );
     }
 }
 
@@ -102,12 +187,46 @@ void decreaseRefCount( PyInterpreterState *interpreter, PyObject *object )
     if( isAfterUnloadOrPy_Finalize() )
         return;
 
-    // delegate to a new thread, because there does not seem
-    // to be a method, which tells, whether the global
-    // interpreter lock is held or not
-    // TODO: Look for a more efficient solution
-    osl::Thread *t = new GCThread( interpreter, object );
-    t->create();
+#if PY_VERSION_HEX >= 0x03050200
+    // released at once, when the current thread holds the global interpreter
+    // lock of the interpreter, i.e. has a thread state of it. PyGILState_Check()
+    // can't tell, once a sub interpreter has been created.
+#if PY_VERSION_HEX >= 0x030D0000
+    PyThreadState *tstate = PyThreadState_GetUnchecked();
+#else
+    PyThreadState *tstate = _PyThreadState_UncheckedGet();
+#endif
+    if( tstate && tstate->interp == interpreter )
+    {
+        try
+        {
+            Runtime runtime;
+            releaseObject( runtime, object );
+            return;
+        }
+        catch( com::sun::star::uno::RuntimeException & )
+        {
+            // left to the reaper thread
+        }
+    }
+#endif
+
+    // delegate to the reaper thread, older python versions offer no method,
+    // which tells, whether the global interpreter lock is held or not
+    osl::MutexGuard reaperGuard( g_pReaperState->mutex );
+    PendingRelease release = { interpreter, object };
+    g_pReaperState->pendingReleases.push_back( release );
+    if( ! g_pReaperState->pThread )
+    {
+        g_pReaperState->pThread = new GCThread();
+        if( ! g_pReaperState->pThread->create() )
+        {
+            // the objects are released by the next thread started
+            delete g_pReaperState->pThread;
+            g_pReaperState->pThread = 0;
+        }
+    }
+    g_pReaperState->condition.set();
 }
 
 }
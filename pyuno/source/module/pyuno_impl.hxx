@@ -27,8 +27,12 @@
 
 #include <hash_map>
 #include <hash_set>
+#include <list>
 
 #include <com/sun/star/beans/XIntrospection.hpp>
+#include <com/sun/star/beans/Property.hpp>
+#include <com/sun/star/beans/PropertyValue.hpp>
+#include <com/sun/star/beans/XPropertySetInfo.hpp>
 #include <com/sun/star/script/XTypeConverter.hpp>
 #include <com/sun/star/script/XInvocation2.hpp>
 #include <com/sun/star/script/XInvocationAdapterFactory2.hpp>
@@ -43,6 +47,12 @@
 #include <cppuhelper/implbase2.hxx>
 #include <cppuhelper/weakref.hxx>
 
+#include <osl/interlck.h>
+#include <rtl/ref.hxx>
+#include <typelib/typedescription.hxx>
+#include <uno/dispatcher.h>
+#include <uno/mapping.hxx>
+
 //
 // Local workarounds for compatibility issues
 //
@@ -50,10 +60,12 @@
     #define PYSTR_FROMSTR               PyUnicode_FromString
     #define USTR_TO_PYSTR               ustring2PyUnicode
     #define PYSTR_CHECK                 PyUnicode_Check
+    #define PYSTR_INTERNFROMSTR         PyUnicode_InternFromString
 #else
     #define PYSTR_FROMSTR               PyBytes_FromString
     #define USTR_TO_PYSTR               ustring2PyString
     #define PYSTR_CHECK                 PyBytes_Check
+    #define PYSTR_INTERNFROMSTR         PyString_InternFromString
 #endif
 
 #include <rtl/string.hxx>
@@ -117,20 +129,274 @@ typedef ::std::hash_map
     std::equal_to< rtl::OUString >
 > MethodOutIndexMap;
 
+/** a method called by uno on instances of a python class
+ */
+struct ClassMethod
+{
+    // the interned name of the method
+    PyRef pyName;
+    // the function found in the class, called with the instance as first
+    // argument. Empty, when the attribute is looked up at the instance.
+    PyRef function;
+};
+
+typedef ::std::hash_map
+<
+    rtl::OUString,
+    ClassMethod,
+    rtl::OUStringHash,
+    std::equal_to< rtl::OUString >
+> ClassMethodMap;
+
+/** the methods of one python class called by uno
+ */
+struct ClassMethodTable
+{
+    // the version tag of the class, when the methods were looked up, 0 when
+    // the class had none
+    unsigned int versionTag;
+    ClassMethodMap methods;
+
+    ClassMethodTable() : versionTag( 0 ) {}
+};
+
+// the classes are held, so that their addresses can't get reused. The map is
+// bounded, classes created at runtime would pile up otherwise.
+typedef ::std::hash_map
+<
+    PyRef,
+    ClassMethodTable,
+    PyRef::Hash,
+    std::equal_to< PyRef >
+> ClassMethodTableMap;
+
+/** returns the method of the class of the object. The methods are looked up
+    again, when the class has been modified since.
+ */
+const ClassMethod &getClassMethod(
+    RuntimeCargo *cargo, PyObject *object, const rtl::OUString &name );
+
+/** @return true, when the instance attribute of the given name overrides the
+    function of the class of the object
+ */
+bool isOverriddenByInstance( PyObject *object, PyObject *pyName, PyObject *function );
+
+/** the types of the instances of a python class deriving from unohelper.Base
+ */
+struct ClassTypes
+{
+    // the getTypes function of the class, which returned the types
+    PyRef getTypes;
+    com::sun::star::uno::Sequence< com::sun::star::uno::Type > types;
+};
+
+// bounded like ClassMethodTableMap
+typedef ::std::hash_map
+<
+    PyRef,
+    ClassTypes,
+    PyRef::Hash,
+    std::equal_to< PyRef >
+> ClassTypesMap;
+
+/** maps the names of the types implemented by python objects to the out
+    parameter indexes of all their methods, shared by the adapters
+ */
+typedef ::std::hash_map
+<
+    rtl::OUString,
+    MethodOutIndexMap,
+    rtl::OUStringHash,
+    std::equal_to< rtl::OUString >
+> OutIndexTableMap;
+
 typedef ::std::hash_set< PyRef , PyRef::Hash , std::equal_to<PyRef> > ClassSet;
 
+typedef ::std::hash_map
+<
+    rtl::OUString,
+    PyRef,
+    rtl::OUStringHash,
+    std::equal_to< rtl::OUString >
+> InternedValueMap;
+
+/** classification of python objects, which are not converted by their
+    builtin type, in Runtime::pyObject2Any
+ */
+enum PyObjectKind
+{
+    BYTESEQUENCE_KIND, PROPERTYVALUES_KIND, TYPE_KIND, ENUM_KIND, STRUCT_KIND, PYUNO_KIND, CHAR_KIND, ANY_KIND,
+    // buffers, iterators and objects to be adapted
+    OTHER_KIND
+};
+
+// the type objects are held, so that their addresses can't get reused.
+// The map is bounded, classes created at runtime would pile up otherwise.
+typedef ::std::hash_map
+<
+    PyRef,
+    PyObjectKind,
+    PyRef::Hash,
+    std::equal_to< PyRef >
+> PyObjectKindMap;
+
+typedef ::std::hash_map< sal_Int32, PyRef > EnumValueMap;
+
+/** maps the values of one enum type to the interned python enum instances
+ */
+struct EnumTable
+{
+    // keeps the type reference used as key alive
+    com::sun::star::uno::Type type;
+    EnumValueMap values;
+};
+
+struct TypeRefHash
+{
+    sal_IntPtr operator () ( typelib_TypeDescriptionReference *p ) const { return sal_IntPtr( p ); }
+};
+
+typedef ::std::hash_map
+<
+    typelib_TypeDescriptionReference *,
+    EnumTable,
+    TypeRefHash,
+    std::equal_to< typelib_TypeDescriptionReference * >
+> EnumTableMap;
+
+struct InterfaceHash
+{
+    sal_IntPtr operator () ( com::sun::star::uno::XInterface *p ) const { return sal_IntPtr( p ); }
+};
+
+/** maps the normalized interface of an uno object to its living wrapper.
+    The wrapper is not held, PyUNO_del removes it from the map. The interface
+    is held by the wrapper as PyUNOInternals::identity.
+ */
+typedef ::std::hash_map
+<
+    com::sun::star::uno::XInterface *,
+    PyObject *,
+    InterfaceHash,
+    std::equal_to< com::sun::star::uno::XInterface * >
+> InterfaceWrapperMap;
+
+typedef ::std::hash_map
+<
+    rtl::OUString,
+    com::sun::star::beans::Property,
+    rtl::OUStringHash,
+    std::equal_to< rtl::OUString >
+> PropertyMap;
+
+/** the properties of one property set info, which were looked up by their
+    names for uno.getProperties and uno.setProperties
+ */
+struct PropertyTable
+{
+    // keeps the property set info used as key alive
+    com::sun::star::uno::Reference< com::sun::star::beans::XPropertySetInfo > info;
+    PropertyMap properties;
+};
+
+typedef ::std::hash_map
+<
+    com::sun::star::uno::XInterface *,
+    PropertyTable,
+    InterfaceHash,
+    std::equal_to< com::sun::star::uno::XInterface * >
+> PropertyTableMap;
+
+/** returns the living wrapper of the uno object, if there is one, otherwise
+    a new one is created and registered in the wrapper map of the runtime
+ */
 PyObject* PyUNO_new(
     const com::sun::star::uno::Any & targetInterface,
-    const com::sun::star::uno::Reference<com::sun::star::lang::XSingleServiceFactory> & ssf);
+    const com::sun::star::uno::Reference<com::sun::star::lang::XSingleServiceFactory> & ssf,
+    RuntimeCargo *cargo );
 
 PyObject* PyUNO_new_UNCHECKED (
     const com::sun::star::uno::Any & targetInterface,
     const com::sun::star::uno::Reference<com::sun::star::lang::XSingleServiceFactory> & ssf);
 
+/** the methods of one uno implementation, as reported by its invocation.
+    The table is shared by the wrappers of all objects of the implementation,
+    only names found by the invocation are recorded. Properties are not
+    recorded, the property set info may differ between the objects.
+ */
+class MemberTable
+{
+public:
+    struct Member
+    {
+        // keeps the key of the member map alive
+        rtl::OString pyName;
+        rtl::OUString name;
+        // the interface method to call directly, if the name is unique
+        // among the interfaces of the implementation
+        com::sun::star::uno::Type interfaceType;
+        com::sun::star::uno::TypeDescription method;
+    };
+
+    MemberTable();
+
+    void acquire() { osl_incrementInterlockedCount( &m_nRefCount ); }
+    void release() { if( ! osl_decrementInterlockedCount( &m_nRefCount ) ) delete this; }
+
+    const Member *find( const char *pName ) const;
+    const Member *insert(
+        const char *pName, const rtl::OUString &name,
+        const com::sun::star::uno::Type &interfaceType,
+        const com::sun::star::uno::TypeDescription &method );
+
+private:
+    struct CStringHash
+    {
+        sal_Int32 operator () ( const char *p ) const { return rtl_str_hashCode( p ); }
+    };
+    struct CStringEqual
+    {
+        bool operator () ( const char *p1, const char *p2 ) const { return strcmp( p1, p2 ) == 0; }
+    };
+    typedef ::std::hash_map
+    <
+        const char *,
+        Member,
+        CStringHash,
+        CStringEqual
+    > MemberMap;
+
+    oslInterlockedCount m_nRefCount;
+    MemberMap m_members;
+};
+
+/** maps implementation ids to the member tables of their implementations.
+    Implementations may return a new id for each call, so the map is bounded.
+ */
+typedef ::std::hash_map
+<
+    rtl::OString,
+    rtl::Reference< MemberTable >,
+    rtl::OStringHash,
+    std::equal_to< rtl::OString >
+> MemberTableMap;
+
 typedef struct
 {
     com::sun::star::uno::Reference <com::sun::star::script::XInvocation2> xInvocation;
+    // creates xInvocation on first use, empty once it has been created
+    com::sun::star::uno::Reference <com::sun::star::lang::XSingleServiceFactory> xInvocationFactory;
     com::sun::star::uno::Any wrappedObject;
+    // the normalized interface used as key in the wrapper map, if registered.
+    // It is held, bridge proxies of other interfaces don't keep it alive.
+    com::sun::star::uno::Reference< com::sun::star::uno::XInterface > identity;
+    // the member table of the implementation, when it can be shared
+    rtl::Reference< MemberTable > memberTable;
+    bool memberTableChecked;
+    // the members of the object may change at any time, set with memberTableChecked
+    bool dynamicMembers;
+    // the callables of the methods looked up, by attribute name
+    PyRef callables;
 } PyUNOInternals;
 
 typedef struct
@@ -139,10 +405,21 @@ typedef struct
     PyUNOInternals* members;
 } PyUNO;
 
+/** returns the invocation of the wrapper. Interfaces get it not before it is
+    needed, since many of them are only passed back to uno.
+ */
+com::sun::star::uno::Reference< com::sun::star::script::XInvocation2 > PyUNO_getInvocation( PyUNO *me )
+    throw ( com::sun::star::uno::RuntimeException );
+
 PyRef ustring2PyUnicode( const rtl::OUString &source );
 PyRef ustring2PyString( const ::rtl::OUString & source );
 rtl::OUString pyString2ustring( PyObject *str );
 
+/** string conversions using the string cache of the runtime, when it is enabled
+ */
+PyRef ustring2PyUnicode( const rtl::OUString &source, RuntimeCargo *cargo );
+rtl::OUString pyString2ustring( PyObject *str, RuntimeCargo *cargo );
+
     
 PyRef AnyToPyObject (const com::sun::star::uno::Any & a, const Runtime &r )
     throw ( com::sun::star::uno::RuntimeException );
@@ -158,10 +435,88 @@ void raiseInvocationTargetExceptionWhenNeeded( const Runtime &runtime )
 
 com::sun::star::uno::TypeClass StringToTypeClass (char* string);
 
+/** Determines, how a callable converts the values returned by UNO
+ */
+enum ResultMode { DEFAULT_RESULT, BUFFER_RESULT, MATRIX_RESULT };
+
 PyRef PyUNO_callable_new (
     const com::sun::star::uno::Reference<com::sun::star::script::XInvocation2> &xInv,
     const rtl::OUString &methodName,
-    ConversionMode mode = REJECT_UNO_ANY );
+    ConversionMode mode = REJECT_UNO_ANY,
+    ResultMode resultMode = DEFAULT_RESULT );
+
+/** creates a callable, which calls the method through the dispatcher of the
+    uno interface instead of the invocation. The arguments are converted to
+    the declared parameter types of the method.
+ */
+PyRef PyUNO_callable_newDirect (
+    uno_Interface *pUnoI,
+    const com::sun::star::uno::TypeDescription &method,
+    const rtl::OUString &methodName,
+    ConversionMode mode = REJECT_UNO_ANY,
+    ResultMode resultMode = DEFAULT_RESULT );
+
+/** returns a copy of the given callable, which uses the given result mode.
+    Sets a python TypeError and returns an empty reference, when obj is not
+    a method of an UNO object.
+ */
+PyRef PyUNO_callable_withResultMode( PyObject *obj, ResultMode resultMode );
+
+/** calls the methods given by a sequence of (object, method name, arguments)
+    tuples. The arguments of all calls are converted first, then the calls are
+    made with one release of the global interpreter lock. Returns a list of the
+    results, which holds the exception instead for calls that failed. Sets a
+    python error and returns an empty reference for invalid calls.
+ */
+PyRef PyUNO_callable_invokeBatch( PyObject *calls, const Runtime &runtime )
+    throw ( com::sun::star::script::CannotConvertException,
+            com::sun::star::lang::IllegalArgumentException,
+            com::sun::star::uno::RuntimeException );
+
+/** packs a python buffer, list or tuple directly into a sequence of simple
+    element types (numbers, booleans or strings) without creating an Any per
+    element.
+
+    @param pSeqTypeRef the requested sequence type. When 0, only buffers are
+           packed and the element type is derived from the buffer format.
+    @return false, when o can't be packed this way. The caller has to fall back
+            to the generic conversion then.
+ */
+bool pyObject2TypedSequence(
+    PyObject *o, typelib_TypeDescriptionReference *pSeqTypeRef, com::sun::star::uno::Any &a );
+
+/** converts a list or tuple of lists or tuples in one pass into a
+    sequence< sequence< any > >, preallocating each row. This avoids the Any
+    per row and the deep conversion by the type converter, which the generic
+    nested conversion needs for e.g. XCellRangeData.setDataArray().
+
+    @return false, when pSeqTypeRef is not sequence< sequence< any > > or o is
+            not such a matrix. The caller has to fall back to the other
+            conversions then.
+ */
+bool pyMatrix2Sequence(
+    PyObject *o, typelib_TypeDescriptionReference *pSeqTypeRef,
+    com::sun::star::uno::Any &a, const Runtime &r, ConversionMode mode )
+    throw ( com::sun::star::uno::RuntimeException );
+
+/** converts numeric sequences into objects exporting the sequence memory
+    through the buffer protocol, nested sequences into tuples of such objects.
+    All other values are converted with Runtime::any2PyObject.
+ */
+PyRef sequence2PyBuffer( const com::sun::star::uno::Any &a, const Runtime &r )
+    throw ( com::sun::star::script::CannotConvertException,
+            com::sun::star::lang::IllegalArgumentException,
+            com::sun::star::uno::RuntimeException );
+
+/** converts rectangular sequences of sequences, whose cells are all numbers,
+    into a two dimensional buffer object of doubles (format 'd'), which is
+    filled in one pass. All other values are converted with
+    Runtime::any2PyObject, so mixed data arrays become tuples of tuples.
+ */
+PyRef sequence2PyMatrix( const com::sun::star::uno::Any &a, const Runtime &r )
+    throw ( com::sun::star::script::CannotConvertException,
+            com::sun::star::lang::IllegalArgumentException,
+            com::sun::star::uno::RuntimeException );
 
 PyRef PyUNO_service_constructor_new(
     const rtl::OUString & serviceName, 
@@ -172,6 +527,28 @@ PyObject* PyUNO_Type_new (const char *typeName , com::sun::star::uno::TypeClass
 PyObject* PyUNO_Enum_new( const char *enumBase, const char *enumValue, const Runtime &r );
 PyObject* PyUNO_char_new (sal_Unicode c , const Runtime &r);
 PyObject *PyUNO_ByteSequence_new( const com::sun::star::uno::Sequence< sal_Int8 > &, const Runtime &r );
+
+/** the native uno.ByteSequence type, which wraps a Sequence< sal_Int8 >
+    and exports it read-only through the buffer protocol
+ */
+extern PyTypeObject PyUNO_ByteSequence_Type;
+
+/** the native uno.PropertyValues type created by uno.props, which wraps a
+    Sequence< PropertyValue >
+ */
+extern PyTypeObject PyUNO_PropertyValues_Type;
+
+/** the native, immutable uno.Enum, uno.Type and uno.Char types. Enum and
+    Type instances are interned per runtime.
+ */
+extern PyTypeObject PyUNO_Enum_Type;
+extern PyTypeObject PyUNO_Type_Type;
+extern PyTypeObject PyUNO_Char_Type;
+
+/** readies the native value types and adds them to the pyuno module
+    @return -1 with a python exception set on failure
+ */
+int PyUNO_initValueTypes( PyObject *module );
 PyObject *PyUNO_UNOSingleton_new( const char * singletonName, const Runtime & r );
 PyObject * PyUNO_UNOService_new( const char * serviceName, const com::sun::star::uno::Sequence< rtl::OUString > & aNames, const Runtime & r );
 
@@ -186,13 +563,43 @@ PyRef getPyUnoClass();
 PyRef getClass( const rtl::OUString & name , const Runtime & runtime );
 PyRef getAnyClass( const Runtime &);
 PyObject *PyUNO_invoke( PyObject *object, const char *name , PyObject *args );
+/** returns a dict of the values of the named properties of the uno object, read
+    through XMultiPropertySet or XFastPropertySet where the object supports them
+ */
+PyObject *PyUNO_getProperties( PyObject *object, PyObject *names );
+/** sets the properties of the uno object to the values of the mapping, through
+    XMultiPropertySet or XFastPropertySet where the object supports them
+ */
+PyObject *PyUNO_setProperties( PyObject *object, PyObject *values );
+/** returns a PropertyValues instance of the mapping and keyword arguments of uno.props
+ */
+PyObject *PyUNO_props( PyObject *args, PyObject *kwds );
+/** returns a dict of the names and values of a PropertyValues instance or a
+    sequence of PropertyValue structs
+ */
+PyObject *PyUNO_propsToDict( PyObject *sequence );
 
 com::sun::star::uno::Any PyEnum2Enum( PyObject *obj )
     throw ( com::sun::star::uno::RuntimeException );
+/** returns the table of the python instances of all values of the given enum type,
+    which is built on first use
+ */
+const EnumTable & getEnumTable( typelib_TypeDescriptionReference *pTypeRef, const Runtime &r )
+    throw ( com::sun::star::uno::RuntimeException );
+/** returns the python instance of an enum value, throws a RuntimeException for invalid values
+ */
+PyRef getPyEnum( const EnumTable &table, sal_Int32 nValue )
+    throw ( com::sun::star::uno::RuntimeException );
 sal_Bool PyBool2Bool( PyObject *o, const Runtime & r )
     throw ( com::sun::star::uno::RuntimeException );
 sal_Unicode PyChar2Unicode( PyObject *o )
     throw ( com::sun::star::uno::RuntimeException );
+/** returns the sequence wrapped by a ByteSequence instance without copying the bytes
+ */
+com::sun::star::uno::Sequence< sal_Int8 > PyByteSequence2ByteSequence( PyObject *o );
+/** returns the sequence wrapped by a PropertyValues instance
+ */
+com::sun::star::uno::Sequence< com::sun::star::beans::PropertyValue > PyPropertyValues2Sequence( PyObject *o );
 com::sun::star::uno::Type PyType2Type( PyObject * o )
     throw( com::sun::star::uno::RuntimeException );
 
@@ -207,6 +614,60 @@ bool isInstanceOfStructOrException( PyObject *obj);
 com::sun::star::uno::Sequence<com::sun::star::uno::Type> implementsInterfaces(
     const Runtime & runtime, PyObject *obj );
 
+/** a bounded LRU cache, which shares python strings for short UNO strings
+    crossing the bridge repeatedly (property names, style names, ...). The
+    cached python strings map back to their OUString without conversion.
+    The cache is disabled, when its capacity is 0.
+ */
+class StringCache
+{
+public:
+    StringCache();
+
+    void setCapacity( sal_Int32 nCapacity );
+    bool isEnabled() const { return m_nCapacity > 0; }
+
+    PyRef toPython( const rtl::OUString &str );
+    rtl::OUString toUno( PyObject *str );
+
+    /** returns a dict with the size and the hit and miss counters */
+    PyRef getStatistics() const;
+
+private:
+    struct Entry
+    {
+        rtl::OUString str;
+        PyRef pyStr;
+    };
+    typedef std::list< Entry > EntryList;
+    typedef ::std::hash_map
+    <
+        rtl::OUString,
+        EntryList::iterator,
+        rtl::OUStringHash,
+        std::equal_to< rtl::OUString >
+    > EntryMap;
+    typedef ::std::hash_map
+    <
+        PyRef,
+        EntryList::iterator,
+        PyRef::Hash,
+        std::equal_to< PyRef >
+    > ReverseEntryMap;
+
+    void insert( const rtl::OUString &str, const PyRef &pyStr );
+
+    sal_Int32 m_nCapacity;
+    sal_Int32 m_nSize;
+    EntryList m_entries;
+    EntryMap m_map;
+    ReverseEntryMap m_reverseMap;
+    sal_Int64 m_nHits;
+    sal_Int64 m_nMisses;
+    sal_Int64 m_nReverseHits;
+    sal_Int64 m_nReverseMisses;
+};
+
 struct RuntimeCargo
 {
     com::sun::star::uno::Reference< com::sun::star::lang::XSingleServiceFactory > xInvocation;
@@ -221,6 +682,20 @@ struct RuntimeCargo
     ExceptionClassMap exceptionMap;
     ClassSet interfaceSet;
     PyRef2Adapter mappedObjects;
+    InterfaceWrapperMap wrappers;
+    MemberTableMap memberTables;
+    PropertyTableMap propertyTables;
+    OutIndexTableMap outIndexTables;
+    ClassMethodTableMap classMethods;
+    ClassTypesMap classTypes;
+    // map interfaces for calling them directly through their dispatcher
+    com::sun::star::uno::Mapping cpp2uno;
+    com::sun::star::uno::Mapping uno2cpp;
+    InternedValueMap enumValues;
+    InternedValueMap types;
+    EnumTableMap enumTables;
+    StringCache stringCache;
+    PyObjectKindMap pyObjectKinds;
     FILE *logFile;
     sal_Int32 logLevel;
 
@@ -246,7 +721,8 @@ class Adapter : public cppu::WeakImplHelper2<
     PyRef mWrappedObject;
     PyInterpreterState *mInterpreter;  // interpreters don't seem to be refcounted !
     com::sun::star::uno::Sequence< com::sun::star::uno::Type > mTypes;
-    MethodOutIndexMap m_methodOutIndexMap;
+    // the table of the runtime shared by the adapters of the same types
+    const MethodOutIndexMap *m_pOutIndexes;
 
 private:
     com::sun::star::uno::Sequence< sal_Int16 > getOutIndexes( const rtl::OUString & functionName );
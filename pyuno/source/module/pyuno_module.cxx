@@ -287,7 +287,7 @@ static PyObject *createUnoStructHelper(PyObject *, PyObject* args )
                             typelib_CompoundTypeDescription *pCompType =
                                 ( typelib_CompoundTypeDescription * ) desc.get();
                             sal_Int32 n = fillStructWithInitializer(
-                                me->members->xInvocation, pCompType, initializer, runtime );
+                                PyUNO_getInvocation( me ), pCompType, initializer, runtime );
                             if( n != PyTuple_Size(initializer) )
                             {
                                 OUStringBuffer buf;
@@ -1016,6 +1016,106 @@ static PyObject * invoke ( PyObject *, PyObject * args )
     return ret;
 }
 
+static PyObject * asBuffer( PyObject *, PyObject * args )
+{
+    if( PyTuple_Check( args ) && PyTuple_Size( args ) == 1 )
+    {
+        return PyUNO_callable_withResultMode(
+            PyTuple_GetItem( args, 0 ), BUFFER_RESULT ).getAcquired();
+    }
+    PyErr_SetString( PyExc_RuntimeError, "uno.asBuffer expects exactly one argument (a method of an UNO object)" );
+    return NULL;
+}
+
+static PyObject * asMatrix( PyObject *, PyObject * args )
+{
+    if( PyTuple_Check( args ) && PyTuple_Size( args ) == 1 )
+    {
+        return PyUNO_callable_withResultMode(
+            PyTuple_GetItem( args, 0 ), MATRIX_RESULT ).getAcquired();
+    }
+    PyErr_SetString( PyExc_RuntimeError, "uno.asMatrix expects exactly one argument (a method of an UNO object)" );
+    return NULL;
+}
+
+static PyObject * getProperties( PyObject *, PyObject * args )
+{
+    if( PyTuple_Check( args ) && PyTuple_Size( args ) == 2 )
+    {
+        return PyUNO_getProperties( PyTuple_GetItem( args, 0 ), PyTuple_GetItem( args, 1 ) );
+    }
+    PyErr_SetString( PyExc_RuntimeError, "uno.getProperties expects exactly two arguments (an UNO object and a sequence of property names)" );
+    return NULL;
+}
+
+static PyObject * setProperties( PyObject *, PyObject * args )
+{
+    if( PyTuple_Check( args ) && PyTuple_Size( args ) == 2 )
+    {
+        return PyUNO_setProperties( PyTuple_GetItem( args, 0 ), PyTuple_GetItem( args, 1 ) );
+    }
+    PyErr_SetString( PyExc_RuntimeError, "uno.setProperties expects exactly two arguments (an UNO object and a mapping of property names to values)" );
+    return NULL;
+}
+
+static PyObject * props( PyObject *, PyObject * args, PyObject * kwds )
+{
+    return PyUNO_props( args, kwds );
+}
+
+static PyObject * propsToDict( PyObject *, PyObject * args )
+{
+    if( PyTuple_Check( args ) && PyTuple_Size( args ) == 1 )
+    {
+        return PyUNO_propsToDict( PyTuple_GetItem( args, 0 ) );
+    }
+    PyErr_SetString( PyExc_RuntimeError, "uno.propsToDict expects exactly one argument (a sequence of PropertyValues)" );
+    return NULL;
+}
+
+static PyObject * invokeBatch( PyObject *, PyObject * args )
+{
+    if( PyTuple_Check( args ) && PyTuple_Size( args ) == 1 )
+    {
+        PyRef ret;
+        try
+        {
+            Runtime runtime;
+            ret = PyUNO_callable_invokeBatch( PyTuple_GetItem( args, 0 ), runtime );
+        }
+        catch( com::sun::star::lang::IllegalArgumentException & e )
+        {
+            raisePyExceptionWithAny( makeAny( e ) );
+        }
+        catch( com::sun::star::script::CannotConvertException & e )
+        {
+            raisePyExceptionWithAny( makeAny( e ) );
+        }
+        catch( RuntimeException & e )
+        {
+            raisePyExceptionWithAny( makeAny( e ) );
+        }
+        return ret.getAcquired();
+    }
+    PyErr_SetString( PyExc_RuntimeError, "uno.invokeBatch expects exactly one argument (a list of (object, method name, arguments) tuples)" );
+    return NULL;
+}
+
+static PyObject *getStringCacheStatistics( PyObject *, PyObject * )
+{
+    PyRef ret;
+    try
+    {
+        Runtime runtime;
+        ret = runtime.getImpl()->cargo->stringCache.getStatistics();
+    }
+    catch( com::sun::star::uno::Exception & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    return ret.getAcquired();
+}
+
 static PyObject *getCurrentContext( PyObject *, PyObject * )
 {
     PyRef ret;
@@ -1092,8 +1192,16 @@ struct PyMethodDef PyUNOModule_methods [] =
     {const_cast< char * >("absolutize"), absolutize, METH_VARARGS, NULL},
     {const_cast< char * >("isInterface"), isInterface, METH_VARARGS, NULL},
     {const_cast< char * >("invoke"), invoke, METH_VARARGS, NULL},
+    {const_cast< char * >("asBuffer"), asBuffer, METH_VARARGS, NULL},
+    {const_cast< char * >("asMatrix"), asMatrix, METH_VARARGS, NULL},
+    {const_cast< char * >("invokeBatch"), invokeBatch, METH_VARARGS, NULL},
+    {const_cast< char * >("getProperties"), getProperties, METH_VARARGS, NULL},
+    {const_cast< char * >("setProperties"), setProperties, METH_VARARGS, NULL},
+    {const_cast< char * >("props"), (PyCFunction) props, METH_VARARGS | METH_KEYWORDS, NULL},
+    {const_cast< char * >("propsToDict"), propsToDict, METH_VARARGS, NULL},
     {const_cast< char * >("setCurrentContext"), setCurrentContext, METH_VARARGS, NULL},
     {const_cast< char * >("getCurrentContext"), getCurrentContext, METH_NOARGS, NULL},
+    {const_cast< char * >("getStringCacheStatistics"), getStringCacheStatistics, METH_NOARGS, NULL},
     {const_cast< char * >("getModuleElementNames"), getModuleElementNames, METH_VARARGS, NULL},
     {const_cast< char * >("hasModule"), hasModule, METH_VARARGS, NULL},
     {const_cast< char * >("importValue"), importValue, METH_VARARGS, NULL}, 
@@ -1129,6 +1237,8 @@ extern "C" PyMODINIT_FUNC PyInit_pyuno(void)
     
     if (PyType_Ready((PyTypeObject *)getPyUnoClass().get()))
         return NULL;
+    if (PyUNO_initValueTypes(m) < 0)
+        return NULL;
     return m;
 }
 #else
@@ -1137,6 +1247,8 @@ extern "C" PY_DLLEXPORT void initpyuno()
     // noop when called already, otherwise needed to allow multiple threads
     // This has to be reworked for Python 3.
     PyEval_InitThreads();
-    Py_InitModule (const_cast< char * >("pyuno"), PyUNOModule_methods);
+    PyObject *m = Py_InitModule (const_cast< char * >("pyuno"), PyUNOModule_methods);
+    if (m != NULL)
+        PyUNO_initValueTypes(m);
 }
 #endif
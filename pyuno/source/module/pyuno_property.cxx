@@ -0,0 +1,705 @@
+/**************************************************************
+ *
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ *
+ *************************************************************/
+
+
+#include "pyuno_impl.hxx"
+
+#include <rtl/strbuf.hxx>
+
+#include <com/sun/star/beans/PropertyValue.hpp>
+#include <com/sun/star/beans/XPropertySet.hpp>
+#include <com/sun/star/beans/XMultiPropertySet.hpp>
+#include <com/sun/star/beans/XFastPropertySet.hpp>
+#include <com/sun/star/beans/UnknownPropertyException.hpp>
+#include <com/sun/star/beans/PropertyVetoException.hpp>
+#include <com/sun/star/lang/WrappedTargetException.hpp>
+#include <com/sun/star/reflection/InvocationTargetException.hpp>
+
+#include <algorithm>
+#include <vector>
+
+using rtl::OUString;
+using rtl::OStringBuffer;
+using com::sun::star::uno::Any;
+using com::sun::star::uno::makeAny;
+using com::sun::star::uno::Sequence;
+using com::sun::star::uno::Reference;
+using com::sun::star::uno::XInterface;
+using com::sun::star::uno::UNO_QUERY;
+using com::sun::star::uno::Type;
+using com::sun::star::uno::RuntimeException;
+using com::sun::star::beans::Property;
+using com::sun::star::beans::PropertyValue;
+using com::sun::star::beans::XPropertySet;
+using com::sun::star::beans::XPropertySetInfo;
+using com::sun::star::beans::XMultiPropertySet;
+using com::sun::star::beans::XFastPropertySet;
+using com::sun::star::beans::UnknownPropertyException;
+using com::sun::star::script::XInvocation2;
+using com::sun::star::reflection::InvocationTargetException;
+
+namespace pyuno
+{
+
+// the property set infos of objects created on the fly would pile up otherwise
+static const size_t PROPERTY_TABLE_CACHE_SIZE = 64;
+
+namespace {
+
+struct PropertyEntry
+{
+    OUString name;
+    // the python string given for the name, held by the caller
+    PyObject *pyName;
+    Any value;
+
+    bool operator < ( const PropertyEntry &other ) const { return name < other.name; }
+};
+
+}
+
+typedef std::vector< PropertyEntry > PropertyEntries;
+
+static PyUNO *getPyUNO( PyObject *object, const char *function )
+{
+    if( PyObject_IsInstance( object, getPyUnoClass().get() ) )
+        return (PyUNO *) object;
+    OStringBuffer buf;
+    buf.append( "uno." );
+    buf.append( function );
+    buf.append( " expects an UNO object as 1st argument" );
+    PyErr_SetString( PyExc_TypeError, buf.getStr() );
+    return 0;
+}
+
+static bool appendEntry(
+    PropertyEntries &entries, PyObject *name, RuntimeCargo *cargo, const char *function )
+{
+    if( ! PYSTR_CHECK( name ) && ! PyUnicode_Check( name ) )
+    {
+        OStringBuffer buf;
+        buf.append( "uno." );
+        buf.append( function );
+        buf.append( " expects strings as property names" );
+        PyErr_SetString( PyExc_TypeError, buf.getStr() );
+        return false;
+    }
+    PropertyEntry entry;
+    entry.name = pyString2ustring( name, cargo );
+    entry.pyName = name;
+    entries.push_back( entry );
+    return true;
+}
+
+static Sequence< OUString > getNames( const PropertyEntries &entries )
+{
+    Sequence< OUString > names( (sal_Int32) entries.size() );
+    OUString *pNames = names.getArray();
+    for( size_t i = 0; i < entries.size(); ++i )
+        pNames[i] = entries[i].name;
+    return names;
+}
+
+static PropertyTable &getPropertyTable(
+    RuntimeCargo *cargo, const Reference< XPropertySetInfo > &xInfo )
+{
+    PropertyTableMap &tables = cargo->propertyTables;
+    PropertyTableMap::iterator ii = tables.find( xInfo.get() );
+    if( ii == tables.end() )
+    {
+        if( tables.size() >= PROPERTY_TABLE_CACHE_SIZE )
+        {
+            PropertyTableMap dropped;
+            dropped.swap( tables );
+            PyThreadDetach antiguard;
+            dropped.clear();
+        }
+        ii = tables.insert( PropertyTableMap::value_type( xInfo.get(), PropertyTable() ) ).first;
+        ii->second.info = xInfo;
+    }
+    return ii->second;
+}
+
+/** returns the properties of the entries, the ones not in the table of the
+    property set info yet are looked up without the global interpreter lock
+ */
+static void lookupProperties(
+    RuntimeCargo *cargo, const Reference< XPropertySetInfo > &xInfo,
+    const PropertyEntries &entries, std::vector< Property > &rProperties )
+    throw ( UnknownPropertyException, RuntimeException )
+{
+    rProperties.resize( entries.size() );
+    std::vector< size_t > missing;
+    {
+        const PropertyMap &properties = getPropertyTable( cargo, xInfo ).properties;
+        for( size_t i = 0; i < entries.size(); ++i )
+        {
+            PropertyMap::const_iterator ii = properties.find( entries[i].name );
+            if( ii == properties.end() )
+                missing.push_back( i );
+            else
+                rProperties[i] = ii->second;
+        }
+    }
+    if( missing.empty() )
+        return;
+
+    {
+        PyThreadDetach antiguard;
+        for( size_t i = 0; i < missing.size(); ++i )
+            rProperties[ missing[i] ] = xInfo->getPropertyByName( entries[ missing[i] ].name );
+    }
+    // the table may have been dropped while the lock was released
+    PropertyMap &properties = getPropertyTable( cargo, xInfo ).properties;
+    for( size_t i = 0; i < missing.size(); ++i )
+        properties[ entries[ missing[i] ].name ] = rProperties[ missing[i] ];
+}
+
+PyObject *PyUNO_getProperties( PyObject *object, PyObject *names )
+{
+    PyRef ret;
+    try
+    {
+        Runtime runtime;
+        RuntimeCargo *cargo = runtime.getImpl()->cargo;
+        PyUNO *me = getPyUNO( object, "getProperties" );
+        if( ! me )
+            return 0;
+        PyRef nameTuple( PySequence_Tuple( names ), SAL_NO_ACQUIRE );
+        if( ! nameTuple.is() )
+            return 0;
+        PropertyEntries entries;
+        for( Py_ssize_t i = 0; i < PyTuple_GET_SIZE( nameTuple.get() ); ++i )
+        {
+            if( ! appendEntry( entries, PyTuple_GET_ITEM( nameTuple.get(), i ), cargo, "getProperties" ) )
+                return 0;
+        }
+        // XMultiPropertySet expects the names sorted
+        std::sort( entries.begin(), entries.end() );
+
+        Reference< XInterface > xObject;
+        me->members->wrappedObject >>= xObject;
+        Reference< XMultiPropertySet > xMulti;
+        Reference< XPropertySet > xSet;
+        Reference< XFastPropertySet > xFast;
+        Reference< XPropertySetInfo > xInfo;
+        {
+            PyThreadDetach antiguard;
+            xMulti.set( xObject, UNO_QUERY );
+            if( xMulti.is() )
+            {
+                xInfo = xMulti->getPropertySetInfo();
+            }
+            else
+            {
+                xSet.set( xObject, UNO_QUERY );
+                xFast.set( xObject, UNO_QUERY );
+                if( xSet.is() && xFast.is() )
+                    xInfo = xSet->getPropertySetInfo();
+            }
+        }
+
+        if( xMulti.is() )
+        {
+            // getPropertyValues() skips unknown names, the property set info
+            // raises the UnknownPropertyException for them
+            if( xInfo.is() )
+            {
+                std::vector< Property > properties;
+                lookupProperties( cargo, xInfo, entries, properties );
+            }
+            PyThreadDetach antiguard;
+            Sequence< Any > values = xMulti->getPropertyValues( getNames( entries ) );
+            for( sal_Int32 i = 0; i < values.getLength() && i < (sal_Int32) entries.size(); ++i )
+                entries[i].value = values[i];
+        }
+        else if( xInfo.is() )
+        {
+            std::vector< Property > properties;
+            lookupProperties( cargo, xInfo, entries, properties );
+            PyThreadDetach antiguard;
+            for( size_t i = 0; i < entries.size(); ++i )
+            {
+                if( properties[i].Handle != -1 )
+                    entries[i].value = xFast->getFastPropertyValue( properties[i].Handle );
+                else
+                    entries[i].value = xSet->getPropertyValue( entries[i].name );
+            }
+        }
+        else
+        {
+            Reference< XInvocation2 > xInvocation( PyUNO_getInvocation( me ) );
+            PyThreadDetach antiguard;
+            for( size_t i = 0; i < entries.size(); ++i )
+                entries[i].value = xInvocation->getValue( entries[i].name );
+        }
+
+        PyRef dict( PyDict_New(), SAL_NO_ACQUIRE );
+        for( size_t i = 0; i < entries.size(); ++i )
+        {
+            PyRef value = runtime.any2PyObject( entries[i].value );
+            PyDict_SetItem( dict.get(), entries[i].pyName, value.get() );
+        }
+        ret = dict;
+    }
+    catch( InvocationTargetException & e )
+    {
+        raisePyExceptionWithAny( e.TargetException );
+    }
+    catch( UnknownPropertyException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    catch( com::sun::star::lang::WrappedTargetException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    catch( com::sun::star::lang::IllegalArgumentException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    catch( com::sun::star::script::CannotConvertException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    catch( RuntimeException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    return ret.getAcquired();
+}
+
+PyObject *PyUNO_setProperties( PyObject *object, PyObject *values )
+{
+    try
+    {
+        Runtime runtime;
+        RuntimeCargo *cargo = runtime.getImpl()->cargo;
+        PyUNO *me = getPyUNO( object, "setProperties" );
+        if( ! me )
+            return 0;
+        PyRef items( PyMapping_Items( values ), SAL_NO_ACQUIRE );
+        if( ! items.is() )
+            return 0;
+        PyRef itemTuple( PySequence_Tuple( items.get() ), SAL_NO_ACQUIRE );
+        if( ! itemTuple.is() )
+            return 0;
+        PropertyEntries entries;
+        for( Py_ssize_t i = 0; i < PyTuple_GET_SIZE( itemTuple.get() ); ++i )
+        {
+            PyObject *item = PyTuple_GET_ITEM( itemTuple.get(), i );
+            if( ! PyTuple_Check( item ) || PyTuple_GET_SIZE( item ) != 2 )
+            {
+                PyErr_SetString( PyExc_TypeError, "uno.setProperties expects a mapping of property names to values" );
+                return 0;
+            }
+            if( ! appendEntry( entries, PyTuple_GetItem( item, 0 ), cargo, "setProperties" ) )
+                return 0;
+            entries.back().value = runtime.pyObject2Any( PyTuple_GetItem( item, 1 ) );
+        }
+        // XMultiPropertySet expects the names sorted
+        std::sort( entries.begin(), entries.end() );
+
+        Reference< XInterface > xObject;
+        me->members->wrappedObject >>= xObject;
+        Reference< XMultiPropertySet > xMulti;
+        Reference< XPropertySet > xSet;
+        Reference< XFastPropertySet > xFast;
+        Reference< XPropertySetInfo > xInfo;
+        {
+            PyThreadDetach antiguard;
+            xMulti.set( xObject, UNO_QUERY );
+            if( xMulti.is() )
+            {
+                xInfo = xMulti->getPropertySetInfo();
+            }
+            else
+            {
+                xSet.set( xObject, UNO_QUERY );
+                xFast.set( xObject, UNO_QUERY );
+                if( xSet.is() )
+                    xInfo = xSet->getPropertySetInfo();
+            }
+        }
+
+        if( xInfo.is() )
+        {
+            std::vector< Property > properties;
+            lookupProperties( cargo, xInfo, entries, properties );
+            PyThreadDetach antiguard;
+            // the values get the types of the properties, as the invocation would do
+            for( size_t i = 0; i < entries.size(); ++i )
+            {
+                const Type &type = properties[i].Type;
+                Any &value = entries[i].value;
+                if( value.hasValue() &&
+                    type.getTypeClass() != com::sun::star::uno::TypeClass_ANY &&
+                    ! type.isAssignableFrom( value.getValueType() ) )
+                {
+                    value = cargo->xTypeConverter->convertTo( value, type );
+                }
+            }
+            if( xMulti.is() )
+            {
+                Sequence< Any > anyValues( (sal_Int32) entries.size() );
+                Any *pValues = anyValues.getArray();
+                for( size_t i = 0; i < entries.size(); ++i )
+                    pValues[i] = entries[i].value;
+                xMulti->setPropertyValues( getNames( entries ), anyValues );
+            }
+            else
+            {
+                for( size_t i = 0; i < entries.size(); ++i )
+                {
+                    if( xFast.is() && properties[i].Handle != -1 )
+                        xFast->setFastPropertyValue( properties[i].Handle, entries[i].value );
+                    else
+                        xSet->setPropertyValue( entries[i].name, entries[i].value );
+                }
+            }
+        }
+        else
+        {
+            Reference< XInvocation2 > xInvocation( PyUNO_getInvocation( me ) );
+            PyThreadDetach antiguard;
+            for( size_t i = 0; i < entries.size(); ++i )
+                xInvocation->setValue( entries[i].name, entries[i].value );
+        }
+        Py_INCREF( Py_None );
+        return Py_None;
+    }
+    catch( InvocationTargetException & e )
+    {
+        raisePyExceptionWithAny( e.TargetException );
+    }
+    catch( UnknownPropertyException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    catch( com::sun::star::beans::PropertyVetoException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    catch( com::sun::star::lang::WrappedTargetException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    catch( com::sun::star::lang::IllegalArgumentException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    catch( com::sun::star::script::CannotConvertException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    catch( RuntimeException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    return 0;
+}
+
+/** holds a Sequence< PropertyValue > built by uno.props, which is passed to
+    uno as it is. Elements are converted to structs only when accessed.
+ */
+typedef struct
+{
+    Sequence< PropertyValue > values;
+} PyUNO_PropertyValues_Internals;
+
+typedef struct
+{
+    PyObject_HEAD
+    PyUNO_PropertyValues_Internals *members;
+} PyUNO_PropertyValues;
+
+static void PyUNO_PropertyValues_del( PyObject *self )
+{
+    delete ((PyUNO_PropertyValues *) self)->members;
+    Py_TYPE( self )->tp_free( self );
+}
+
+static Py_ssize_t PyUNO_PropertyValues_len( PyObject *self )
+{
+    return ((PyUNO_PropertyValues *) self)->members->values.getLength();
+}
+
+static PyObject *PyUNO_PropertyValues_item( PyObject *self, Py_ssize_t index )
+{
+    const Sequence< PropertyValue > &values = ((PyUNO_PropertyValues *) self)->members->values;
+    if( index < 0 || index >= values.getLength() )
+    {
+        PyErr_SetString( PyExc_IndexError, "PropertyValues index out of range" );
+        return NULL;
+    }
+    PyRef ret;
+    try
+    {
+        Runtime runtime;
+        ret = runtime.any2PyObject( makeAny( values[index] ) );
+    }
+    catch( com::sun::star::lang::IllegalArgumentException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    catch( com::sun::star::script::CannotConvertException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    catch( RuntimeException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    return ret.getAcquired();
+}
+
+static PyObject *PyUNO_PropertyValues_repr( PyObject *self )
+{
+    const Sequence< PropertyValue > &values = ((PyUNO_PropertyValues *) self)->members->values;
+    rtl::OUStringBuffer buf;
+    buf.appendAscii( "<PropertyValues instance (" );
+    for( sal_Int32 i = 0; i < values.getLength(); ++i )
+    {
+        if( i )
+            buf.appendAscii( ", " );
+        buf.append( values[i].Name );
+    }
+    buf.appendAscii( ")>" );
+    return USTR_TO_PYSTR( buf.makeStringAndClear() ).getAcquired();
+}
+
+static PySequenceMethods PyUNO_PropertyValues_SequenceMethods =
+{
+    (lenfunc) PyUNO_PropertyValues_len,
+    (binaryfunc) 0,
+    (ssizeargfunc) 0,
+    (ssizeargfunc) PyUNO_PropertyValues_item,
+    0,
+    (ssizeobjargproc) 0,
+    0,
+    (objobjproc) 0,
+    (binaryfunc) 0,
+    (ssizeargfunc) 0
+};
+
+PyTypeObject PyUNO_PropertyValues_Type =
+{
+    PyVarObject_HEAD_INIT(&PyType_Type, 0)
+    const_cast< char * >("pyuno.PropertyValues"),
+    sizeof (PyUNO_PropertyValues),
+    0,
+    (destructor) PyUNO_PropertyValues_del,
+    (printfunc) 0,
+    (getattrfunc) 0,
+    (setattrfunc) 0,
+#if PY_MAJOR_VERSION >= 3
+    0,
+#else
+    (cmpfunc) 0,
+#endif
+    (reprfunc) PyUNO_PropertyValues_repr,
+    0,
+    &PyUNO_PropertyValues_SequenceMethods,
+    0,
+    (hashfunc) 0,
+    (ternaryfunc) 0,
+    (reprfunc) 0,
+    (getattrofunc)0,
+    (setattrofunc)0,
+    NULL,
+    Py_TPFLAGS_DEFAULT,
+    NULL,
+    (traverseproc)0,
+    (inquiry)0,
+    (richcmpfunc)0,
+    0,
+    (getiterfunc)0,
+    (iternextfunc)0,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    (descrgetfunc)0,
+    (descrsetfunc)0,
+    0,
+    (initproc)0,
+    (allocfunc) PyType_GenericAlloc,
+    (newfunc)0,
+    (freefunc) PyObject_Del,
+    (inquiry)0,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    (destructor)0
+#if PY_VERSION_HEX >= 0x02060000
+    , 0
+#endif
+};
+
+Sequence< PropertyValue > PyPropertyValues2Sequence( PyObject *o )
+{
+    return ((PyUNO_PropertyValues *) o)->members->values;
+}
+
+static bool appendPropertyValue(
+    std::vector< PropertyValue > &values, PyObject *name, PyObject *value,
+    const Runtime &runtime )
+    throw ( com::sun::star::script::CannotConvertException,
+            com::sun::star::lang::IllegalArgumentException,
+            RuntimeException )
+{
+    if( ! PYSTR_CHECK( name ) && ! PyUnicode_Check( name ) )
+    {
+        PyErr_SetString( PyExc_TypeError, "uno.props expects strings as property names" );
+        return false;
+    }
+    PropertyValue propertyValue;
+    propertyValue.Name = pyString2ustring( name, runtime.getImpl()->cargo );
+    propertyValue.Value = runtime.pyObject2Any( value, ACCEPT_UNO_ANY );
+    values.push_back( propertyValue );
+    return true;
+}
+
+PyObject *PyUNO_props( PyObject *args, PyObject *kwds )
+{
+    try
+    {
+        Runtime runtime;
+        std::vector< PropertyValue > values;
+        if( PyTuple_Size( args ) > 1 )
+        {
+            PyErr_SetString( PyExc_TypeError, "uno.props expects at most one mapping as positional argument" );
+            return NULL;
+        }
+        if( PyTuple_Size( args ) == 1 )
+        {
+            PyRef items( PyMapping_Items( PyTuple_GetItem( args, 0 ) ), SAL_NO_ACQUIRE );
+            if( ! items.is() )
+                return NULL;
+            PyRef itemTuple( PySequence_Tuple( items.get() ), SAL_NO_ACQUIRE );
+            if( ! itemTuple.is() )
+                return NULL;
+            for( Py_ssize_t i = 0; i < PyTuple_GET_SIZE( itemTuple.get() ); ++i )
+            {
+                PyObject *item = PyTuple_GET_ITEM( itemTuple.get(), i );
+                if( ! PyTuple_Check( item ) || PyTuple_GET_SIZE( item ) != 2 )
+                {
+                    PyErr_SetString( PyExc_TypeError, "uno.props expects a mapping of property names to values" );
+                    return NULL;
+                }
+                if( ! appendPropertyValue(
+                        values, PyTuple_GET_ITEM( item, 0 ), PyTuple_GET_ITEM( item, 1 ), runtime ) )
+                    return NULL;
+            }
+        }
+        if( kwds )
+        {
+            // the keywords keep their order from python 3.6 on
+            PyObject *name;
+            PyObject *value;
+            Py_ssize_t pos = 0;
+            while( PyDict_Next( kwds, &pos, &name, &value ) )
+            {
+                if( ! appendPropertyValue( values, name, value, runtime ) )
+                    return NULL;
+            }
+        }
+
+        PyUNO_PropertyValues *self = (PyUNO_PropertyValues *)
+            PyUNO_PropertyValues_Type.tp_alloc( &PyUNO_PropertyValues_Type, 0 );
+        if( ! self )
+            return NULL;
+        self->members = new PyUNO_PropertyValues_Internals;
+        if( ! values.empty() )
+            self->members->values = Sequence< PropertyValue >( &values[0], (sal_Int32) values.size() );
+        return (PyObject *) self;
+    }
+    catch( com::sun::star::lang::IllegalArgumentException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    catch( com::sun::star::script::CannotConvertException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    catch( RuntimeException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    return NULL;
+}
+
+PyObject *PyUNO_propsToDict( PyObject *sequence )
+{
+    PyRef ret;
+    try
+    {
+        Runtime runtime;
+        RuntimeCargo *cargo = runtime.getImpl()->cargo;
+        Sequence< PropertyValue > values;
+        if( PyObject_TypeCheck( sequence, &PyUNO_PropertyValues_Type ) )
+        {
+            values = PyPropertyValues2Sequence( sequence );
+        }
+        else
+        {
+            // tuples of PropertyValue structs, as returned by uno
+            Any a = runtime.pyObject2Any( sequence );
+            if( ! ( a >>= values ) )
+            {
+                Any converted;
+                {
+                    PyThreadDetach antiguard;
+                    converted = cargo->xTypeConverter->convertTo(
+                        a, getCppuType( (Sequence< PropertyValue > *) 0 ) );
+                }
+                converted >>= values;
+            }
+        }
+
+        PyRef dict( PyDict_New(), SAL_NO_ACQUIRE );
+        for( sal_Int32 i = 0; i < values.getLength(); ++i )
+        {
+            PyRef name = ustring2PyUnicode( values[i].Name, cargo );
+            PyRef value = runtime.any2PyObject( values[i].Value );
+            PyDict_SetItem( dict.get(), name.get(), value.get() );
+        }
+        ret = dict;
+    }
+    catch( com::sun::star::lang::IllegalArgumentException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    catch( com::sun::star::script::CannotConvertException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    catch( RuntimeException & e )
+    {
+        raisePyExceptionWithAny( makeAny( e ) );
+    }
+    return ret.getAcquired();
+}
+
+}
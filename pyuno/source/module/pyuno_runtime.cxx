@@ -24,14 +24,18 @@
 #include "pyuno_impl.hxx"
 
 #include <osl/thread.h>
+#include <osl/mutex.hxx>
 #include <osl/module.h>
 #include <osl/process.h>
 #include <rtl/strbuf.hxx>
 #include <rtl/ustrbuf.hxx>
 #include <rtl/bootstrap.hxx>
 #include <locale.h>
+#include <stdlib.h>
+#include <string.h>
 
 #include <typelib/typedescription.hxx>
+#include <uno/lbnames.h>
 
 #include <com/sun/star/beans/XMaterialHolder.hpp>
 
@@ -47,6 +51,7 @@ using com::sun::star::uno::Reference;
 using com::sun::star::uno::XInterface;
 using com::sun::star::uno::Any;
 using com::sun::star::uno::TypeDescription;
+using com::sun::star::uno::Mapping;
 using com::sun::star::uno::Sequence;
 using com::sun::star::uno::Type;
 using com::sun::star::uno::UNO_QUERY;
@@ -146,6 +151,32 @@ static void getRuntimeImpl( PyRef & globalDict, PyRef &runtimeImpl )
     runtimeImpl = PyDict_GetItemString( globalDict.get() , "pyuno_runtime" );
 }
 
+// the runtime found last and its interpreter. The runtime is not held, its
+// destructor resets the pointer and Runtime::initialize() replaces it.
+static PyInterpreterState *g_pRuntimeInterpreter = 0;
+static PyObject *g_pRuntimeImpl = 0;
+
+static void setCachedRuntimeImpl( PyObject *runtimeImpl )
+{
+    g_pRuntimeInterpreter = runtimeImpl ? PyThreadState_Get()->interp : 0;
+    g_pRuntimeImpl = runtimeImpl;
+}
+
+/** returns the runtime of the current interpreter without looking it up in
+    the __main__ module again, as long as the interpreter stays the same.
+    The global interpreter lock must be held.
+ */
+static RuntimeImpl *getCachedRuntimeImpl() throw ( com::sun::star::uno::RuntimeException )
+{
+    if( g_pRuntimeImpl && PyThreadState_Get()->interp == g_pRuntimeInterpreter )
+        return reinterpret_cast< RuntimeImpl * >( g_pRuntimeImpl );
+
+    PyRef globalDict, runtime;
+    getRuntimeImpl( globalDict , runtime );
+    setCachedRuntimeImpl( runtime.get() );
+    return reinterpret_cast< RuntimeImpl * >( runtime.get() );
+}
+
 static PyRef importUnoModule( ) throw ( RuntimeException )
 {
     PyRef globalDict = PyRef( PyModule_GetDict(PyImport_AddModule(const_cast< char * >("__main__"))));
@@ -169,17 +200,22 @@ static PyRef importUnoModule( ) throw ( RuntimeException )
     return dict;
 }
 
-static void readLoggingConfig( sal_Int32 *pLevel, FILE **ppFile )
+static OUString getConfigFileName()
 {
-    *pLevel = LogLevel::NONE;
-    *ppFile = 0;
     OUString fileName;
     osl_getModuleURLFromFunctionAddress(
-        reinterpret_cast< oslGenericFunction >(readLoggingConfig),
+        reinterpret_cast< oslGenericFunction >(getConfigFileName),
         (rtl_uString **) &fileName );
     fileName = OUString( fileName.getStr(), fileName.lastIndexOf( '/' )+1 );
     fileName += OUString::createFromAscii(  SAL_CONFIGFILE("pyuno") );
-    rtl::Bootstrap bootstrapHandle( fileName );
+    return fileName;
+}
+
+static void readLoggingConfig( sal_Int32 *pLevel, FILE **ppFile )
+{
+    *pLevel = LogLevel::NONE;
+    *ppFile = 0;
+    rtl::Bootstrap bootstrapHandle( getConfigFileName() );
 
     OUString str;
     if( bootstrapHandle.getFrom( USTR_ASCII( "PYUNO_LOGLEVEL" ), str ) )
@@ -233,6 +269,14 @@ static void readLoggingConfig( sal_Int32 *pLevel, FILE **ppFile )
     }
 }
 
+static void readStringCacheConfig( StringCache *pCache )
+{
+    rtl::Bootstrap bootstrapHandle( getConfigFileName() );
+    OUString str;
+    if( bootstrapHandle.getFrom( USTR_ASCII( "PYUNO_STRINGCACHE_SIZE" ), str ) )
+        pCache->setCapacity( str.toInt32() );
+}
+
 /*-------------------------------------------------------------------
  RuntimeImpl implementations
  *-------------------------------------------------------------------*/
@@ -249,6 +293,7 @@ PyRef stRuntimeImpl::create( const Reference< XComponentContext > &ctx )
     // makes C++ unusable
     RuntimeCargo *c = new RuntimeCargo();
     readLoggingConfig( &(c->logLevel) , &(c->logFile) );
+    readStringCacheConfig( &(c->stringCache) );
     log( c, LogLevel::CALL, "Instantiating pyuno bridge" );
     
     c->valid = 1;
@@ -310,6 +355,14 @@ PyRef stRuntimeImpl::create( const Reference< XComponentContext > &ctx )
         throw RuntimeException(
             OUString( RTL_CONSTASCII_USTRINGPARAM( "pyuno: couldn't retrieve typedescriptionmanager" )),
             Reference< XInterface > () );
+
+    // without the mappings, all methods are called through the invocation
+    c->cpp2uno = Mapping(
+        OUString( RTL_CONSTASCII_USTRINGPARAM( CPPU_CURRENT_LANGUAGE_BINDING_NAME ) ),
+        OUString( RTL_CONSTASCII_USTRINGPARAM( UNO_LB_UNO ) ) );
+    c->uno2cpp = Mapping(
+        OUString( RTL_CONSTASCII_USTRINGPARAM( UNO_LB_UNO ) ),
+        OUString( RTL_CONSTASCII_USTRINGPARAM( CPPU_CURRENT_LANGUAGE_BINDING_NAME ) ) );
             
     me->cargo =c;
     return PyRef( reinterpret_cast< PyObject * > ( me ), SAL_NO_ACQUIRE );
@@ -318,6 +371,8 @@ PyRef stRuntimeImpl::create( const Reference< XComponentContext > &ctx )
 void  stRuntimeImpl::del(PyObject* self)
 {
     RuntimeImpl *me = reinterpret_cast< RuntimeImpl * > ( self );
+    if( g_pRuntimeImpl == self )
+        setCachedRuntimeImpl( 0 );
     if( me->cargo->logFile )
         fclose( me->cargo->logFile );
     delete me->cargo;
@@ -328,6 +383,8 @@ void  stRuntimeImpl::del(PyObject* self)
 void Runtime::initialize( const Reference< XComponentContext > & ctx )
     throw ( RuntimeException )
 {
+    // the runtime is replaced below
+    setCachedRuntimeImpl( 0 );
     PyRef globalDict, runtime;
     getRuntimeImpl( globalDict , runtime );
     RuntimeImpl *impl = reinterpret_cast< RuntimeImpl * > (runtime.get());
@@ -341,23 +398,20 @@ void Runtime::initialize( const Reference< XComponentContext > & ctx )
     PyRef keep( RuntimeImpl::create( ctx ) );
     PyDict_SetItemString( globalDict.get(), "pyuno_runtime" , keep.get() );
     Py_XINCREF( keep.get() );
+    setCachedRuntimeImpl( keep.get() );
 }
 
 
 bool Runtime::isInitialized() throw ( RuntimeException )
 {
-    PyRef globalDict, runtime;
-    getRuntimeImpl( globalDict , runtime );
-    RuntimeImpl *impl = reinterpret_cast< RuntimeImpl * > (runtime.get());
-    return runtime.is() && impl->cargo->valid;
+    RuntimeImpl *impl = getCachedRuntimeImpl();
+    return impl && impl->cargo->valid;
 }
 
 void Runtime::finalize() throw (RuntimeException)
 {
-    PyRef globalDict, runtime;
-    getRuntimeImpl( globalDict , runtime );
-    RuntimeImpl *impl = reinterpret_cast< RuntimeImpl * > (runtime.get());
-    if( !runtime.is() || ! impl->cargo->valid )
+    RuntimeImpl *impl = getCachedRuntimeImpl();
+    if( ! impl || ! impl->cargo->valid )
     {
         throw RuntimeException( OUString( RTL_CONSTASCII_USTRINGPARAM(
             "pyuno bridge must have been initialized before finalizing" )),
@@ -372,17 +426,16 @@ void Runtime::finalize() throw (RuntimeException)
 Runtime::Runtime() throw(  RuntimeException )
     : impl( 0 )
 {
-    PyRef globalDict, runtime;
-    getRuntimeImpl( globalDict , runtime );
-    if( ! runtime.is() )
+    RuntimeImpl *runtime = getCachedRuntimeImpl();
+    if( ! runtime )
     {
         throw RuntimeException(
             OUString( RTL_CONSTASCII_USTRINGPARAM("pyuno runtime is not initialized, "
                                                   "(the pyuno.bootstrap needs to be called before using any uno classes)")),
             Reference< XInterface > () );
     }
-    impl = reinterpret_cast< RuntimeImpl * > (runtime.get());
-    Py_XINCREF( runtime.get() );
+    impl = runtime;
+    Py_XINCREF( reinterpret_cast< PyObject * >( impl ) );
 }
 
 Runtime::Runtime( const Runtime & r )
@@ -405,6 +458,193 @@ Runtime & Runtime::operator = ( const Runtime & r )
     return *this;
 }
 
+/** fills a new tuple with the elements of a sequence buffer. Elements of simple
+    types are converted in place, rows of a matrix (sequences of sequences)
+    are converted without creating an Any per row and the common cell values of
+    sequence< any > (double, string, void) are converted directly. All other
+    elements are handed to any2PyObject one by one.
+ */
+static void fillPyTuple(
+    PyObject *pTuple, const uno_Sequence *pSeq,
+    typelib_TypeDescriptionReference *pElementTypeRef, sal_Int32 nElementSize,
+    const Runtime &r )
+    throw ( com::sun::star::script::CannotConvertException,
+            com::sun::star::lang::IllegalArgumentException,
+            RuntimeException )
+{
+    const sal_Int32 nElements = pSeq->nElements;
+    const char *pElements = pSeq->elements;
+    sal_Int32 i = 0;
+
+    switch( pElementTypeRef->eTypeClass )
+    {
+    case typelib_TypeClass_BOOLEAN:
+        for( i = 0; i < nElements; i ++ )
+        {
+            PyObject *b = ((const sal_Bool *) pElements)[i] ? Py_True : Py_False;
+            Py_INCREF( b );
+            PyTuple_SET_ITEM( pTuple, i, b );
+        }
+        return;
+    case typelib_TypeClass_SHORT:
+        for( i = 0; i < nElements; i ++ )
+        {
+#if PY_MAJOR_VERSION >= 3
+            PyTuple_SET_ITEM( pTuple, i, PyLong_FromLong( ((const sal_Int16 *) pElements)[i] ) );
+#else
+            PyTuple_SET_ITEM( pTuple, i, PyInt_FromLong( ((const sal_Int16 *) pElements)[i] ) );
+#endif
+        }
+        return;
+    case typelib_TypeClass_UNSIGNED_SHORT:
+        for( i = 0; i < nElements; i ++ )
+        {
+#if PY_MAJOR_VERSION >= 3
+            PyTuple_SET_ITEM( pTuple, i, PyLong_FromLong( ((const sal_uInt16 *) pElements)[i] ) );
+#else
+            PyTuple_SET_ITEM( pTuple, i, PyInt_FromLong( ((const sal_uInt16 *) pElements)[i] ) );
+#endif
+        }
+        return;
+    case typelib_TypeClass_LONG:
+        for( i = 0; i < nElements; i ++ )
+        {
+#if PY_MAJOR_VERSION >= 3
+            PyTuple_SET_ITEM( pTuple, i, PyLong_FromLong( ((const sal_Int32 *) pElements)[i] ) );
+#else
+            PyTuple_SET_ITEM( pTuple, i, PyInt_FromLong( ((const sal_Int32 *) pElements)[i] ) );
+#endif
+        }
+        return;
+    case typelib_TypeClass_UNSIGNED_LONG:
+        for( i = 0; i < nElements; i ++ )
+            PyTuple_SET_ITEM( pTuple, i, PyLong_FromUnsignedLong( ((const sal_uInt32 *) pElements)[i] ) );
+        return;
+    case typelib_TypeClass_HYPER:
+        for( i = 0; i < nElements; i ++ )
+            PyTuple_SET_ITEM( pTuple, i, PyLong_FromLongLong( ((const sal_Int64 *) pElements)[i] ) );
+        return;
+    case typelib_TypeClass_UNSIGNED_HYPER:
+        for( i = 0; i < nElements; i ++ )
+            PyTuple_SET_ITEM( pTuple, i, PyLong_FromUnsignedLongLong( ((const sal_uInt64 *) pElements)[i] ) );
+        return;
+    case typelib_TypeClass_FLOAT:
+        for( i = 0; i < nElements; i ++ )
+            PyTuple_SET_ITEM( pTuple, i, PyFloat_FromDouble( ((const float *) pElements)[i] ) );
+        return;
+    case typelib_TypeClass_DOUBLE:
+        for( i = 0; i < nElements; i ++ )
+            PyTuple_SET_ITEM( pTuple, i, PyFloat_FromDouble( ((const double *) pElements)[i] ) );
+        return;
+    case typelib_TypeClass_STRING:
+    {
+        RuntimeCargo *cargo = r.getImpl()->cargo;
+        for( i = 0; i < nElements; i ++ )
+            PyTuple_SET_ITEM( pTuple, i,
+                              ustring2PyUnicode( ((const OUString *) pElements)[i], cargo ).getAcquired() );
+        return;
+    }
+    default:
+        break;
+    }
+
+    try
+    {
+        if( typelib_TypeClass_ENUM == pElementTypeRef->eTypeClass )
+        {
+            const EnumTable &table = getEnumTable( pElementTypeRef, r );
+            for( i = 0; i < nElements; i ++ )
+            {
+                PyTuple_SET_ITEM( pTuple, i,
+                                  getPyEnum( table, ((const sal_Int32 *) pElements)[i] ).getAcquired() );
+            }
+            return;
+        }
+        if( typelib_TypeClass_SEQUENCE == pElementTypeRef->eTypeClass )
+        {
+            TypeDescription desc( pElementTypeRef );
+            typelib_TypeDescriptionReference *pRowElementTypeRef =
+                desc.is() ? ((typelib_IndirectTypeDescription *) desc.get())->pType : 0;
+            TypeDescription rowElementDesc( pRowElementTypeRef );
+            // byte sequences are converted into ByteSequence instances
+            if( rowElementDesc.is() && typelib_TypeClass_BYTE != pRowElementTypeRef->eTypeClass )
+            {
+                for( i = 0; i < nElements; i ++ )
+                {
+                    const uno_Sequence *pRow = ((const uno_Sequence * const *) pElements)[i];
+                    PyRef row( PyTuple_New( pRow->nElements ), SAL_NO_ACQUIRE );
+                    fillPyTuple( row.get(), pRow, pRowElementTypeRef,
+                                 rowElementDesc.get()->nSize, r );
+                    PyTuple_SET_ITEM( pTuple, i, row.getAcquired() );
+                }
+                return;
+            }
+        }
+
+        for( i = 0; i < nElements; i ++ )
+        {
+            const void *pElement = pElements + i * nElementSize;
+            PyRef element;
+            if( typelib_TypeClass_ANY == pElementTypeRef->eTypeClass )
+            {
+                const Any &cell = *(const Any *) pElement;
+                switch( cell.getValueTypeClass() )
+                {
+                case typelib_TypeClass_DOUBLE:
+                    element = PyRef( PyFloat_FromDouble( *(const double *) cell.getValue() ), SAL_NO_ACQUIRE );
+                    break;
+                case typelib_TypeClass_STRING:
+                    element = ustring2PyUnicode( *(const OUString *) cell.getValue(), r.getImpl()->cargo );
+                    break;
+                case typelib_TypeClass_VOID:
+                    element = Py_None;
+                    break;
+                default:
+                    element = r.any2PyObject( cell );
+                }
+            }
+            else
+                element = r.any2PyObject( Any( pElement, pElementTypeRef ) );
+            OSL_ASSERT( element.is() );
+            PyTuple_SET_ITEM( pTuple, i, element.getAcquired() );
+        }
+    }
+    catch( com::sun::star::uno::Exception & )
+    {
+        for( ; i < nElements ; i ++ )
+        {
+            Py_INCREF( Py_None );
+            PyTuple_SET_ITEM( pTuple, i, Py_None );
+        }
+        throw;
+    }
+}
+
+/** converts a sequence into a tuple by walking the sequence buffer along the
+    element type description.
+
+    @return an empty reference, when the type description is not available
+ */
+static PyRef sequence2PyTuple( const Any &a, const Runtime &r )
+    throw ( com::sun::star::script::CannotConvertException,
+            com::sun::star::lang::IllegalArgumentException,
+            RuntimeException )
+{
+    TypeDescription desc( a.getValueTypeRef() );
+    if( ! desc.is() )
+        return PyRef();
+    typelib_TypeDescriptionReference *pElementTypeRef =
+        ((typelib_IndirectTypeDescription *) desc.get())->pType;
+    TypeDescription elementDesc( pElementTypeRef );
+    if( ! elementDesc.is() )
+        return PyRef();
+
+    const uno_Sequence *pSeq = *(const uno_Sequence **) a.getValue();
+    PyRef tuple( PyTuple_New( pSeq->nElements ), SAL_NO_ACQUIRE );
+    fillPyTuple( tuple.get(), pSeq, pElementTypeRef, elementDesc.get()->nSize, r );
+    return tuple;
+}
+
 PyRef Runtime::any2PyObject (const Any &a ) const
     throw ( com::sun::star::script::CannotConvertException,
             com::sun::star::lang::IllegalArgumentException,
@@ -484,7 +724,7 @@ PyRef Runtime::any2PyObject (const Any &a ) const
 	{
         OUString tmp_ostr;
         a >>= tmp_ostr;
-        return ustring2PyUnicode( tmp_ostr );
+        return ustring2PyUnicode( tmp_ostr, getImpl()->cargo );
 	}
     case typelib_TypeClass_TYPE:
 	{
@@ -505,27 +745,7 @@ PyRef Runtime::any2PyObject (const Any &a ) const
     case typelib_TypeClass_ENUM:
 	{
         sal_Int32 l = *(sal_Int32 *) a.getValue();
-        TypeDescription desc( a.getValueType() );
-        if( desc.is() )
-        {
-            desc.makeComplete();
-            typelib_EnumTypeDescription *pEnumDesc =
-                (typelib_EnumTypeDescription *) desc.get();
-            for( int i = 0 ; i < pEnumDesc->nEnumValues ; i ++ )
-            {
-                if( pEnumDesc->pEnumValues[i] == l )
-                {
-                    OString v = OUStringToOString( pEnumDesc->ppEnumNames[i], RTL_TEXTENCODING_ASCII_US);
-                    OString e = OUStringToOString( pEnumDesc->aBase.pTypeName, RTL_TEXTENCODING_ASCII_US);
-                    return PyRef( PyUNO_Enum_new(e.getStr(),v.getStr(), *this ), SAL_NO_ACQUIRE );
-                }
-            }
-        }
-        OUStringBuffer buf;
-        buf.appendAscii( "Any carries enum " );
-        buf.append( a.getValueType().getTypeName());
-        buf.appendAscii( " with invalid value " ).append( l );
-        throw RuntimeException( buf.makeStringAndClear() , Reference< XInterface > ()  );
+        return getPyEnum( getEnumTable( a.getValueTypeRef(), *this ), l );
 	}
     case typelib_TypeClass_EXCEPTION:
     case typelib_TypeClass_STRUCT:
@@ -572,12 +792,15 @@ PyRef Runtime::any2PyObject (const Any &a ) const
         }
         else
         {
+            PyRef tuple = sequence2PyTuple( a, *this );
+            if( tuple.is() )
+                return tuple;
+
+            // no type description available, let the converter do the job
             Reference< XTypeConverter > tc = getImpl()->cargo->xTypeConverter;
-            Reference< XSingleServiceFactory > ssf = getImpl()->cargo->xInvocation;
             tc->convertTo (a, ::getCppuType (&s)) >>= s;
-            PyRef tuple( PyTuple_New (s.getLength()), SAL_NO_ACQUIRE);
+            tuple = PyRef( PyTuple_New (s.getLength()), SAL_NO_ACQUIRE);
             int i=0;
-            OUString errMsg;
             try
             {
                 for ( i = 0; i < s.getLength (); i++)
@@ -611,7 +834,7 @@ PyRef Runtime::any2PyObject (const Any &a ) const
                 return ((Adapter*)sal::static_int_cast< sal_IntPtr >(that))->getWrappedObject();
         }
         //This is just like the struct case:
-        return PyRef( PyUNO_new (a, getImpl()->cargo->xInvocation), SAL_NO_ACQUIRE );
+        return PyRef( PyUNO_new (a, getImpl()->cargo->xInvocation, getImpl()->cargo), SAL_NO_ACQUIRE );
 	}
     default:
 	{
@@ -626,10 +849,42 @@ PyRef Runtime::any2PyObject (const Any &a ) const
     return Py_None;
 }
 
+// the number of python classes, whose types are kept
+static const size_t CLASS_TYPES_CACHE_SIZE = 64;
+
+/** @return true for the getTypes function of unohelper.Base, which returns
+    the same types for all instances of a class
+ */
+static bool isUnoHelperGetTypes( PyObject *function )
+{
+    if( ! PyFunction_Check( function ) )
+        return false;
+    PyObject *moduleName =
+        PyDict_GetItemString( PyFunction_GET_GLOBALS( function ), "__name__" );
+    return moduleName && ( PYSTR_CHECK( moduleName ) || PyUnicode_Check( moduleName ) ) &&
+        pyString2ustring( moduleName ).equalsAscii( "unohelper" );
+}
+
 static Sequence< Type > invokeGetTypes( const Runtime & r , PyObject * o )
 {
     Sequence< Type > ret;
 
+    // the types of classes deriving from unohelper.Base are kept per class,
+    // unless the class or the instance overrides getTypes
+    RuntimeCargo *cargo = r.getImpl()->cargo;
+    static const OUString getTypesName( RTL_CONSTASCII_USTRINGPARAM( "getTypes" ) );
+    const ClassMethod &classMethod = getClassMethod( cargo, o, getTypesName );
+    PyRef getTypes( classMethod.function );
+    if( getTypes.is() && isOverriddenByInstance( o, classMethod.pyName.get(), getTypes.get() ) )
+        getTypes = PyRef();
+    PyRef type( reinterpret_cast< PyObject * >( Py_TYPE( o ) ) );
+    if( getTypes.is() )
+    {
+        ClassTypesMap::const_iterator ii = cargo->classTypes.find( type );
+        if( ii != cargo->classTypes.end() && ii->second.getTypes == getTypes )
+            return ii->second.types;
+    }
+
     PyRef method( PyObject_GetAttrString( o , const_cast< char * >("getTypes") ), SAL_NO_ACQUIRE );
     raiseInvocationTargetExceptionWhenNeeded( r );
     if( method.is() && PyCallable_Check( method.get() ) )
@@ -648,11 +903,163 @@ static Sequence< Type > invokeGetTypes( const Runtime & r , PyObject * o )
                 a >>= ret[i];
             }
             ret[size] = getCppuType( (Reference< com::sun::star::lang::XUnoTunnel> *) 0 );
+
+            if( getTypes.is() && isUnoHelperGetTypes( getTypes.get() ) )
+            {
+                if( cargo->classTypes.size() >= CLASS_TYPES_CACHE_SIZE &&
+                    cargo->classTypes.find( type ) == cargo->classTypes.end() )
+                {
+                    // the classes are released after the map is empty
+                    ClassTypesMap dropped;
+                    dropped.swap( cargo->classTypes );
+                }
+                ClassTypes &classTypes = cargo->classTypes[ type ];
+                classTypes.getTypes = getTypes;
+                classTypes.types = ret;
+            }
         }
     }
     return ret;
 }
 
+/** @return true, when the tuple is a row-major matrix, i.e. all its items
+    are tuples or lists
+ */
+static bool isPyMatrix( PyObject *items )
+{
+    const Py_ssize_t nRows = PyTuple_GET_SIZE( items );
+    if( ! nRows )
+        return false;
+    for( Py_ssize_t i = 0 ; i < nRows ; i ++ )
+    {
+        PyObject *row = PyTuple_GET_ITEM( items, i );
+        if( ! PyTuple_Check( row ) && ! PyList_Check( row ) )
+            return false;
+    }
+    return true;
+}
+
+bool pyMatrix2Sequence(
+    PyObject *o, typelib_TypeDescriptionReference *pSeqTypeRef, Any &a,
+    const Runtime &r, ConversionMode mode )
+    throw ( RuntimeException )
+{
+    if( ! pSeqTypeRef ||
+        ! typelib_typedescriptionreference_equals(
+            pSeqTypeRef,
+            getCppuType( (Sequence< Sequence< Any > > *) 0 ).getTypeLibType() ) ||
+        ( ! PyTuple_Check( o ) && ! PyList_Check( o ) ) )
+        return false;
+    // a list may change, while its elements are converted
+    PyRef items( PySequence_Tuple( o ), SAL_NO_ACQUIRE );
+    if( ! isPyMatrix( items.get() ) )
+        return false;
+
+    const sal_Int32 nRows = (sal_Int32) PyTuple_GET_SIZE( items.get() );
+    Sequence< Sequence< Any > > rows( nRows );
+    Sequence< Any > *pRows = rows.getArray();
+    for( sal_Int32 i = 0 ; i < nRows ; i ++ )
+    {
+        PyRef row( PySequence_Tuple( PyTuple_GET_ITEM( items.get(), i ) ), SAL_NO_ACQUIRE );
+        const sal_Int32 nCells = (sal_Int32) PyTuple_GET_SIZE( row.get() );
+        pRows[i].realloc( nCells );
+        Any *pCells = pRows[i].getArray();
+        for( sal_Int32 j = 0 ; j < nCells ; j ++ )
+        {
+            PyObject *cell = PyTuple_GET_ITEM( row.get(), j );
+            if( PyFloat_CheckExact( cell ) )
+                pCells[j] <<= PyFloat_AS_DOUBLE( cell );
+            else if( PyUnicode_CheckExact( cell ) )
+                pCells[j] <<= pyString2ustring( cell, r.getImpl()->cargo );
+            else if( Py_None != cell )
+                pCells[j] = r.pyObject2Any( cell, mode );
+        }
+    }
+    a <<= rows;
+    return true;
+}
+
+/** streams the items of a python iterator into a sequence without building
+    an intermediate tuple
+ */
+static Sequence< Any > pyIterator2Sequence( const Runtime &r, PyObject *o, ConversionMode mode )
+    throw ( RuntimeException )
+{
+    Sequence< Any > s( 16 );
+    sal_Int32 n = 0;
+    for( ;; )
+    {
+        PyRef item( PyIter_Next( o ), SAL_NO_ACQUIRE );
+        if( ! item.is() )
+            break;
+        if( n == s.getLength() )
+            s.realloc( 2 * n );
+        s.getArray()[n++] = r.pyObject2Any( item, mode );
+    }
+    if( PyErr_Occurred() )
+    {
+        PyRef excType, excValue, excTraceback;
+        PyErr_Fetch( (PyObject **)&excType, (PyObject**)&excValue,(PyObject**)&excTraceback);
+        Any unoExc( r.extractUnoException( excType, excValue, excTraceback ) );
+        throw RuntimeException(
+            ((com::sun::star::uno::Exception*)unoExc.getValue())->Message,
+            Reference< XInterface > () );
+    }
+    s.realloc( n );
+    return s;
+}
+
+static PyObjectKind classifyPyObject( const Runtime &r, PyObject *o )
+{
+    if( PyObject_TypeCheck( o, &PyUNO_ByteSequence_Type ) )
+        return BYTESEQUENCE_KIND;
+    if( PyObject_TypeCheck( o, &PyUNO_PropertyValues_Type ) )
+        return PROPERTYVALUES_KIND;
+    if( PyObject_IsInstance( o, getTypeClass( r ).get() ) )
+        return TYPE_KIND;
+    if( PyObject_IsInstance( o, getEnumClass( r ).get() ) )
+        return ENUM_KIND;
+    if( isInstanceOfStructOrException( o ) )
+        return STRUCT_KIND;
+    if( PyObject_IsInstance( o, getPyUnoClass().get() ) )
+        return PYUNO_KIND;
+    if( PyObject_IsInstance( o, getCharClass( r ).get() ) )
+        return CHAR_KIND;
+    if( PyObject_IsInstance( o, getAnyClass( r ).get() ) )
+        return ANY_KIND;
+    return OTHER_KIND;
+}
+
+// the number of python types, whose kinds are kept
+static const size_t PYOBJECT_KIND_CACHE_SIZE = 256;
+
+/** classifies o by its exact type, the result is cached per type
+ */
+static PyObjectKind getPyObjectKind( const Runtime &r, PyObject *o )
+{
+#if PY_MAJOR_VERSION < 3
+    // instances of classic classes share one type
+    if( PyInstance_Check( o ) )
+        return classifyPyObject( r, o );
+#endif
+    PyObjectKindMap &kinds = r.getImpl()->cargo->pyObjectKinds;
+    PyRef type( reinterpret_cast< PyObject * >( Py_TYPE( o ) ) );
+    PyObjectKindMap::const_iterator ii = kinds.find( type );
+    if( ii != kinds.end() )
+        return ii->second;
+
+    PyObjectKind kind = classifyPyObject( r, o );
+    if( kinds.size() >= PYOBJECT_KIND_CACHE_SIZE )
+    {
+        // the types are released after the map is empty, their deallocation
+        // may convert objects again
+        PyObjectKindMap dropped;
+        dropped.swap( kinds );
+    }
+    kinds[type] = kind;
+    return kind;
+}
+
 Any Runtime::pyObject2Any ( const PyRef & source, enum ConversionMode mode ) const
     throw ( com::sun::star::uno::RuntimeException )
 {
@@ -750,51 +1157,45 @@ Any Runtime::pyObject2Any ( const PyRef & source, enum ConversionMode mode ) con
 	a <<= pyString2ustring(o);
 #endif
     else if( PyUnicode_Check( o ) )
-	a <<= pyString2ustring(o);
-    else if (PyTuple_Check (o))
+	a <<= pyString2ustring( o, getImpl()->cargo );
+    else if (PyTuple_Check (o) || PyList_Check (o))
     {
-        Sequence<Any> s (PyTuple_Size (o));
-        for (int i = 0; i < PyTuple_Size (o); i++)
+        // a list may change, while its elements are converted
+        PyRef items( PySequence_Tuple( o ), SAL_NO_ACQUIRE );
+        Sequence<Any> s (PyTuple_Size (items.get()));
+        Any *pElements = s.getArray();
+        for (int i = 0; i < s.getLength(); i++)
         {
-            s[i] = pyObject2Any (PyTuple_GetItem (o, i), mode );
+            pElements[i] = pyObject2Any (PyTuple_GET_ITEM (items.get(), i), mode );
         }
         a <<= s;
     }
     else
     {
-        Runtime runtime;
-        // should be removed, in case ByteSequence gets derived from String 
-        if( PyObject_IsInstance( o, getByteSequenceClass( runtime ).get() ) )
+        switch( getPyObjectKind( *this, o ) )
         {
-            PyRef str(PyObject_GetAttrString( o , const_cast< char * >("value") ),SAL_NO_ACQUIRE);
-            Sequence< sal_Int8 > seq;
-            if( PyBytes_Check( str.get() ) )
-            {
-                seq = Sequence<sal_Int8 > (
-                    (sal_Int8*) PyBytes_AsString(str.get()), PyBytes_Size(str.get()));
-            }
-            else if ( PyByteArray_Check( str.get() ) )
-            {
-                seq = Sequence< sal_Int8 >(
-                    (sal_Int8 *) PyByteArray_AS_STRING(str.get()), PyByteArray_GET_SIZE(str.get()));
-            }
-            a <<= seq;                                                          
-        }
-        else
-        if( PyObject_IsInstance( o, getTypeClass( runtime ).get() ) )
+        case BYTESEQUENCE_KIND:
+            // the wrapped sequence is passed on, the bytes are not copied
+            a <<= PyByteSequence2ByteSequence( o );
+            break;
+        case PROPERTYVALUES_KIND:
+            // built by uno.props, no struct is created per element
+            a <<= PyPropertyValues2Sequence( o );
+            break;
+        case TYPE_KIND:
         {
             Type t = PyType2Type( o );
             a <<= t;
+            break;
         }
-        else if( PyObject_IsInstance( o, getEnumClass( runtime ).get() ) )
-        {
+        case ENUM_KIND:
             a = PyEnum2Enum( o );
-        }
-        else if( isInstanceOfStructOrException( o ) )
+            break;
+        case STRUCT_KIND:
         {
             PyRef struc(PyObject_GetAttrString( o , const_cast< char * >("value") ),SAL_NO_ACQUIRE);
             PyUNO * obj = (PyUNO*)struc.get();
-            Reference< XMaterialHolder > holder( obj->members->xInvocation, UNO_QUERY );
+            Reference< XMaterialHolder > holder( PyUNO_getInvocation( obj ), UNO_QUERY );
             if( holder.is( ) )
                 a = holder->getMaterial();
             else
@@ -803,8 +1204,9 @@ Any Runtime::pyObject2Any ( const PyRef & source, enum ConversionMode mode ) con
                     USTR_ASCII( "struct or exception wrapper does not support XMaterialHolder" ),
                     Reference< XInterface > () );
             }
+            break;
         }
-        else if( PyObject_IsInstance( o, getPyUnoClass().get() ) )
+        case PYUNO_KIND:
         {
             PyUNO* o_pi;
             o_pi = (PyUNO*) o;
@@ -813,7 +1215,7 @@ Any Runtime::pyObject2Any ( const PyRef & source, enum ConversionMode mode ) con
                 o_pi->members->wrappedObject.getValueTypeClass () ==
                 com::sun::star::uno::TypeClass_EXCEPTION)
             {
-                Reference<XMaterialHolder> my_mh (o_pi->members->xInvocation, UNO_QUERY);
+                Reference<XMaterialHolder> my_mh (PyUNO_getInvocation( o_pi ), UNO_QUERY);
 
                 if (!my_mh.is ())
                 {
@@ -828,27 +1230,34 @@ Any Runtime::pyObject2Any ( const PyRef & source, enum ConversionMode mode ) con
             {
                 a = o_pi->members->wrappedObject;
             }
+            break;
         }
-        else if( PyObject_IsInstance( o, getCharClass( runtime ).get() ) )
+        case CHAR_KIND:
         {
             sal_Unicode c = PyChar2Unicode( o );
             a.setValue( &c, getCharCppuType( ));
+            break;
         }
-        else if( PyObject_IsInstance( o, getAnyClass( runtime ).get() ) )
-        {
+        case ANY_KIND:
             if( ACCEPT_UNO_ANY == mode )
             {
-                a = pyObject2Any( PyRef( PyObject_GetAttrString( o , const_cast< char * >("value") ), SAL_NO_ACQUIRE) );
+                PyRef value( PyObject_GetAttrString( o , const_cast< char * >("value") ), SAL_NO_ACQUIRE );
                 Type t;
                 pyObject2Any( PyRef( PyObject_GetAttrString( o, const_cast< char * >("type") ), SAL_NO_ACQUIRE ) ) >>= t;
 
-                try
-                {
-                    a = getImpl()->cargo->xTypeConverter->convertTo( a, t );
-                }
-                catch( com::sun::star::uno::Exception & e )
+                if( ! value.is() ||
+                    ( ! pyMatrix2Sequence( value.get(), t.getTypeLibType(), a, *this, mode ) &&
+                      ! pyObject2TypedSequence( value.get(), t.getTypeLibType(), a ) ) )
                 {
-                    throw RuntimeException( e.Message, e.Context );
+                    a = pyObject2Any( value );
+                    try
+                    {
+                        a = getImpl()->cargo->xTypeConverter->convertTo( a, t );
+                    }
+                    catch( com::sun::star::uno::Exception & e )
+                    {
+                        throw RuntimeException( e.Message, e.Context );
+                    }
                 }
             }
             else
@@ -859,60 +1268,72 @@ Any Runtime::pyObject2Any ( const PyRef & source, enum ConversionMode mode ) con
                                   "use uno.invoke instead" ) ),
                     Reference< XInterface > () );
             }
-        }
-        else
-        {
-            Reference< XInterface > mappedObject;
-            Reference< XInvocation > adapterObject;
-            
-            // instance already mapped out to the world ?
-            PyRef2Adapter::iterator ii = impl->cargo->mappedObjects.find( PyRef( o ) );
-            if( ii != impl->cargo->mappedObjects.end() )
+            break;
+        default:
+            if( PyObject_CheckBuffer( o ) && pyObject2TypedSequence( o, 0, a ) )
             {
-                adapterObject = ii->second;
+                // buffer got packed into a sequence of its element type
             }
-
-            if( adapterObject.is() )
+            else if( PyIter_Check( o ) &&
+                     ! PyObject_HasAttrString( o, const_cast< char * >("getTypes") ) )
             {
-                // object got already bridged !
-                Reference< com::sun::star::lang::XUnoTunnel > tunnel( adapterObject, UNO_QUERY );
-                
-                Adapter *pAdapter = ( Adapter * )
-                    sal::static_int_cast< sal_IntPtr >(
-                        tunnel->getSomething(
-                            ::pyuno::Adapter::getUnoTunnelImplementationId() ) );
-                
-                mappedObject = impl->cargo->xAdapterFactory->createAdapter(
-                    adapterObject, pAdapter->getWrappedTypes() );
+                a <<= pyIterator2Sequence( *this, o, mode );
             }
-            else 
+            else
             {
-                Sequence< Type > interfaces = invokeGetTypes( *this, o );
-                if( interfaces.getLength() )
+                Reference< XInterface > mappedObject;
+                Reference< XInvocation > adapterObject;
+
+                // instance already mapped out to the world ?
+                PyRef2Adapter::iterator ii = impl->cargo->mappedObjects.find( PyRef( o ) );
+                if( ii != impl->cargo->mappedObjects.end() )
                 {
-                    Adapter *pAdapter = new Adapter( o, interfaces );
-                    mappedObject = 
-                        getImpl()->cargo->xAdapterFactory->createAdapter(
-                            pAdapter, interfaces );
-                    
-                    // keep a list of exported objects to ensure object identity !
-                    impl->cargo->mappedObjects[ PyRef(o) ] =
-                        com::sun::star::uno::WeakReference< XInvocation > ( pAdapter );
+                    adapterObject = ii->second;
+                }
+
+                if( adapterObject.is() )
+                {
+                    // object got already bridged !
+                    Reference< com::sun::star::lang::XUnoTunnel > tunnel( adapterObject, UNO_QUERY );
+
+                    Adapter *pAdapter = ( Adapter * )
+                        sal::static_int_cast< sal_IntPtr >(
+                            tunnel->getSomething(
+                                ::pyuno::Adapter::getUnoTunnelImplementationId() ) );
+
+                    mappedObject = impl->cargo->xAdapterFactory->createAdapter(
+                        adapterObject, pAdapter->getWrappedTypes() );
+                }
+                else 
+                {
+                    Sequence< Type > interfaces = invokeGetTypes( *this, o );
+                    if( interfaces.getLength() )
+                    {
+                        Adapter *pAdapter = new Adapter( o, interfaces );
+                        mappedObject = 
+                            getImpl()->cargo->xAdapterFactory->createAdapter(
+                                pAdapter, interfaces );
+
+                        // keep a list of exported objects to ensure object identity !
+                        impl->cargo->mappedObjects[ PyRef(o) ] =
+                            com::sun::star::uno::WeakReference< XInvocation > ( pAdapter );
+                    }
+                }
+                if( mappedObject.is() )
+                {
+                    a = com::sun::star::uno::makeAny( mappedObject );
+                }
+                else
+                {
+                    OUStringBuffer buf;
+                    buf.appendAscii( "Couldn't convert " );
+                    PyRef reprString( PyObject_Str( o ) , SAL_NO_ACQUIRE );
+                    buf.append( pyString2ustring( reprString.get() ) );
+                    buf.appendAscii( " to a UNO type" );
+                    throw RuntimeException( buf.makeStringAndClear(), Reference< XInterface > () );
                 }
             }
-            if( mappedObject.is() )
-            {
-                a = com::sun::star::uno::makeAny( mappedObject );
-            }
-            else
-            {
-                OUStringBuffer buf;
-                buf.appendAscii( "Couldn't convert " );
-                PyRef reprString( PyObject_Str( o ) , SAL_NO_ACQUIRE );
-                buf.append( pyString2ustring( reprString.get() ) );
-                buf.appendAscii( " to a UNO type" );
-                throw RuntimeException( buf.makeStringAndClear(), Reference< XInterface > () );
-            }
+            break;
         }
     }
     return a;
@@ -1000,6 +1421,92 @@ Any Runtime::extractUnoException( const PyRef & excType, const PyRef &excValue,
 }
 
 
+#if defined LINUX
+// LC_NUMERIC is switched with the thread local uselocale() instead of the
+// process wide setlocale(). The locale of python is the locale of the thread
+// with the C LC_NUMERIC locale, each thread keeps its own and builds it again,
+// when the locale it is based on changed, e.g. by locale.setlocale() for
+// LC_TIME or LC_COLLATE.
+static __thread locale_t t_unoLocale = 0;
+
+/** the locale of python of a thread and what it was built from
+ */
+struct PythonLocale
+{
+    locale_t locale;
+    locale_t base;
+    char *name;
+};
+
+/** frees the locale of python kept for a thread, when the thread ends
+ */
+static void SAL_CALL releasePythonLocale( void *pData )
+{
+    PythonLocale *pythonLocale = (PythonLocale *) pData;
+    if( pythonLocale->locale )
+    {
+        // threads of python may end with it
+        if( uselocale( (locale_t) 0 ) == pythonLocale->locale )
+            uselocale( LC_GLOBAL_LOCALE );
+        freelocale( pythonLocale->locale );
+    }
+    free( pythonLocale->name );
+    delete pythonLocale;
+}
+
+// created when the library is loaded and never destroyed
+static const oslThreadKey g_pythonLocaleKey = osl_createThreadKey( releasePythonLocale );
+
+/** the locale of python must not be in use by the thread, when it is called
+ */
+static locale_t getPythonLocale()
+{
+    PythonLocale *pythonLocale = g_pythonLocaleKey ?
+        (PythonLocale *) osl_getThreadKeyData( g_pythonLocaleKey ) : 0;
+    if( ! pythonLocale )
+    {
+        if( ! g_pythonLocaleKey )
+            return 0;
+        pythonLocale = new PythonLocale;
+        pythonLocale->locale = 0;
+        pythonLocale->base = 0;
+        pythonLocale->name = 0;
+        osl_setThreadKeyData( g_pythonLocaleKey, pythonLocale );
+    }
+
+    locale_t base = t_unoLocale ? t_unoLocale : LC_GLOBAL_LOCALE;
+    // the names tell, whether the global locale has been changed
+    const char *name = LC_GLOBAL_LOCALE == base ? setlocale( LC_ALL, 0 ) : "";
+    if( pythonLocale->locale && base == pythonLocale->base &&
+        name && pythonLocale->name && 0 == strcmp( name, pythonLocale->name ) )
+        return pythonLocale->locale;
+
+    if( pythonLocale->locale )
+        freelocale( pythonLocale->locale );
+    free( pythonLocale->name );
+    pythonLocale->name = name ? strdup( name ) : 0;
+    pythonLocale->base = base;
+    pythonLocale->locale = 0;
+    locale_t copy = duplocale( base );
+    if( copy )
+    {
+        // python requires C LC_NUMERIC locale, the other categories are kept
+        pythonLocale->locale = newlocale( LC_NUMERIC_MASK, "C", copy );
+        if( ! pythonLocale->locale )
+            freelocale( copy );
+    }
+    return pythonLocale->locale;
+}
+
+static void setPythonLocale()
+{
+    locale_t pythonLocale = getPythonLocale();
+    if( pythonLocale )
+        uselocale( pythonLocale );
+    else
+        setlocale( LC_NUMERIC, "C" );
+}
+#else
 static const char * g_NUMERICID = "pyuno.lcNumeric";
 static ::std::vector< rtl::OString > g_localeList;
 
@@ -1018,33 +1525,159 @@ static const char *ensureUnlimitedLifetime( const char *str )
     }
     return g_localeList[i].getStr();
 }
+#endif
+
+
+/** the thread state kept for the callbacks of a thread
+ */
+struct CachedThreadState
+{
+    PyThreadState *tstate;
+    // the number of finalizations of python, when it was created
+    oslInterlockedCount generation;
+};
+
+// counts the finalizations of python. The thread states of an earlier
+// generation have been deleted together with their interpreter.
+static oslInterlockedCount g_pythonGeneration = 0;
+// the generation, in which countFinalization is registered with Py_AtExit()
+static oslInterlockedCount g_atExitGeneration = -1;
+
+static void countFinalization()
+{
+    osl_incrementInterlockedCount( &g_pythonGeneration );
+}
+
+static bool isPythonFinalizing()
+{
+#if PY_VERSION_HEX >= 0x030D0000
+    return Py_IsFinalizing() != 0;
+#elif PY_VERSION_HEX >= 0x03070000
+    return _Py_IsFinalizing() != 0;
+#elif PY_MAJOR_VERSION >= 3
+    return _Py_Finalizing != 0;
+#else
+    return false;
+#endif
+}
 
+/** only the thread states of the main interpreter are kept, the ones of sub
+    interpreters are deleted by Py_EndInterpreter() at any time
+ */
+static bool isMainInterpreter( PyInterpreterState *interp )
+{
+#if PY_VERSION_HEX >= 0x03080000
+    return interp == PyInterpreterState_Main();
+#else
+    // the main interpreter is the first one created, at the end of the list
+    return ! PyInterpreterState_Next( interp );
+#endif
+}
+
+/** deletes the thread state kept for a thread, when the thread ends or
+    another one is kept
+ */
+static void SAL_CALL releaseThreadState( void *pData )
+{
+    CachedThreadState *cached = (CachedThreadState *) pData;
+    // the thread states are gone together with the interpreter, while python
+    // is finalized the global interpreter lock may not be released any more
+    if( cached->generation == g_pythonGeneration &&
+        Py_IsInitialized() && ! isPythonFinalizing() )
+    {
+        PyEval_AcquireThread( cached->tstate );
+        PyThreadState_Clear( cached->tstate );
+        PyEval_ReleaseThread( cached->tstate );
+        PyThreadState_Delete( cached->tstate );
+    }
+    delete cached;
+}
+
+// the key of the thread state, which PyThreadAttach reuses in its thread.
+// Created when the library is loaded and never destroyed.
+static const oslThreadKey g_threadStateKey = osl_createThreadKey( releaseThreadState );
 
 PyThreadAttach::PyThreadAttach( PyInterpreterState *interp)
     throw ( com::sun::star::uno::RuntimeException )
 {
-    tstate = PyThreadState_New( interp );
-    if( !tstate  )
-        throw RuntimeException(
-            OUString(RTL_CONSTASCII_USTRINGPARAM( "Couldn't create a pythreadstate" ) ),
-            Reference< XInterface > () );
+    // the thread state of the main interpreter is kept for the following
+    // callbacks of the thread and deleted, when the thread ends
+    CachedThreadState *cached = g_threadStateKey ?
+        (CachedThreadState *) osl_getThreadKeyData( g_threadStateKey ) : 0;
+    if( cached && cached->generation != g_pythonGeneration )
+        cached = 0;
+    bool bCache = false;
+    if( cached && cached->tstate->interp == interp )
+    {
+        tstate = cached->tstate;
+    }
+    else
+    {
+        tstate = PyThreadState_New( interp );
+        if( !tstate  )
+            throw RuntimeException(
+                OUString(RTL_CONSTASCII_USTRINGPARAM( "Couldn't create a pythreadstate" ) ),
+                Reference< XInterface > () );
+        bCache = g_threadStateKey && ! cached;
+    }
     PyEval_AcquireThread( tstate);
+    if( bCache && isMainInterpreter( interp ) )
+    {
+        // the cached thread states are outdated by the next finalization
+        if( g_atExitGeneration != g_pythonGeneration && 0 == Py_AtExit( countFinalization ) )
+            g_atExitGeneration = g_pythonGeneration;
+        if( g_atExitGeneration == g_pythonGeneration )
+        {
+            CachedThreadState *entry = new CachedThreadState;
+            entry->tstate = tstate;
+            entry->generation = g_pythonGeneration;
+            // releases the outdated entry
+            osl_setThreadKeyData( g_threadStateKey, entry );
+        }
+    }
     // set LC_NUMERIC to "C"
-    const char * oldLocale =
-        ensureUnlimitedLifetime( setlocale( LC_NUMERIC, 0 )  );
-    setlocale( LC_NUMERIC, "C" );
-    PyRef locale( // python requires C locale
-        PyLong_FromVoidPtr( (void*)oldLocale ), SAL_NO_ACQUIRE);
-    PyDict_SetItemString(
-        PyThreadState_GetDict(), g_NUMERICID, locale.get() );
+#if defined LINUX
+    t_unoLocale = uselocale( (locale_t) 0 );
+    setPythonLocale();
+#else
+    const char * currentLocale = setlocale( LC_NUMERIC, 0 );
+    // nothing to restore later when the office already uses "C"
+    if( currentLocale && strcmp( currentLocale, "C" ) != 0 )
+    {
+        const char * oldLocale = ensureUnlimitedLifetime( currentLocale );
+        setlocale( LC_NUMERIC, "C" );
+        PyRef locale( // python requires C locale
+            PyLong_FromVoidPtr( (void*)oldLocale ), SAL_NO_ACQUIRE);
+        PyDict_SetItemString(
+            PyThreadState_GetDict(), g_NUMERICID, locale.get() );
+    }
+    else if( PyDict_GetItemString( PyThreadState_GetDict(), g_NUMERICID ) )
+    {
+        // left by a former attach of the reused thread state
+        PyDict_DelItemString( PyThreadState_GetDict(), g_NUMERICID );
+    }
+#endif
 }
 
 PyThreadAttach::~PyThreadAttach()
 {
+#if defined LINUX
+    if( t_unoLocale )
+        uselocale( t_unoLocale );
+#else
     PyObject *value =
         PyDict_GetItemString( PyThreadState_GetDict( ), g_NUMERICID );
     if( value )
         setlocale( LC_NUMERIC, (const char * ) PyLong_AsVoidPtr( value ) );
+#endif
+    CachedThreadState *cached = g_threadStateKey ?
+        (CachedThreadState *) osl_getThreadKeyData( g_threadStateKey ) : 0;
+    if( cached && cached->generation == g_pythonGeneration && tstate == cached->tstate )
+    {
+        // kept for the next callback in this thread
+        PyEval_ReleaseThread( tstate );
+        return;
+    }
     PyThreadState_Clear( tstate );
     PyEval_ReleaseThread( tstate );
     PyThreadState_Delete( tstate );
@@ -1054,10 +1687,15 @@ PyThreadAttach::~PyThreadAttach()
 PyThreadDetach::PyThreadDetach() throw ( com::sun::star::uno::RuntimeException )
 {
     tstate = PyThreadState_Get();
+#if defined LINUX
+    // threads not attached by PyThreadAttach get the locale of the process
+    uselocale( t_unoLocale ? t_unoLocale : LC_GLOBAL_LOCALE );
+#else
     PyObject *value =
         PyDict_GetItemString( PyThreadState_GetDict( ), g_NUMERICID );
     if( value )
         setlocale( LC_NUMERIC, (const char * ) PyLong_AsVoidPtr( value ) );
+#endif
     PyEval_ReleaseThread( tstate );
 }
 
@@ -1072,7 +1710,11 @@ PyThreadDetach::~PyThreadDetach()
 
     // python requires C LC_NUMERIC locale,
     // always set even when it is already "C"
+#if defined LINUX
+    setPythonLocale();
+#else
     setlocale( LC_NUMERIC, "C" );    
+#endif
 }
 
 
@@ -40,10 +40,51 @@ using com::sun::star::uno::Any;
 using com::sun::star::uno::XInterface;
 using com::sun::star::uno::Reference;
 using com::sun::star::uno::TypeDescription;
+using com::sun::star::uno::Sequence;
 
 #define USTR_ASCII(x) rtl::OUString( RTL_CONSTASCII_USTRINGPARAM( x ) )
+
+#if PY_VERSION_HEX < 0x03020000
+typedef long Py_hash_t;
+#endif
+
 namespace pyuno
 {
+
+typedef struct
+{
+    PyRef typeName;
+    PyRef value;
+    Any enumValue;
+    Py_hash_t hash;
+} PyUNO_Enum_Internals;
+
+typedef struct
+{
+    PyObject_HEAD
+    PyUNO_Enum_Internals *members;
+} PyUNO_Enum;
+
+typedef struct
+{
+    PyRef typeName;
+    PyRef typeClass;
+    Type type;
+    Py_hash_t hash;
+} PyUNO_Type_Internals;
+
+typedef struct
+{
+    PyObject_HEAD
+    PyUNO_Type_Internals *members;
+} PyUNO_Type;
+
+typedef struct
+{
+    PyObject_HEAD
+    sal_Unicode value;
+} PyUNO_Char;
+
 const char *typeClassToString( TypeClass t )
 {
     const char * ret = 0;
@@ -114,24 +155,24 @@ static PyRef getClass( const Runtime & r , const char * name)
     return PyRef( PyDict_GetItemString( r.getImpl()->cargo->getUnoModule().get(), (char*) name ) );
 }
 
-PyRef getTypeClass( const Runtime & r )
+PyRef getTypeClass( const Runtime & )
 {
-    return getClass( r , "Type" );
+    return PyRef( reinterpret_cast< PyObject * >( &PyUNO_Type_Type ) );
 }
 
-PyRef getEnumClass( const Runtime & r )
+PyRef getEnumClass( const Runtime & )
 {
-    return getClass( r , "Enum" );
+    return PyRef( reinterpret_cast< PyObject * >( &PyUNO_Enum_Type ) );
 }
 
-PyRef getCharClass( const Runtime & r )
+PyRef getCharClass( const Runtime & )
 {
-    return getClass( r , "Char" );
+    return PyRef( reinterpret_cast< PyObject * >( &PyUNO_Char_Type ) );
 }
 
-PyRef getByteSequenceClass( const Runtime & r )
+PyRef getByteSequenceClass( const Runtime & )
 {
-    return getClass( r , "ByteSequence" );
+    return PyRef( reinterpret_cast< PyObject * >( &PyUNO_ByteSequence_Type ) );
 }
 
 PyRef getAnyClass( const Runtime & r )
@@ -142,6 +183,9 @@ PyRef getAnyClass( const Runtime & r )
 
 sal_Unicode PyChar2Unicode( PyObject *obj ) throw ( RuntimeException )
 {
+    if( PyObject_TypeCheck( obj, &PyUNO_Char_Type ) )
+        return ((PyUNO_Char *) obj)->value;
+
     PyRef value( PyObject_GetAttrString( obj, const_cast< char * >("value") ), SAL_NO_ACQUIRE );
     if( ! PyUnicode_Check( value.get() ) )
     {
@@ -164,21 +208,20 @@ sal_Unicode PyChar2Unicode( PyObject *obj ) throw ( RuntimeException )
     return c;
 }
 
-Any PyEnum2Enum( PyObject *obj ) throw ( RuntimeException )
+static OUString getEnumKey( const OUString &typeName, const OUString &valueName )
+{
+    OUStringBuffer buf( typeName.getLength() + valueName.getLength() + 1 );
+    buf.append( typeName ).append( (sal_Unicode) '.' ).append( valueName );
+    return buf.makeStringAndClear();
+}
+
+/** looks up the value of an enum by its name, throws a RuntimeException
+    when the enum or the value is unknown
+ */
+static Any getEnumValue( const OUString &strTypeName, const OUString &strValue )
+    throw ( RuntimeException )
 {
     Any ret;
-    PyRef typeName( PyObject_GetAttrString( obj,const_cast< char * >("typeName") ), SAL_NO_ACQUIRE);
-    PyRef value( PyObject_GetAttrString( obj, const_cast< char * >("value") ), SAL_NO_ACQUIRE);
-    if( !PYSTR_CHECK( typeName.get() ) || ! PYSTR_CHECK( value.get() ) )
-    {
-        throw RuntimeException(
-            USTR_ASCII( "attributes typeName and/or value of uno.Enum are not strings" ),
-            Reference< XInterface > () );
-    }
-    
-    OUString strTypeName( pyString2ustring( typeName.get() ) );
-    OUString strValue( pyString2ustring( value.get() ) );
-    
     TypeDescription desc( strTypeName );
     if( desc.is() )
     {
@@ -221,21 +264,39 @@ Any PyEnum2Enum( PyObject *obj ) throw ( RuntimeException )
     return ret;
 }
 
-
-Type PyType2Type( PyObject * o ) throw(RuntimeException )
+Any PyEnum2Enum( PyObject *obj ) throw ( RuntimeException )
 {
-    PyRef pyName( PyObject_GetAttrString( o, const_cast< char * >("typeName") ), SAL_NO_ACQUIRE);
-    if( !PYSTR_CHECK( pyName.get() ) )
+    if( PyObject_TypeCheck( obj, &PyUNO_Enum_Type ) )
+        return ((PyUNO_Enum *) obj)->members->enumValue;
+
+    PyRef typeName( PyObject_GetAttrString( obj,const_cast< char * >("typeName") ), SAL_NO_ACQUIRE);
+    PyRef value( PyObject_GetAttrString( obj, const_cast< char * >("value") ), SAL_NO_ACQUIRE);
+    if( !PYSTR_CHECK( typeName.get() ) || ! PYSTR_CHECK( value.get() ) )
     {
         throw RuntimeException(
-            USTR_ASCII( "type object does not have typeName property" ),
+            USTR_ASCII( "attributes typeName and/or value of uno.Enum are not strings" ),
             Reference< XInterface > () );
     }
+    
+    OUString strTypeName( pyString2ustring( typeName.get() ) );
+    OUString strValue( pyString2ustring( value.get() ) );
+    if( Runtime::isInitialized() )
+    {
+        // an enum instance of the same value may be interned already
+        Runtime runtime;
+        const InternedValueMap &enumValues = runtime.getImpl()->cargo->enumValues;
+        InternedValueMap::const_iterator ii = enumValues.find( getEnumKey( strTypeName, strValue ) );
+        if( ii != enumValues.end() )
+            return ((PyUNO_Enum *) ii->second.get())->members->enumValue;
+    }
+    return getEnumValue( strTypeName, strValue );
+}
 
-    PyRef pyTC( PyObject_GetAttrString( o, const_cast< char * >("typeClass") ), SAL_NO_ACQUIRE );
-    Any enumValue = PyEnum2Enum( pyTC.get() );
-
-    OUString name( pyString2ustring( pyName.get() ) );
+/** looks up a type by its name and checks its type class, throws a
+    RuntimeException when the type is unknown or the type class differs
+ */
+static Type getCheckedType( const OUString &name, const Any &enumValue ) throw ( RuntimeException )
+{
     TypeDescription desc( name );
     if( ! desc.is() )
     {
@@ -257,6 +318,25 @@ Type PyType2Type( PyObject * o ) throw(RuntimeException )
     return desc.get()->pWeakRef;
 }
 
+Type PyType2Type( PyObject * o ) throw(RuntimeException )
+{
+    if( PyObject_TypeCheck( o, &PyUNO_Type_Type ) )
+        return ((PyUNO_Type *) o)->members->type;
+
+    PyRef pyName( PyObject_GetAttrString( o, const_cast< char * >("typeName") ), SAL_NO_ACQUIRE);
+    if( !PYSTR_CHECK( pyName.get() ) )
+    {
+        throw RuntimeException(
+            USTR_ASCII( "type object does not have typeName property" ),
+            Reference< XInterface > () );
+    }
+
+    PyRef pyTC( PyObject_GetAttrString( o, const_cast< char * >("typeClass") ), SAL_NO_ACQUIRE );
+    Any enumValue = PyEnum2Enum( pyTC.get() );
+
+    return getCheckedType( pyString2ustring( pyName.get() ), enumValue );
+}
+
 PyObject *importToGlobal(PyObject *str, PyObject *dict, PyObject *target)
 {
     // maybe a constant ?
@@ -401,59 +481,928 @@ static PyObject* callCtor( const Runtime &r , const char * clazz, const PyRef &
 }
 
 
-PyObject *PyUNO_Enum_new( const char *enumBase, const char *enumValue, const Runtime &r )
+static Py_hash_t combineHashes( PyObject *a, PyObject *b )
 {
-    PyRef args( PyTuple_New( 2 ), SAL_NO_ACQUIRE );
-    PyTuple_SetItem( args.get() , 0 , PYSTR_FROMSTR( enumBase ) );
-    PyTuple_SetItem( args.get() , 1 , PYSTR_FROMSTR( enumValue ) );
+    Py_hash_t hash = PyObject_Hash( a ) ^ PyObject_Hash( b );
+    return hash == -1 ? -2 : hash;
+}
+
+/** returns the interned enum instance of the given enum value. The value is
+    looked up by its name, when knownValue is empty
+ */
+static PyObject *createEnum(
+    const OUString &typeName, const OUString &valueName, const Runtime &r,
+    const Any &knownValue = Any() )
+    throw ( RuntimeException )
+{
+    OUString key( getEnumKey( typeName, valueName ) );
+
+    InternedValueMap &enumValues = r.getImpl()->cargo->enumValues;
+    InternedValueMap::const_iterator ii = enumValues.find( key );
+    if( ii != enumValues.end() )
+        return ii->second.getAcquired();
+
+    Any enumValue = knownValue.hasValue() ? knownValue : getEnumValue( typeName, valueName );
+    PyUNO_Enum *self = PyObject_New( PyUNO_Enum, &PyUNO_Enum_Type );
+    if( self == NULL )
+        return NULL;
+    PyRef ret( (PyObject *) self, SAL_NO_ACQUIRE );
+    self->members = new PyUNO_Enum_Internals;
+    self->members->typeName = USTR_TO_PYSTR( typeName );
+    self->members->value = USTR_TO_PYSTR( valueName );
+    self->members->enumValue = enumValue;
+    self->members->hash = combineHashes(
+        self->members->typeName.get(), self->members->value.get() );
+    enumValues[key] = ret;
+    return ret.getAcquired();
+}
+
+const EnumTable & getEnumTable( typelib_TypeDescriptionReference *pTypeRef, const Runtime &r )
+    throw ( RuntimeException )
+{
+    EnumTableMap &enumTables = r.getImpl()->cargo->enumTables;
+    EnumTableMap::const_iterator ii = enumTables.find( pTypeRef );
+    if( ii != enumTables.end() )
+        return ii->second;
+
+    TypeDescription desc( pTypeRef );
+    if( ! desc.is() || desc.get()->eTypeClass != typelib_TypeClass_ENUM )
+    {
+        OUStringBuffer buf;
+        buf.appendAscii( "enum " ).append( OUString( pTypeRef->pTypeName ) ).appendAscii( " is unknown" );
+        throw RuntimeException( buf.makeStringAndClear(), Reference< XInterface > () );
+    }
+    desc.makeComplete();
+    typelib_EnumTypeDescription *pEnumDesc = (typelib_EnumTypeDescription *) desc.get();
+    OUString typeName( pEnumDesc->aBase.pTypeName );
+
+    EnumTable table;
+    table.type = Type( pTypeRef );
+    for( sal_Int32 i = 0 ; i < pEnumDesc->nEnumValues ; i ++ )
+    {
+        PyRef value(
+            createEnum( typeName, pEnumDesc->ppEnumNames[i], r,
+                        Any( &pEnumDesc->pEnumValues[i], pTypeRef ) ),
+            SAL_NO_ACQUIRE );
+        if( ! value.is() )
+            throw RuntimeException(
+                USTR_ASCII( "couldn't create enum value" ), Reference< XInterface > () );
+        table.values[ pEnumDesc->pEnumValues[i] ] = value;
+    }
+    return enumTables[ pTypeRef ] = table;
+}
+
+PyRef getPyEnum( const EnumTable &table, sal_Int32 nValue ) throw ( RuntimeException )
+{
+    EnumValueMap::const_iterator ii = table.values.find( nValue );
+    if( ii == table.values.end() )
+    {
+        OUStringBuffer buf;
+        buf.appendAscii( "Any carries enum " );
+        buf.append( table.type.getTypeName() );
+        buf.appendAscii( " with invalid value " ).append( nValue );
+        throw RuntimeException( buf.makeStringAndClear() , Reference< XInterface > ()  );
+    }
+    return ii->second;
+}
+
+/** returns the interned type instance of the given type
+ */
+static PyObject *createType( const Type &type, const Runtime &r ) throw ( RuntimeException )
+{
+    const OUString &name = type.getTypeName();
+    InternedValueMap &types = r.getImpl()->cargo->types;
+    InternedValueMap::const_iterator ii = types.find( name );
+    if( ii != types.end() )
+        return ii->second.getAcquired();
 
-    return callCtor( r, "Enum" , args );
+    PyRef typeClass(
+        createEnum(
+            USTR_ASCII( "com.sun.star.uno.TypeClass" ),
+            OUString::createFromAscii( typeClassToString( type.getTypeClass() ) ), r ),
+        SAL_NO_ACQUIRE );
+    if( ! typeClass.is() )
+        return NULL;
+    PyUNO_Type *self = PyObject_New( PyUNO_Type, &PyUNO_Type_Type );
+    if( self == NULL )
+        return NULL;
+    PyRef ret( (PyObject *) self, SAL_NO_ACQUIRE );
+    self->members = new PyUNO_Type_Internals;
+    self->members->typeName = USTR_TO_PYSTR( name );
+    self->members->typeClass = typeClass;
+    self->members->type = type;
+    self->members->hash = PyObject_Hash( self->members->typeName.get() );
+    types[name] = ret;
+    return ret.getAcquired();
+}
+
+PyObject *PyUNO_Enum_new( const char *enumBase, const char *enumValue, const Runtime &r )
+{
+    try
+    {
+        return createEnum(
+            OUString::createFromAscii( enumBase ), OUString::createFromAscii( enumValue ), r );
+    }
+    catch( RuntimeException & e )
+    {
+        raisePyExceptionWithAny( com::sun::star::uno::makeAny( e ) );
+    }
+    return NULL;
 }
 
 
 PyObject* PyUNO_Type_new (const char *typeName , TypeClass t , const Runtime &r )
 {
-    // retrieve type object
-    PyRef args( PyTuple_New( 2 ), SAL_NO_ACQUIRE );
+    try
+    {
+        return createType( Type( t, OUString::createFromAscii( typeName ) ), r );
+    }
+    catch( RuntimeException & e )
+    {
+        raisePyExceptionWithAny( com::sun::star::uno::makeAny( e ) );
+    }
+    return NULL;
+}
 
-    PyTuple_SetItem( args.get() , 0 , PYSTR_FROMSTR( typeName ) );
-    PyObject *typeClass = PyUNO_Enum_new( "com.sun.star.uno.TypeClass" , typeClassToString(t), r );
-    if( ! typeClass )
+static PyObject *createChar( sal_Unicode val )
+{
+    PyUNO_Char *self = PyObject_New( PyUNO_Char, &PyUNO_Char_Type );
+    if( self == NULL )
         return NULL;
-    PyTuple_SetItem( args.get() , 1 , typeClass);
-    
-    return callCtor( r, "Type" , args );
+    self->value = val;
+    return (PyObject *) self;
 }
 
-PyObject* PyUNO_char_new ( sal_Unicode val , const Runtime &r ) 
+PyObject* PyUNO_char_new ( sal_Unicode val , const Runtime & ) 
 {
-    // retrieve type object
-    PyRef args( PyTuple_New( 1 ), SAL_NO_ACQUIRE );
+    return createChar( val );
+}
 
-#if PY_VERSION_HEX >= 0x03030000
-    Py_UCS2 u[1];
-    u[0] = val;
-    PyTuple_SetItem( args.get(), 0, PyUnicode_FromKindAndData( PyUnicode_2BYTE_KIND, u, 1 ) );
+static PyObject *returnComparison( bool bEqual, int op )
+{
+    if( bEqual == ( op == Py_EQ ) )
+        Py_RETURN_TRUE;
+    Py_RETURN_FALSE;
+}
+
+static PyObject *PyUNO_Enum_tp_new( PyTypeObject *, PyObject *args, PyObject * )
+{
+    PyObject *typeName;
+    PyObject *value;
+    if( ! PyArg_ParseTuple( args, "OO:Enum", &typeName, &value ) )
+        return NULL;
+    try
+    {
+        if( !PYSTR_CHECK( typeName ) || ! PYSTR_CHECK( value ) )
+        {
+            throw RuntimeException(
+                USTR_ASCII( "attributes typeName and/or value of uno.Enum are not strings" ),
+                Reference< XInterface > () );
+        }
+        Runtime runtime;
+        return createEnum( pyString2ustring( typeName ), pyString2ustring( value ), runtime );
+    }
+    catch( RuntimeException & e )
+    {
+        raisePyExceptionWithAny( com::sun::star::uno::makeAny( e ) );
+    }
+    return NULL;
+}
+
+static void PyUNO_Enum_del( PyObject *self )
+{
+    delete ((PyUNO_Enum *) self)->members;
+    PyObject_Del( self );
+}
+
+static PyObject *PyUNO_Enum_getTypeName( PyObject *self, void * )
+{
+    return ((PyUNO_Enum *) self)->members->typeName.getAcquired();
+}
+
+static PyObject *PyUNO_Enum_getValue( PyObject *self, void * )
+{
+    return ((PyUNO_Enum *) self)->members->value.getAcquired();
+}
+
+static PyObject *PyUNO_Enum_repr( PyObject *self )
+{
+    PyUNO_Enum_Internals *members = ((PyUNO_Enum *) self)->members;
+    OUStringBuffer buf;
+    buf.appendAscii( "<uno.Enum " ).append( pyString2ustring( members->typeName.get() ) );
+    buf.appendAscii( " ('" ).append( pyString2ustring( members->value.get() ) ).appendAscii( "')>" );
+    return USTR_TO_PYSTR( buf.makeStringAndClear() ).getAcquired();
+}
+
+static PyObject *PyUNO_Enum_richcompare( PyObject *self, PyObject *that, int op )
+{
+    if( op != Py_EQ && op != Py_NE )
+    {
+        Py_INCREF( Py_NotImplemented );
+        return Py_NotImplemented;
+    }
+    bool bEqual = self == that ||
+        ( PyObject_TypeCheck( that, &PyUNO_Enum_Type ) &&
+          ((PyUNO_Enum *) self)->members->enumValue == ((PyUNO_Enum *) that)->members->enumValue );
+    return returnComparison( bEqual, op );
+}
+
+static Py_hash_t PyUNO_Enum_hash( PyObject *self )
+{
+    return ((PyUNO_Enum *) self)->members->hash;
+}
+
+static PyObject *PyUNO_Type_tp_new( PyTypeObject *, PyObject *args, PyObject * )
+{
+    PyObject *typeName;
+    PyObject *typeClass;
+    if( ! PyArg_ParseTuple( args, "OO:Type", &typeName, &typeClass ) )
+        return NULL;
+    try
+    {
+        if( !PYSTR_CHECK( typeName ) )
+        {
+            throw RuntimeException(
+                USTR_ASCII( "type object does not have typeName property" ),
+                Reference< XInterface > () );
+        }
+        Type type = getCheckedType( pyString2ustring( typeName ), PyEnum2Enum( typeClass ) );
+        Runtime runtime;
+        return createType( type, runtime );
+    }
+    catch( RuntimeException & e )
+    {
+        raisePyExceptionWithAny( com::sun::star::uno::makeAny( e ) );
+    }
+    return NULL;
+}
+
+static void PyUNO_Type_del( PyObject *self )
+{
+    delete ((PyUNO_Type *) self)->members;
+    PyObject_Del( self );
+}
+
+static PyObject *PyUNO_Type_getTypeName( PyObject *self, void * )
+{
+    return ((PyUNO_Type *) self)->members->typeName.getAcquired();
+}
+
+static PyObject *PyUNO_Type_getTypeClass( PyObject *self, void * )
+{
+    return ((PyUNO_Type *) self)->members->typeClass.getAcquired();
+}
+
+static PyObject *PyUNO_Type_repr( PyObject *self )
+{
+    PyUNO_Type_Internals *members = ((PyUNO_Type *) self)->members;
+    PyRef typeClass( PyObject_Repr( members->typeClass.get() ), SAL_NO_ACQUIRE );
+    if( ! typeClass.is() )
+        return NULL;
+    OUStringBuffer buf;
+    buf.appendAscii( "<Type instance " ).append( pyString2ustring( members->typeName.get() ) );
+    buf.appendAscii( " (" ).append( pyString2ustring( typeClass.get() ) ).appendAscii( ")>" );
+    return USTR_TO_PYSTR( buf.makeStringAndClear() ).getAcquired();
+}
+
+static PyObject *PyUNO_Type_richcompare( PyObject *self, PyObject *that, int op )
+{
+    if( op != Py_EQ && op != Py_NE )
+    {
+        Py_INCREF( Py_NotImplemented );
+        return Py_NotImplemented;
+    }
+    bool bEqual = self == that ||
+        ( PyObject_TypeCheck( that, &PyUNO_Type_Type ) &&
+          ((PyUNO_Type *) self)->members->type == ((PyUNO_Type *) that)->members->type );
+    return returnComparison( bEqual, op );
+}
+
+static Py_hash_t PyUNO_Type_hash( PyObject *self )
+{
+    return ((PyUNO_Type *) self)->members->hash;
+}
+
+static PyObject *PyUNO_Char_tp_new( PyTypeObject *, PyObject *args, PyObject * )
+{
+    PyObject *value;
+    if( ! PyArg_ParseTuple( args, "O:Char", &value ) )
+        return NULL;
+    if( PyUnicode_Check( value ) )
+    {
+        OUString str( pyString2ustring( value ) );
+        if( str.getLength() == 1 )
+            return createChar( str[0] );
+    }
+    PyErr_SetString( PyExc_TypeError, "uno.Char expects a unicode string of length 1" );
+    return NULL;
+}
+
+static void PyUNO_Char_del( PyObject *self )
+{
+    PyObject_Del( self );
+}
+
+static PyObject *PyUNO_Char_getValue( PyObject *self, void * )
+{
+    return ustring2PyUnicode( OUString( &((PyUNO_Char *) self)->value, 1 ) ).getAcquired();
+}
+
+static PyObject *PyUNO_Char_repr( PyObject *self )
+{
+    OUStringBuffer buf;
+    buf.appendAscii( "<Char instance " ).append( ((PyUNO_Char *) self)->value ).appendAscii( ">" );
+    return USTR_TO_PYSTR( buf.makeStringAndClear() ).getAcquired();
+}
+
+static PyObject *PyUNO_Char_richcompare( PyObject *self, PyObject *that, int op )
+{
+    if( op != Py_EQ && op != Py_NE )
+    {
+        Py_INCREF( Py_NotImplemented );
+        return Py_NotImplemented;
+    }
+    sal_Unicode value = ((PyUNO_Char *) self)->value;
+    bool bEqual = false;
+    if( PyObject_TypeCheck( that, &PyUNO_Char_Type ) )
+    {
+        bEqual = value == ((PyUNO_Char *) that)->value;
+    }
+    else if( PyUnicode_Check( that ) || PYSTR_CHECK( that ) )
+    {
+        OUString str( pyString2ustring( that ) );
+        bEqual = str.getLength() == 1 && str[0] == value;
+    }
+    return returnComparison( bEqual, op );
+}
+
+static Py_hash_t PyUNO_Char_hash( PyObject *self )
+{
+    PyRef value( PyUNO_Char_getValue( self, 0 ), SAL_NO_ACQUIRE );
+    if( ! value.is() )
+        return -1;
+    return PyObject_Hash( value.get() );
+}
+
+static PyGetSetDef PyUNO_Enum_getset[] =
+{
+    { const_cast< char * >("typeName"), PyUNO_Enum_getTypeName, NULL, NULL, NULL },
+    { const_cast< char * >("value"), PyUNO_Enum_getValue, NULL, NULL, NULL },
+    { NULL, NULL, NULL, NULL, NULL }
+};
+
+static PyGetSetDef PyUNO_Type_getset[] =
+{
+    { const_cast< char * >("typeName"), PyUNO_Type_getTypeName, NULL, NULL, NULL },
+    { const_cast< char * >("typeClass"), PyUNO_Type_getTypeClass, NULL, NULL, NULL },
+    { NULL, NULL, NULL, NULL, NULL }
+};
+
+static PyGetSetDef PyUNO_Char_getset[] =
+{
+    { const_cast< char * >("value"), PyUNO_Char_getValue, NULL, NULL, NULL },
+    { NULL, NULL, NULL, NULL, NULL }
+};
+
+PyTypeObject PyUNO_Enum_Type =
+{
+    PyVarObject_HEAD_INIT(&PyType_Type, 0)
+    const_cast< char * >("pyuno.Enum"),
+    sizeof (PyUNO_Enum),
+    0,
+    (destructor) PyUNO_Enum_del,
+    (printfunc) 0,
+    (getattrfunc) 0,
+    (setattrfunc) 0,
+#if PY_MAJOR_VERSION >= 3
+    0,
+#else
+    (cmpfunc) 0,
+#endif
+    (reprfunc) PyUNO_Enum_repr,
+    0,
+    0,
+    0,
+    (hashfunc) PyUNO_Enum_hash,
+    (ternaryfunc) 0,
+    (reprfunc) 0,
+    (getattrofunc)0,
+    (setattrofunc)0,
+    NULL,
+    Py_TPFLAGS_DEFAULT,
+    const_cast< char * >("Represents a UNO idl enum, use an instance of this class to explicitly pass an enum to UNO"),
+    (traverseproc)0,
+    (inquiry)0,
+    (richcmpfunc) PyUNO_Enum_richcompare,
+    0,
+    (getiterfunc)0,
+    (iternextfunc)0,
+    NULL,
+    NULL,
+    PyUNO_Enum_getset,
+    NULL,
+    NULL,
+    (descrgetfunc)0,
+    (descrsetfunc)0,
+    0,
+    (initproc)0,
+    (allocfunc)0,
+    (newfunc) PyUNO_Enum_tp_new,
+    (freefunc)0,
+    (inquiry)0,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    (destructor)0
+#if PY_VERSION_HEX >= 0x02060000
+    , 0
+#endif
+};
+
+PyTypeObject PyUNO_Type_Type =
+{
+    PyVarObject_HEAD_INIT(&PyType_Type, 0)
+    const_cast< char * >("pyuno.Type"),
+    sizeof (PyUNO_Type),
+    0,
+    (destructor) PyUNO_Type_del,
+    (printfunc) 0,
+    (getattrfunc) 0,
+    (setattrfunc) 0,
+#if PY_MAJOR_VERSION >= 3
+    0,
+#else
+    (cmpfunc) 0,
+#endif
+    (reprfunc) PyUNO_Type_repr,
+    0,
+    0,
+    0,
+    (hashfunc) PyUNO_Type_hash,
+    (ternaryfunc) 0,
+    (reprfunc) 0,
+    (getattrofunc)0,
+    (setattrofunc)0,
+    NULL,
+    Py_TPFLAGS_DEFAULT,
+    const_cast< char * >("Represents a UNO type, use an instance of this class to explicitly pass a type to UNO"),
+    (traverseproc)0,
+    (inquiry)0,
+    (richcmpfunc) PyUNO_Type_richcompare,
+    0,
+    (getiterfunc)0,
+    (iternextfunc)0,
+    NULL,
+    NULL,
+    PyUNO_Type_getset,
+    NULL,
+    NULL,
+    (descrgetfunc)0,
+    (descrsetfunc)0,
+    0,
+    (initproc)0,
+    (allocfunc)0,
+    (newfunc) PyUNO_Type_tp_new,
+    (freefunc)0,
+    (inquiry)0,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    (destructor)0
+#if PY_VERSION_HEX >= 0x02060000
+    , 0
+#endif
+};
+
+PyTypeObject PyUNO_Char_Type =
+{
+    PyVarObject_HEAD_INIT(&PyType_Type, 0)
+    const_cast< char * >("pyuno.Char"),
+    sizeof (PyUNO_Char),
+    0,
+    (destructor) PyUNO_Char_del,
+    (printfunc) 0,
+    (getattrfunc) 0,
+    (setattrfunc) 0,
+#if PY_MAJOR_VERSION >= 3
+    0,
+#else
+    (cmpfunc) 0,
+#endif
+    (reprfunc) PyUNO_Char_repr,
+    0,
+    0,
+    0,
+    (hashfunc) PyUNO_Char_hash,
+    (ternaryfunc) 0,
+    (reprfunc) 0,
+    (getattrofunc)0,
+    (setattrofunc)0,
+    NULL,
+    Py_TPFLAGS_DEFAULT,
+    const_cast< char * >("Represents an UNO char, use an instance of this class to explicitly pass a char to UNO"),
+    (traverseproc)0,
+    (inquiry)0,
+    (richcmpfunc) PyUNO_Char_richcompare,
+    0,
+    (getiterfunc)0,
+    (iternextfunc)0,
+    NULL,
+    NULL,
+    PyUNO_Char_getset,
+    NULL,
+    NULL,
+    (descrgetfunc)0,
+    (descrsetfunc)0,
+    0,
+    (initproc)0,
+    (allocfunc)0,
+    (newfunc) PyUNO_Char_tp_new,
+    (freefunc)0,
+    (inquiry)0,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    (destructor)0
+#if PY_VERSION_HEX >= 0x02060000
+    , 0
+#endif
+};
+
+typedef struct
+{
+    Sequence< sal_Int8 > value;
+    // the bytes object the value was created from, returned as it is by the
+    // value attribute. Empty for values from UNO and other objects.
+    PyRef bytes;
+} PyUNO_ByteSequence_Internals;
+
+typedef struct
+{
+    PyObject_HEAD
+    PyUNO_ByteSequence_Internals *members;
+} PyUNO_ByteSequence;
+
+/** gives access to the memory of bytes, bytearray and ByteSequence objects
+ */
+static bool getByteData( PyObject *o, const char **ppData, Py_ssize_t *pnSize )
+{
+    if( PyObject_TypeCheck( o, &PyUNO_ByteSequence_Type ) )
+    {
+        const Sequence< sal_Int8 > &value = ((PyUNO_ByteSequence *) o)->members->value;
+        *ppData = (const char *) value.getConstArray();
+        *pnSize = value.getLength();
+        return true;
+    }
+    if( PyBytes_Check( o ) )
+    {
+        *ppData = PyBytes_AS_STRING( o );
+        *pnSize = PyBytes_GET_SIZE( o );
+        return true;
+    }
+    if( PyByteArray_Check( o ) )
+    {
+        *ppData = PyByteArray_AS_STRING( o );
+        *pnSize = PyByteArray_GET_SIZE( o );
+        return true;
+    }
+    return false;
+}
+
+static bool setByteSequenceValue( PyUNO_ByteSequence *self, PyObject *value )
+{
+    if( PyObject_TypeCheck( value, &PyUNO_ByteSequence_Type ) )
+    {
+        // share the sequence, it is never modified in place
+        self->members->value = ((PyUNO_ByteSequence *) value)->members->value;
+        self->members->bytes = ((PyUNO_ByteSequence *) value)->members->bytes;
+        return true;
+    }
+    const char *pData;
+    Py_ssize_t nSize;
+    if( ! getByteData( value, &pData, &nSize ) )
+    {
+        PyErr_SetString( PyExc_TypeError, "expected byte, bytearray or ByteSequence" );
+        return false;
+    }
+    self->members->value = Sequence< sal_Int8 >( (const sal_Int8 *) pData, (sal_Int32) nSize );
+    // bytearrays may change, so only bytes are kept
+    if( PyBytes_CheckExact( value ) )
+        self->members->bytes = PyRef( value );
+    else
+        self->members->bytes.clear();
+    return true;
+}
+
+static PyObject *byteSequence2PyBytes( PyObject *self )
+{
+    const Sequence< sal_Int8 > &value = ((PyUNO_ByteSequence *) self)->members->value;
+    return PyBytes_FromStringAndSize( (const char *) value.getConstArray(), value.getLength() );
+}
+
+static PyObject *PyUNO_ByteSequence_create( const Sequence< sal_Int8 > &value )
+{
+    PyUNO_ByteSequence *self = (PyUNO_ByteSequence *)
+        PyUNO_ByteSequence_Type.tp_alloc( &PyUNO_ByteSequence_Type, 0 );
+    if( self == NULL )
+        return NULL;
+    self->members = new PyUNO_ByteSequence_Internals;
+    self->members->value = value;
+    return (PyObject *) self;
+}
+
+static PyObject *PyUNO_ByteSequence_tp_new( PyTypeObject *type, PyObject *args, PyObject *kwds )
+{
+    static char *kwlist[] = { const_cast< char * >("value"), NULL };
+    PyObject *value = NULL;
+    if( ! PyArg_ParseTupleAndKeywords( args, kwds, "O:ByteSequence", kwlist, &value ) )
+        return NULL;
+
+    PyUNO_ByteSequence *self = (PyUNO_ByteSequence *) type->tp_alloc( type, 0 );
+    if( self == NULL )
+        return NULL;
+    self->members = new PyUNO_ByteSequence_Internals;
+    if( ! setByteSequenceValue( self, value ) )
+    {
+        Py_DECREF( self );
+        return NULL;
+    }
+    return (PyObject *) self;
+}
+
+static void PyUNO_ByteSequence_del( PyObject *self )
+{
+    delete ((PyUNO_ByteSequence *) self)->members;
+    Py_TYPE( self )->tp_free( self );
+}
+
+static PyObject *PyUNO_ByteSequence_getValue( PyObject *self, void * )
+{
+    const PyRef &bytes = ((PyUNO_ByteSequence *) self)->members->bytes;
+    if( bytes.is() )
+        return bytes.getAcquired();
+    return byteSequence2PyBytes( self );
+}
+
+static int PyUNO_ByteSequence_setValue( PyObject *self, PyObject *value, void * )
+{
+    if( value == NULL )
+    {
+        PyErr_SetString( PyExc_TypeError, "can't delete the value of a ByteSequence" );
+        return -1;
+    }
+    return setByteSequenceValue( (PyUNO_ByteSequence *) self, value ) ? 0 : -1;
+}
+
+static PyObject *PyUNO_ByteSequence_repr( PyObject *self )
+{
+    PyRef bytes( byteSequence2PyBytes( self ), SAL_NO_ACQUIRE );
+    if( ! bytes.is() )
+        return NULL;
+#if PY_MAJOR_VERSION >= 3
+    return PyUnicode_FromFormat( "<ByteSequence instance '%S'>", bytes.get() );
 #else
-    Py_UNICODE u[2];
-    u[0] = val;
-    u[1] = 0;
-    PyTuple_SetItem( args.get() , 0 , PyUnicode_FromUnicode( u ,1) );
+    return PyString_FromFormat( "<ByteSequence instance '%s'>", PyBytes_AsString( bytes.get() ) );
 #endif
+}
+
+static PyObject *PyUNO_ByteSequence_richcompare( PyObject *self, PyObject *that, int op )
+{
+    if( op != Py_EQ && op != Py_NE )
+    {
+        Py_INCREF( Py_NotImplemented );
+        return Py_NotImplemented;
+    }
+    const Sequence< sal_Int8 > &value = ((PyUNO_ByteSequence *) self)->members->value;
+    const char *pData;
+    Py_ssize_t nSize;
+    bool bEqual = getByteData( that, &pData, &nSize ) &&
+        nSize == value.getLength() &&
+        memcmp( value.getConstArray(), pData, nSize ) == 0;
+    if( bEqual == ( op == Py_EQ ) )
+        Py_RETURN_TRUE;
+    Py_RETURN_FALSE;
+}
+
+static Py_hash_t PyUNO_ByteSequence_hash( PyObject *self )
+{
+    PyRef bytes( byteSequence2PyBytes( self ), SAL_NO_ACQUIRE );
+    if( ! bytes.is() )
+        return -1;
+    return PyObject_Hash( bytes.get() );
+}
+
+static PyObject *PyUNO_ByteSequence_iter( PyObject *self )
+{
+    PyRef bytes( byteSequence2PyBytes( self ), SAL_NO_ACQUIRE );
+    if( ! bytes.is() )
+        return NULL;
+    return PyObject_GetIter( bytes.get() );
+}
+
+static Py_ssize_t PyUNO_ByteSequence_len( PyObject *self )
+{
+    return ((PyUNO_ByteSequence *) self)->members->value.getLength();
+}
 
-    return callCtor( r, "Char" , args );
+static PyObject *PyUNO_ByteSequence_item( PyObject *self, Py_ssize_t index )
+{
+    const Sequence< sal_Int8 > &value = ((PyUNO_ByteSequence *) self)->members->value;
+    if( index < 0 || index >= value.getLength() )
+    {
+        PyErr_SetString( PyExc_IndexError, "ByteSequence index out of range" );
+        return NULL;
+    }
+#if PY_MAJOR_VERSION >= 3
+    return PyLong_FromLong( (unsigned char) value[index] );
+#else
+    return PyBytes_FromStringAndSize( (const char *) value.getConstArray() + index, 1 );
+#endif
 }
 
+static PyObject *PyUNO_ByteSequence_subscript( PyObject *self, PyObject *key )
+{
+    if( PyIndex_Check( key ) )
+    {
+        Py_ssize_t index = PyNumber_AsSsize_t( key, PyExc_IndexError );
+        if( index == -1 && PyErr_Occurred() )
+            return NULL;
+        if( index < 0 )
+            index += PyUNO_ByteSequence_len( self );
+        return PyUNO_ByteSequence_item( self, index );
+    }
+    // slices are taken from the bytes
+    PyRef bytes( byteSequence2PyBytes( self ), SAL_NO_ACQUIRE );
+    if( ! bytes.is() )
+        return NULL;
+    return PyObject_GetItem( bytes.get(), key );
+}
+
+static PyObject *PyUNO_ByteSequence_concat( PyObject *self, PyObject *that )
+{
+    const char *pData;
+    Py_ssize_t nSize;
+    if( ! getByteData( that, &pData, &nSize ) )
+    {
+        PyErr_SetString( PyExc_TypeError, "expected byte, bytearray or ByteSequence as operand" );
+        return NULL;
+    }
+    const Sequence< sal_Int8 > &value = ((PyUNO_ByteSequence *) self)->members->value;
+    Sequence< sal_Int8 > result( value.getLength() + (sal_Int32) nSize );
+    memcpy( result.getArray(), value.getConstArray(), value.getLength() );
+    memcpy( result.getArray() + value.getLength(), pData, nSize );
+    return PyUNO_ByteSequence_create( result );
+}
+
+static int PyUNO_ByteSequence_getbuffer( PyObject *self, Py_buffer *view, int flags )
+{
+    const Sequence< sal_Int8 > &value = ((PyUNO_ByteSequence *) self)->members->value;
+    return PyBuffer_FillInfo(
+        view, self, const_cast< sal_Int8 * >( value.getConstArray() ), value.getLength(), 1, flags );
+}
+
+static PyGetSetDef PyUNO_ByteSequence_getset[] =
+{
+    { const_cast< char * >("value"), PyUNO_ByteSequence_getValue, PyUNO_ByteSequence_setValue, NULL, NULL },
+    { NULL, NULL, NULL, NULL, NULL }
+};
+
+static PySequenceMethods PyUNO_ByteSequence_SequenceMethods =
+{
+    (lenfunc) PyUNO_ByteSequence_len,
+    (binaryfunc) PyUNO_ByteSequence_concat,
+    (ssizeargfunc) 0,
+    (ssizeargfunc) PyUNO_ByteSequence_item,
+    0,
+    (ssizeobjargproc) 0,
+    0,
+    (objobjproc) 0,
+    (binaryfunc) 0,
+    (ssizeargfunc) 0
+};
+
+static PyMappingMethods PyUNO_ByteSequence_MappingMethods =
+{
+    (lenfunc) PyUNO_ByteSequence_len,
+    (binaryfunc) PyUNO_ByteSequence_subscript,
+    (objobjargproc) 0
+};
+
+static PyBufferProcs PyUNO_ByteSequence_BufferProcs =
+{
+#if PY_MAJOR_VERSION < 3
+    (readbufferproc) 0,
+    (writebufferproc) 0,
+    (segcountproc) 0,
+    (charbufferproc) 0,
+#endif
+    (getbufferproc) PyUNO_ByteSequence_getbuffer,
+    (releasebufferproc) 0
+};
+
+PyTypeObject PyUNO_ByteSequence_Type =
+{
+    PyVarObject_HEAD_INIT(&PyType_Type, 0)
+    const_cast< char * >("pyuno.ByteSequence"),
+    sizeof (PyUNO_ByteSequence),
+    0,
+    (destructor) PyUNO_ByteSequence_del,
+    (printfunc) 0,
+    (getattrfunc) 0,
+    (setattrfunc) 0,
+#if PY_MAJOR_VERSION >= 3
+    0,
+#else
+    (cmpfunc) 0,
+#endif
+    (reprfunc) PyUNO_ByteSequence_repr,
+    0,
+    &PyUNO_ByteSequence_SequenceMethods,
+    &PyUNO_ByteSequence_MappingMethods,
+    (hashfunc) PyUNO_ByteSequence_hash,
+    (ternaryfunc) 0,
+    (reprfunc) 0,
+    (getattrofunc)0,
+    (setattrofunc)0,
+    &PyUNO_ByteSequence_BufferProcs,
+#if PY_MAJOR_VERSION >= 3
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+#else
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_NEWBUFFER,
+#endif
+    NULL,
+    (traverseproc)0,
+    (inquiry)0,
+    (richcmpfunc) PyUNO_ByteSequence_richcompare,
+    0,
+    (getiterfunc) PyUNO_ByteSequence_iter,
+    (iternextfunc)0,
+    NULL,
+    NULL,
+    PyUNO_ByteSequence_getset,
+    NULL,
+    NULL,
+    (descrgetfunc)0,
+    (descrsetfunc)0,
+    0,
+    (initproc)0,
+    (allocfunc) PyType_GenericAlloc,
+    (newfunc) PyUNO_ByteSequence_tp_new,
+    (freefunc) PyObject_Del,
+    (inquiry)0,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    (destructor)0
+#if PY_VERSION_HEX >= 0x02060000
+    , 0
+#endif
+};
+
 PyObject *PyUNO_ByteSequence_new(
-    const com::sun::star::uno::Sequence< sal_Int8 > &byteSequence, const Runtime &r )
+    const com::sun::star::uno::Sequence< sal_Int8 > &byteSequence, const Runtime & )
 {
-    PyRef str(
-        PyBytes_FromStringAndSize( (char*)byteSequence.getConstArray(), byteSequence.getLength()),
-        SAL_NO_ACQUIRE );
-    PyRef args( PyTuple_New( 1 ), SAL_NO_ACQUIRE );
-    PyTuple_SetItem( args.get() , 0 , str.getAcquired() );
-    return callCtor( r, "ByteSequence" , args );
-    
+    return PyUNO_ByteSequence_create( byteSequence );
+}
+
+Sequence< sal_Int8 > PyByteSequence2ByteSequence( PyObject *o )
+{
+    return ((PyUNO_ByteSequence *) o)->members->value;
+}
+
+int PyUNO_initValueTypes( PyObject *module )
+{
+    static const struct
+    {
+        const char *name;
+        PyTypeObject *type;
+    } valueTypes[] =
+    {
+        { "Enum", &PyUNO_Enum_Type },
+        { "Type", &PyUNO_Type_Type },
+        { "Char", &PyUNO_Char_Type },
+        { "ByteSequence", &PyUNO_ByteSequence_Type },
+        { "PropertyValues", &PyUNO_PropertyValues_Type }
+    };
+    for( size_t i = 0 ; i < sizeof( valueTypes ) / sizeof( valueTypes[0] ) ; i ++ )
+    {
+        if( PyType_Ready( valueTypes[i].type ) < 0 )
+            return -1;
+        Py_INCREF( valueTypes[i].type );
+        if( PyModule_AddObject(
+                module, const_cast< char * >( valueTypes[i].name ),
+                (PyObject *) valueTypes[i].type ) < 0 )
+            return -1;
+    }
+    return 0;
 }
 
 PyObject * PyUNO_UNOSingleton_new( const char * singletonName, const Runtime & r )
@@ -58,11 +58,135 @@ using com::sun::star::beans::XMaterialHolder;
 #define USTR_ASCII(x) OUString( RTL_CONSTASCII_USTRINGPARAM( x ) )
 namespace pyuno
 {
+#if PY_VERSION_HEX >= 0x03030000
+/** builds a PEP 393 string directly from the UTF-16 buffer. The smallest
+    kind is chosen from the bits of all code units, surrogate pairs are
+    combined into UCS4 characters.
+ */
+static PyObject *utf16ToPyUnicode( const sal_Unicode *pStr, sal_Int32 nLength )
+{
+    sal_Unicode nBits = 0;
+    for( sal_Int32 i = 0 ; i < nLength ; i ++ )
+        nBits |= pStr[i];
+
+    if( nBits < 0x100 )
+    {
+        PyObject *ret = PyUnicode_New( nLength, nBits < 0x80 ? 0x7f : 0xff );
+        if( ret )
+        {
+            Py_UCS1 *pData = PyUnicode_1BYTE_DATA( ret );
+            for( sal_Int32 i = 0 ; i < nLength ; i ++ )
+                pData[i] = (Py_UCS1) pStr[i];
+        }
+        return ret;
+    }
+
+    sal_Int32 nPairs = 0;
+    if( nBits >= 0xd800 )
+    {
+        for( sal_Int32 i = 0 ; i + 1 < nLength ; i ++ )
+        {
+            if( pStr[i] >= 0xd800 && pStr[i] <= 0xdbff &&
+                pStr[i + 1] >= 0xdc00 && pStr[i + 1] <= 0xdfff )
+            {
+                nPairs ++;
+                i ++;
+            }
+        }
+    }
+    if( ! nPairs )
+    {
+        PyObject *ret = PyUnicode_New( nLength, 0xffff );
+        if( ret )
+            memcpy( PyUnicode_2BYTE_DATA( ret ), pStr, nLength * sizeof( sal_Unicode ) );
+        return ret;
+    }
+
+    PyObject *ret = PyUnicode_New( nLength - nPairs, 0x10ffff );
+    if( ret )
+    {
+        Py_UCS4 *pData = PyUnicode_4BYTE_DATA( ret );
+        for( sal_Int32 i = 0 ; i < nLength ; i ++ )
+        {
+            if( pStr[i] >= 0xd800 && pStr[i] <= 0xdbff && i + 1 < nLength &&
+                pStr[i + 1] >= 0xdc00 && pStr[i + 1] <= 0xdfff )
+            {
+                *pData++ = 0x10000 + ( ( (Py_UCS4) pStr[i] - 0xd800 ) << 10 ) + ( pStr[i + 1] - 0xdc00 );
+                i ++;
+            }
+            else
+                *pData++ = pStr[i];
+        }
+    }
+    return ret;
+}
+
+/** reads the characters of a PEP 393 string directly into a new OUString
+ */
+static OUString pyUnicodeToUtf16( PyObject *pystr )
+{
+    if( PyUnicode_READY( pystr ) < 0 )
+    {
+        PyErr_Clear();
+        return OUString();
+    }
+    const Py_ssize_t nLength = PyUnicode_GET_LENGTH( pystr );
+    if( ! nLength )
+        return OUString();
+    switch( PyUnicode_KIND( pystr ) )
+    {
+    case PyUnicode_1BYTE_KIND:
+    {
+        const Py_UCS1 *pData = PyUnicode_1BYTE_DATA( pystr );
+        rtl_uString *pNew = 0;
+        rtl_uString_new_WithLength( &pNew, (sal_Int32) nLength );
+        for( Py_ssize_t i = 0 ; i < nLength ; i ++ )
+            pNew->buffer[i] = pData[i];
+        pNew->buffer[nLength] = 0;
+        pNew->length = (sal_Int32) nLength;
+        return OUString( pNew, SAL_NO_ACQUIRE );
+    }
+    case PyUnicode_2BYTE_KIND:
+        return OUString( (const sal_Unicode *) PyUnicode_2BYTE_DATA( pystr ), (sal_Int32) nLength );
+    default:
+    {
+        const Py_UCS4 *pData = PyUnicode_4BYTE_DATA( pystr );
+        Py_ssize_t nSize = nLength;
+        for( Py_ssize_t i = 0 ; i < nLength ; i ++ )
+        {
+            if( pData[i] > 0xffff )
+                nSize ++;
+        }
+        rtl_uString *pNew = 0;
+        rtl_uString_new_WithLength( &pNew, (sal_Int32) nSize );
+        sal_Unicode *pBuffer = pNew->buffer;
+        for( Py_ssize_t i = 0 ; i < nLength ; i ++ )
+        {
+            Py_UCS4 c = pData[i];
+            if( c > 0xffff )
+            {
+                c -= 0x10000;
+                *pBuffer++ = (sal_Unicode) ( 0xd800 | ( c >> 10 ) );
+                *pBuffer++ = (sal_Unicode) ( 0xdc00 | ( c & 0x3ff ) );
+            }
+            else
+                *pBuffer++ = (sal_Unicode) c;
+        }
+        *pBuffer = 0;
+        pNew->length = (sal_Int32) nSize;
+        return OUString( pNew, SAL_NO_ACQUIRE );
+    }
+    }
+}
+#endif
+
 PyRef ustring2PyUnicode( const OUString & str )
 {
     PyRef ret;
 
-#if Py_UNICODE_SIZE == 2
+#if PY_VERSION_HEX >= 0x03030000
+    ret = PyRef( utf16ToPyUnicode( str.getStr(), str.getLength() ), SAL_NO_ACQUIRE );
+#elif Py_UNICODE_SIZE == 2
     // YD force conversion since python/2 uses wchar_t
     ret = PyRef( PyUnicode_FromUnicode( (const Py_UNICODE*)str.getStr(), str.getLength() ), SAL_NO_ACQUIRE );
 #else
@@ -83,18 +207,14 @@ OUString pyString2ustring( PyObject *pystr )
     OUString ret;
     if( PyUnicode_Check( pystr ) )
     {
-#if Py_UNICODE_SIZE == 2
-	ret = OUString( (sal_Unicode * ) PyUnicode_AS_UNICODE( pystr ) );
-#else
 #if PY_VERSION_HEX >= 0x03030000
-    Py_ssize_t size;
-    char *pUtf8 = PyUnicode_AsUTF8AndSize(pystr, &size);
-    ret = OUString(pUtf8, size, RTL_TEXTENCODING_UTF8);
+    ret = pyUnicodeToUtf16( pystr );
+#elif Py_UNICODE_SIZE == 2
+	ret = OUString( (sal_Unicode * ) PyUnicode_AS_UNICODE( pystr ) );
 #else
 	PyObject* pUtf8 = PyUnicode_AsUTF8String(pystr);
 	ret = OUString(PyBytes_AsString(pUtf8), PyBytes_Size(pUtf8), RTL_TEXTENCODING_UTF8);
 	Py_DECREF(pUtf8);
-#endif
 #endif
     }
     else
@@ -105,6 +225,130 @@ OUString pyString2ustring( PyObject *pystr )
     return ret;
 }
 
+// longer strings are rarely repeated and are not cached
+static const sal_Int32 STRINGCACHE_MAX_LENGTH = 64;
+
+StringCache::StringCache()
+    : m_nCapacity( 0 ),
+      m_nSize( 0 ),
+      m_nHits( 0 ),
+      m_nMisses( 0 ),
+      m_nReverseHits( 0 ),
+      m_nReverseMisses( 0 )
+{
+}
+
+void StringCache::setCapacity( sal_Int32 nCapacity )
+{
+    m_nCapacity = nCapacity < 0 ? 0 : nCapacity;
+    while( m_nSize > m_nCapacity )
+    {
+        const Entry &entry = m_entries.back();
+        m_reverseMap.erase( entry.pyStr );
+        m_map.erase( entry.str );
+        m_entries.pop_back();
+        m_nSize --;
+    }
+}
+
+void StringCache::insert( const OUString &str, const PyRef &pyStr )
+{
+    if( m_nSize >= m_nCapacity )
+    {
+        // drop the least recently used entry
+        const Entry &entry = m_entries.back();
+        m_reverseMap.erase( entry.pyStr );
+        m_map.erase( entry.str );
+        m_entries.pop_back();
+        m_nSize --;
+    }
+    Entry entry;
+    entry.str = str;
+    entry.pyStr = pyStr;
+    m_entries.push_front( entry );
+    m_map[str] = m_entries.begin();
+    m_reverseMap[pyStr] = m_entries.begin();
+    m_nSize ++;
+}
+
+PyRef StringCache::toPython( const OUString &str )
+{
+    if( str.getLength() > STRINGCACHE_MAX_LENGTH )
+        return ustring2PyUnicode( str );
+
+    EntryMap::iterator ii = m_map.find( str );
+    if( ii != m_map.end() )
+    {
+        m_nHits ++;
+        m_entries.splice( m_entries.begin(), m_entries, ii->second );
+        return ii->second->pyStr;
+    }
+    m_nMisses ++;
+    PyRef ret = ustring2PyUnicode( str );
+    if( ret.is() )
+        insert( str, ret );
+    return ret;
+}
+
+OUString StringCache::toUno( PyObject *str )
+{
+    if( ! PyUnicode_CheckExact( str ) )
+        return pyString2ustring( str );
+
+    ReverseEntryMap::iterator ii = m_reverseMap.find( PyRef( str ) );
+    if( ii != m_reverseMap.end() )
+    {
+        m_nReverseHits ++;
+        m_entries.splice( m_entries.begin(), m_entries, ii->second );
+        return ii->second->str;
+    }
+    m_nReverseMisses ++;
+    OUString ret = pyString2ustring( str );
+    // only strings held by the cache may be mapped back, an equal string
+    // cached already is kept
+    if( ret.getLength() <= STRINGCACHE_MAX_LENGTH && m_map.find( ret ) == m_map.end() )
+        insert( ret, PyRef( str ) );
+    return ret;
+}
+
+PyRef StringCache::getStatistics() const
+{
+    PyRef dict( PyDict_New(), SAL_NO_ACQUIRE );
+    struct
+    {
+        const char *name;
+        sal_Int64 value;
+    } const values[] =
+    {
+        { "capacity", m_nCapacity },
+        { "size", m_nSize },
+        { "hits", m_nHits },
+        { "misses", m_nMisses },
+        { "reverseHits", m_nReverseHits },
+        { "reverseMisses", m_nReverseMisses }
+    };
+    for( size_t i = 0 ; i < sizeof( values ) / sizeof( values[0] ) ; i ++ )
+    {
+        PyRef value( PyLong_FromLongLong( values[i].value ), SAL_NO_ACQUIRE );
+        PyDict_SetItemString( dict.get(), const_cast< char * >( values[i].name ), value.get() );
+    }
+    return dict;
+}
+
+PyRef ustring2PyUnicode( const OUString &source, RuntimeCargo *cargo )
+{
+    if( cargo->stringCache.isEnabled() )
+        return cargo->stringCache.toPython( source );
+    return ustring2PyUnicode( source );
+}
+
+OUString pyString2ustring( PyObject *str, RuntimeCargo *cargo )
+{
+    if( cargo->stringCache.isEnabled() )
+        return cargo->stringCache.toUno( str );
+    return pyString2ustring( str );
+}
+
 PyRef getObjectFromUnoModule( const Runtime &runtime, const char * func )
     throw ( RuntimeException )
 {
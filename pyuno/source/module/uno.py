@@ -100,51 +100,10 @@ def setCurrentContext(newContext):
     return pyuno.setCurrentContext(newContext)
 
 
-class Enum:
-    """ Represents a UNO idl enum, use an instance of this class to explicitly pass a boolean to UNO """
-    #typeName the name of the enum as a string
-    #value    the actual value of this enum as a string
-    def __init__(self, typeName, value):
-        self.typeName = typeName
-        self.value = value
-        pyuno.checkEnum(self)
-
-    def __repr__(self):
-        return "<uno.Enum %s (%r)>" % (self.typeName, self.value)
-
-    def __eq__(self, that):
-        if not isinstance(that, Enum):
-            return False
-        return self.typeName == that.typeName and self.value == that.value
-    
-    def __ne__(self, other):
-        return not self.__eq__(other)
-    
-    def __hash__(self):
-        return self.__repr__().__hash__()
-
-class Type:
-    """ Represents a UNO type, use an instance of this class to explicitly pass a boolean to UNO """
-#    typeName                 # Name of the UNO type
-#    typeClass                # python Enum of TypeClass,  see com/sun/star/uno/TypeClass.idl
-    def __init__(self, typeName, typeClass):
-        self.typeName = typeName
-        self.typeClass = typeClass
-        pyuno.checkType(self)
-    
-    def __repr__(self):
-        return "<Type instance %s (%r)>" % (self.typeName, self.typeClass)
-
-    def __eq__(self, that):
-        if not isinstance(that, Type):
-            return False
-        return self.typeClass == that.typeClass and self.typeName == that.typeName
-    
-    def __ne__(self, other):
-        return not self.__eq__(other)
-    
-    def __hash__(self):
-        return self.typeName.__hash__()
+# Enum, Type and Char are implemented natively, their instances are immutable.
+# Enum and Type instances are shared for equal values.
+Enum = pyuno.Enum
+Type = pyuno.Type
 
 class Bool(object):
     """ Represents a UNO boolean, use an instance of this class to explicitly
@@ -160,73 +119,13 @@ class Bool(object):
             return True
         return False
 
-class Char:
-    """ Represents an UNO char, use an instance of this class to explicitly pass a char to UNO """
-    # @param value pass a Unicode string with length 1
-    def __init__(self, value):
-        assert isinstance(value, unicode)
-        assert len(value) == 1
-        self.value = value
-
-    def __repr__(self):
-        return "<Char instance %s>" % (self.value,)
-
-    def __eq__(self, that):
-        if isinstance(that, (str, unicode)):
-            if len(that) > 1:
-                return False
-            return self.value == that[0]
-        if isinstance(that, Char):
-            return self.value == that.value
-        return False
-    
-    def __ne__(self, other):
-        return not self.__eq__(other)
-    
-    def __hash__(self):
-        return self.__repr__.__hash__()
-
-class ByteSequence:
-    def __init__(self, value):
-        if isinstance(value, (bytes, bytearray)):
-            self.value = value
-        elif isinstance(value, ByteSequence):
-            self.value = value.value
-        else:
-            raise TypeError("expected byte, bytearray or ByteSequence")
-
-    def __repr__(self):
-        return "<ByteSequence instance '%s'>" % (self.value,)
-
-    def __eq__(self, that):
-        if isinstance(that, ByteSequence):
-            return self.value == that.value
-        elif isinstance(that, (bytes, bytearray)):
-            return self.value == that
-        return False
-    
-    def __ne__(self, other):
-        return not self.__eq__(other)
-
-    def __len__(self):
-        return len(self.value)
-
-    def __getitem__(self, index):
-        return self.value[index]
+Char = pyuno.Char
 
-    def __iter__(self):
-        return self.value.__iter__()
-
-    def __add__(self, b):
-        if isinstance(b, (bytes, bytearray)):
-            return ByteSequence(self.value + b)
-        elif isinstance(b, ByteSequence):
-            return ByteSequence(self.value + b.value)
-        raise TypeError("expected byte, bytearray or ByteSequence as operand")
-
-    def __hash__(self):
-        return self.value.__hash__()
+# implemented natively, wraps the UNO byte sequence and supports the buffer protocol
+ByteSequence = pyuno.ByteSequence
 
+# implemented natively, wraps the UNO sequence of PropertyValue built by props()
+PropertyValues = pyuno.PropertyValues
 
 class Any:
     """ Use only in connection with uno.invoke() to pass an explicit typed any """
@@ -241,6 +140,63 @@ def invoke(object, methodname, argTuple):
     """ Use this function to pass exactly typed anys to the callee (using uno.Any) """
     return pyuno.invoke(object, methodname, argTuple)
 
+def asBuffer(method):
+    """ Returns a copy of the given method of an UNO object, which returns numeric
+        sequences as read-only buffer objects instead of tuples. The buffer shares
+        the memory of the UNO sequence, so that memoryview(), array.array or
+        numpy.frombuffer() can access the values without copying them. Nested
+        sequences are returned as tuples of buffers.
+        ( e.g. memoryview(uno.asBuffer(dataSequence.getNumericalData)()) )
+    """
+    return pyuno.asBuffer(method)
+
+def asMatrix(method):
+    """ Returns a copy of the given method of an UNO object, which returns
+        rectangular sequences of sequences containing only numbers as one two
+        dimensional buffer object of doubles. numpy.asarray() or memoryview()
+        access it without copying. Data arrays containing strings or empty cells
+        are returned as tuples of tuples.
+        ( e.g. numpy.asarray(uno.asMatrix(cellRange.getDataArray)()) )
+    """
+    return pyuno.asMatrix(method)
+
+def invokeBatch(calls):
+    """ Calls the methods given by a list of (object, methodname, argTuple) tuples
+        and returns the list of their results. All arguments are converted before
+        the first call, a call failing with an UNO exception does not stop the
+        following ones and gets the exception in place of its result.
+        ( e.g. uno.invokeBatch([(cell, "setValue", (i,)) for i, cell in enumerate(cells)]) )
+    """
+    return pyuno.invokeBatch(calls)
+
+def getProperties(obj, names):
+    """ Returns a dict of the values of the named properties of an UNO object.
+        The values are read with one call, when the object supports XMultiPropertySet.
+        ( e.g. uno.getProperties(shape, ("FillColor", "LineColor", "LineWidth")) )
+    """
+    return pyuno.getProperties(obj, names)
+
+def setProperties(obj, values):
+    """ Sets the properties of an UNO object to the values of a mapping.
+        The values are written with one call, when the object supports XMultiPropertySet.
+        ( e.g. uno.setProperties(cell, {"CellBackColor": 0xff0000, "IsCellBackgroundTransparent": False}) )
+    """
+    return pyuno.setProperties(obj, values)
+
+def props(*args, **kwargs):
+    """ Returns a sequence of com.sun.star.beans.PropertyValue built from a mapping
+        and the keyword arguments, to be passed to UNO as it is.
+        ( e.g. desktop.loadComponentFromURL(url, "_blank", 0, uno.props(Hidden=True)) )
+    """
+    return pyuno.props(*args, **kwargs)
+
+def propsToDict(seq):
+    """ Returns a dict of the names and values of a sequence of
+        com.sun.star.beans.PropertyValue.
+        ( e.g. uno.propsToDict(doc.getArgs())["URL"] )
+    """
+    return pyuno.propsToDict(seq)
+
 #---------------------------------------------------------------------------------------
 # don't use any functions beyond this point, private section, likely to change
 #---------------------------------------------------------------------------------------